@@ -0,0 +1,72 @@
+"""Parse time of an export without cache, on a cache miss and on a cache hit.
+
+    python -m benchmarks.cache --entries 200000
+"""
+import argparse
+import json
+import random
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+from benchmarks.harness import best_of, print_table
+from logsentinel.models import LogBatch
+from logsentinel.parsers import CloudWatchParser
+from logsentinel.storage import ParseCache
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+
+def write_export(path: Path, entries: int, rng: random.Random) -> None:
+    words = ["request", "user", "timeout", "payment", "retry", "cache", "order"]
+    events = [
+        {
+            "timestamp": 1705312245000 + index,
+            "message": f"[{rng.choice(LEVELS)}] RequestId: req-{index % 500} "
+            + " ".join(rng.choices(words, k=10)),
+        }
+        for index in range(entries)
+    ]
+    export = {"logGroupName": "/aws/lambda/bench", "logEvents": events}
+    path.write_text(json.dumps(export))
+
+
+def consume(batches: Iterable[LogBatch]) -> int:
+    return sum(len(batch) for batch in batches)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        export = root / "export.json"
+        write_export(export, args.entries, random.Random(args.seed))
+        log_parser = CloudWatchParser()
+
+        def cold() -> None:
+            cache = ParseCache(root / "cold")
+            consume(cache.iter_batches(log_parser, export))
+            for entry in (root / "cold" / "entries").iterdir():
+                entry.unlink()
+
+        warm_cache = ParseCache(root / "warm")
+        consume(warm_cache.iter_batches(log_parser, export))
+        rows = [
+            ("no cache", best_of(lambda: consume(log_parser.iter_batches(export)), 3)),
+            ("cold (parse + store)", best_of(cold, 3)),
+            ("warm (load)", best_of(lambda: consume(
+                warm_cache.iter_batches(log_parser, export)
+            ))),
+        ]
+        size = warm_cache.entry_path(log_parser, export).stat().st_size
+        print(f"{args.entries} entries, export {export.stat().st_size:,} bytes, "
+              f"cache entry {size:,} bytes")
+        print_table(["run", "time"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Deterministic synthetic CloudWatch exports for benchmarks.
+
+    python -m benchmarks.generator export.json --events 1000000 --seed 42
+    python -m benchmarks.generator big.json --events 50000000 \\
+        --levels INFO=80,ERROR=15,CRITICAL=5 --request-ids 100000 --message-length 200
+
+The same arguments always produce the same file. Events are written in chunks,
+so memory stays flat even for tens of millions of events.
+"""
+import argparse
+import json
+import random
+from collections.abc import Iterator
+from pathlib import Path
+
+# UNKNOWN events carry no "[LEVEL]" prefix, like Lambda's START/END/REPORT lines
+# and plain prints.
+DEFAULT_LEVELS = {
+    "DEBUG": 10.0,
+    "INFO": 65.0,
+    "WARNING": 10.0,
+    "ERROR": 5.0,
+    "CRITICAL": 1.0,
+    "UNKNOWN": 9.0,
+}
+WORDS = (
+    "request", "user", "timeout", "payment", "retry", "cache", "order", "invoice",
+    "connection", "queue", "shard", "token", "session", "upstream", "latency",
+    "checkout", "inventory", "webhook", "throttled", "database",
+)
+START_MS = 1705312245000
+CHUNK = 10_000
+BODIES = 4096
+MIN_EVENTS = 1
+
+
+def parse_levels(value: str) -> dict[str, float]:
+    levels = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip().upper()
+        if name not in DEFAULT_LEVELS:
+            raise argparse.ArgumentTypeError(f"unknown level {name!r}")
+        try:
+            levels[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight in {part!r}") from None
+    return levels
+
+
+def _bodies(rng: random.Random, length: int) -> list[str]:
+    # A fixed pool of message bodies, each padded with words to about `length`
+    # characters, keeps generation cheap at tens of millions of events.
+    bodies = []
+    for _ in range(BODIES):
+        words: list[str] = []
+        size = 0
+        target = max(1, int(rng.gauss(length, length / 4)))
+        while size < target:
+            word = rng.choice(WORDS)
+            words.append(word)
+            size += len(word) + 1
+        bodies.append(" ".join(words))
+    return bodies
+
+
+def generate_events(
+    count: int,
+    seed: int = 42,
+    levels: dict[str, float] | None = None,
+    request_ids: int = 10_000,
+    message_length: int = 80,
+) -> Iterator[tuple[int, str]]:
+    rng = random.Random(seed)
+    weights = levels or DEFAULT_LEVELS
+    names = list(weights)
+    bodies = _bodies(rng, message_length)
+    timestamp = START_MS
+    for start in range(0, count, CHUNK):
+        size = min(CHUNK, count - start)
+        chosen = rng.choices(names, list(weights.values()), k=size)
+        for level in chosen:
+            # Several events per millisecond, as a busy function produces.
+            timestamp += rng.choice((0, 0, 1, 3))
+            request_id = f"req-{rng.randrange(request_ids):08d}"
+            body = bodies[rng.randrange(BODIES)]
+            if level == "UNKNOWN":
+                message = f"REPORT RequestId: {request_id}\tDuration: 12.31 ms {body}"
+            else:
+                message = f"[{level}] RequestId: {request_id} {body}"
+            yield timestamp, message
+
+
+def write_export(
+    path: Path,
+    count: int,
+    seed: int = 42,
+    levels: dict[str, float] | None = None,
+    request_ids: int = 10_000,
+    message_length: int = 80,
+    log_group: str = "/aws/lambda/bench",
+) -> int:
+    events = generate_events(count, seed, levels, request_ids, message_length)
+    with path.open("w", encoding="utf-8") as stream:
+        stream.write('{"logGroupName": %s, "logEvents": [\n' % json.dumps(log_group))
+        chunk: list[str] = []
+        for index, (timestamp, message) in enumerate(events):
+            chunk.append(
+                '{"id": "%d", "timestamp": %d, "message": %s}'
+                % (index, timestamp, json.dumps(message))
+            )
+            if len(chunk) == CHUNK:
+                stream.write(",\n".join(chunk))
+                stream.write(",\n" if index + 1 < count else "")
+                chunk = []
+        stream.write(",\n".join(chunk))
+        stream.write("\n]}\n")
+    return path.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--levels",
+        type=parse_levels,
+        default=None,
+        help="Level weights, e.g. INFO=80,ERROR=20 (default: a Lambda-like mix)",
+    )
+    parser.add_argument("--request-ids", type=int, default=10_000)
+    parser.add_argument("--message-length", type=int, default=80)
+    args = parser.parse_args()
+    if args.events < MIN_EVENTS or args.request_ids < 1:
+        parser.error("--events and --request-ids must be positive")
+    size = write_export(
+        args.path,
+        args.events,
+        args.seed,
+        args.levels,
+        args.request_ids,
+        args.message_length,
+    )
+    print(f"{args.events} events, {size / 1e6:.1f} MB written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
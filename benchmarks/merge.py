@@ -0,0 +1,89 @@
+"""Ordering entries from many log groups by timestamp.
+
+    python -m benchmarks.merge --events 200000 --streams 16
+
+Compares sorted() over everything with the streaming merge stage: a heap
+merge of sorted streams, the reorder buffer on slightly late input and the
+external sort on shuffled input.
+"""
+import argparse
+import random
+from datetime import UTC, datetime, timedelta
+
+from benchmarks.harness import best_of, print_table
+from logsentinel.models import LogEntry, LogLevel
+from logsentinel.utils.merge import ReorderBuffer, external_sort, merge_by_timestamp
+
+START = datetime(2024, 1, 15, tzinfo=UTC)
+
+
+def make_stream(count: int, group: str, rng: random.Random) -> list[LogEntry]:
+    timestamp = START
+    entries = []
+    for index in range(count):
+        timestamp += timedelta(milliseconds=rng.randrange(1, 50))
+        entries.append(
+            LogEntry(
+                timestamp=timestamp,
+                level=LogLevel.INFO,
+                message=f"event {index}",
+                source=group,
+                raw=f"[INFO] event {index}",
+            )
+        )
+    return entries
+
+
+def jitter(entries: list[LogEntry], window: int, rng: random.Random) -> list[LogEntry]:
+    # Swaps entries a few positions apart, as in streams that arrive a bit late.
+    jittered = list(entries)
+    for index in range(0, len(jittered) - window, window):
+        other = index + rng.randrange(window)
+        jittered[index], jittered[other] = jittered[other], jittered[index]
+    return jittered
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--streams", type=int, default=16)
+    parser.add_argument("--run-size", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    per_stream = args.events // args.streams
+    streams = [
+        make_stream(per_stream, f"/aws/lambda/group-{number}", rng)
+        for number in range(args.streams)
+    ]
+    everything = [entry for stream in streams for entry in stream]
+    shuffled = list(everything)
+    rng.shuffle(shuffled)
+    late = [jitter(stream, 8, rng) for stream in streams]
+    lateness = timedelta(seconds=1)
+
+    cases = [
+        ("sorted() over all", lambda: sorted(everything, key=lambda e: e.timestamp)),
+        ("heap merge", lambda: list(merge_by_timestamp(streams))),
+        (
+            "reorder + merge",
+            lambda: list(
+                merge_by_timestamp(map(ReorderBuffer(lateness).reorder, late))
+            ),
+        ),
+        (
+            "external sort",
+            lambda: list(external_sort(shuffled, run_size=args.run_size)),
+        ),
+    ]
+    rows = []
+    for name, run in cases:
+        elapsed = best_of(run, repeat=3)
+        rows.append((name, elapsed, f"{len(everything) / elapsed:,.0f} entries/s"))
+    print(f"{len(everything)} entries in {args.streams} streams, best of 3")
+    print_table(["stage", "total", "throughput"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""NDJSON stream throughput: bulk decode vs a json.loads per line.
+
+    python -m benchmarks.ndjson --events 200000
+"""
+import argparse
+import io
+import json
+import random
+
+from benchmarks.harness import best_of, print_table
+from benchmarks.parser import make_events
+from logsentinel.models import LogBatch
+from logsentinel.parsers import NdjsonParser
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    events = make_events(args.events, random.Random(args.seed))
+    data = "".join(json.dumps(event) + "\n" for event in events).encode()
+    log_parser = NdjsonParser()
+
+    def per_line() -> None:
+        batch = LogBatch()
+        for line in io.BytesIO(data):
+            log_parser.append_event(batch, json.loads(line), "stdin")
+
+    def bulk() -> None:
+        for _ in log_parser.iter_stream(io.BytesIO(data)):
+            pass
+
+    rows = []
+    for name, func in [("json.loads per line", per_line), ("iter_stream", bulk)]:
+        elapsed = best_of(func)
+        rows.append((name, elapsed, f"{len(data) / elapsed / 1e6:.0f} MB/s"))
+    print(f"{len(events)} events, {len(data) / 1e6:.1f} MB, best of 5")
+    print_table(["reader", "total", "throughput"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Output throughput: Rich table rendering vs the machine-readable writers.
+
+    python -m benchmarks.output --events 50000
+"""
+import argparse
+import io
+import random
+
+from rich.console import Console
+
+from benchmarks.harness import best_of, print_table
+from benchmarks.parser import make_events
+from logsentinel.formatters import WRITERS, TableFormatter
+from logsentinel.models import LogBatch
+from logsentinel.parsers import CloudWatchParser
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    events = make_events(args.events, random.Random(args.seed))
+    batch = LogBatch()
+    log_parser = CloudWatchParser()
+    for event in events:
+        log_parser.append_event(batch, event, "/aws/lambda/bench")
+    entries = list(batch)
+
+    def table() -> None:
+        console = Console(file=io.StringIO(), width=160)
+        for chunk in TableFormatter().stream(entries):
+            console.print(chunk)
+
+    # Rich needs tens of seconds here, so the table gets a single run.
+    rows = [("table", best_of(table, repeat=1), "")]
+    for name, writer in WRITERS.items():
+        stream = io.BytesIO()
+
+        def write() -> None:
+            stream.seek(0)
+            stream.truncate()
+            writer(stream).write(entries)
+
+        elapsed = best_of(write)
+        size = stream.getbuffer().nbytes
+        rows.append((name, elapsed, f"{size / 1e6:.1f} MB"))
+    print(f"{len(entries)} entries, best of 5 (table: one run)")
+    print_table(["output", "total", "size", "throughput"], [
+        (name, elapsed, size, f"{len(entries) / elapsed / 1e3:.0f}k entries/s")
+        for name, elapsed, size in rows
+    ])
+
+
+if __name__ == "__main__":
+    main()
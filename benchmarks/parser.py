@@ -0,0 +1,70 @@
+"""Per-event cost of CloudWatchParser field extraction and event parsing.
+
+    python -m benchmarks.parser --events 50000
+"""
+import argparse
+import random
+from collections.abc import Callable
+
+from benchmarks.harness import best_of, print_table
+from logsentinel.models import LogBatch
+from logsentinel.parsers import CloudWatchParser
+
+TEMPLATES = [
+    "START RequestId: {id} Version: $LATEST",
+    "[INFO] {id} Processing order for user",
+    "[ERROR] {id} Database connection failed after 3 retries",
+    "END RequestId: {id}",
+    "REPORT RequestId: {id} Duration: 12.31 ms Billed Duration: 13 ms",
+    "plain print output without level or request id",
+]
+
+
+def make_events(count: int, rng: random.Random) -> list[dict[str, object]]:
+    events = []
+    timestamp = 1705312245000
+    for index in range(count):
+        # Several events per millisecond, as a busy function produces.
+        timestamp += rng.choice((0, 0, 1, 3))
+        message = rng.choice(TEMPLATES).format(id=f"req-{index // 4:06d}")
+        events.append({"timestamp": timestamp, "message": message})
+    return events
+
+
+def parser_cases(
+    events: list[dict[str, object]], source: str
+) -> list[tuple[str, Callable[[], object]]]:
+    # Shared with benchmarks.suite, so compare also tracks these per-event costs.
+    log_parser = CloudWatchParser()
+    messages = [str(event["message"]) for event in events]
+
+    def append_all() -> None:
+        batch = LogBatch()
+        for event in events:
+            log_parser.append_event(batch, event, source)
+
+    return [
+        ("_extract_fields", lambda: [log_parser._extract_fields(m) for m in messages]),
+        ("_parse_event", lambda: [log_parser._parse_event(e, source) for e in events]),
+        ("append_event", append_all),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    events = make_events(args.events, random.Random(args.seed))
+    cases = parser_cases(events, "/aws/lambda/bench")
+    rows = []
+    for name, func in cases:
+        elapsed = best_of(func)
+        rows.append((name, elapsed, f"{elapsed / len(events) * 1e9:.0f} ns"))
+    print(f"{len(events)} events, best of 5")
+    print_table(["stage", "total", "per event"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Filtered parse of an export with and without the raw byte pre-filter.
+
+    python -m benchmarks.prefilter --entries 200000
+"""
+import argparse
+import random
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+
+from benchmarks.cache import write_export
+from benchmarks.harness import best_of, print_table
+from logsentinel.filters import Filter, LevelFilter, SearchFilter
+from logsentinel.models import LogLevel
+from logsentinel.parsers import CloudWatchParser
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    log_parser = CloudWatchParser()
+
+    def full(path: Path, filters: Sequence[Filter]) -> int:
+        matched = 0
+        for batch in log_parser.iter_batches(path):
+            for entry_filter in filters:
+                batch = entry_filter.apply_batch(batch)
+            matched += len(batch)
+        return matched
+
+    def scanned(path: Path, filters: Sequence[Filter]) -> int:
+        batch = log_parser.scan(path, filters)
+        return full(path, filters) if batch is None else len(batch)
+
+    queries: list[tuple[str, list[Filter]]] = [
+        # The generated requests cycle through 500 ids, so one id is rare.
+        ("--search req-123 ", [SearchFilter("req-123 ")]),
+        ("--level ERROR", [LevelFilter(LogLevel.ERROR)]),
+        ("--search timeout", [SearchFilter("timeout")]),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        export = Path(directory) / "export.json"
+        write_export(export, args.entries, random.Random(args.seed))
+        rows = []
+        for name, filters in queries:
+            matched = full(export, filters)
+            assert scanned(export, filters) == matched
+            full_time = best_of(lambda: full(export, filters), 3)
+            scan_time = best_of(lambda: scanned(export, filters), 3)
+            rows.append(
+                (name, matched, full_time, scan_time, f"{full_time / scan_time:.1f}x")
+            )
+    print(f"{args.entries} entries, best of 3")
+    print_table(["query", "matches", "full parse", "prefilter", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Scan time of SearchFilter as the number of search terms grows.
+
+    python -m benchmarks.search --entries 20000 --terms 1,16,128,1024
+"""
+import argparse
+import random
+import string
+
+from benchmarks.harness import best_of, print_table
+from logsentinel.filters import SearchFilter
+from logsentinel.filters.matcher import AhoCorasick
+from logsentinel.models import LogBatch, LogLevel
+
+
+def make_batch(entries: int, rng: random.Random) -> tuple[LogBatch, list[str]]:
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+        for _ in range(4000)
+    ]
+    batch = LogBatch()
+    for index in range(entries):
+        message = "[INFO] " + " ".join(rng.choices(words, k=15))
+        batch.append(1705312245000 + index, LogLevel.INFO, message, "/aws/lambda/bench")
+    return batch, words
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--terms", default="1,4,16,64,128,512,2048")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    batch, words = make_batch(args.entries, rng)
+    folded = [message.casefold() for message in batch.messages]
+    rows = []
+    for count in map(int, args.terms.split(",")):
+        # Terms that never match force a full scan of every message.
+        terms = [word + "zq" for word in rng.sample(words, count)]
+        search_filter = SearchFilter(terms)
+        automaton = AhoCorasick(terms)
+        rows.append((
+            count,
+            best_of(lambda: search_filter.apply_batch(batch)),
+            best_of(lambda: [any(term in text for term in terms) for text in folded]),
+            best_of(lambda: [automaton.contains_any(text) for text in folded]),
+            best_of(lambda: SearchFilter(patterns=terms).apply_batch(batch), repeat=1),
+        ))
+    print(f"{args.entries} entries, best of 5")
+    print_table(["terms", "SearchFilter", "in-loop", "automaton", "regex"], rows)
+
+
+if __name__ == "__main__":
+    main()
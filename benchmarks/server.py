@@ -0,0 +1,74 @@
+"""Repeated queries against one export, with and without the query server.
+
+    python -m benchmarks.server --events 200000
+
+Times the same queries parsed from scratch, from the parse cache and from a
+running server that holds the export in memory, plus the server's first load.
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.generator import write_export
+from benchmarks.harness import best_of, print_table
+from logsentinel.filters import Filter, LevelFilter, SearchFilter
+from logsentinel.models import LogLevel
+from logsentinel.parsers import CloudWatchParser, iter_parsed
+from logsentinel.server import LogStore, Query, QueryServer, ServerClient
+from logsentinel.storage import ParseCache
+
+
+def local(path: Path, filters: list[Filter], cache: ParseCache | None) -> int:
+    count = 0
+    for batch in iter_parsed(CloudWatchParser(), path, cache):
+        for entry_filter in filters:
+            batch = entry_filter.apply_batch(batch)
+        count += len(batch)
+    return count
+
+
+def served(client: ServerClient, query: Query) -> int:
+    return sum(len(batch) for batch in client.query(query))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="logsentinel-bench-") as directory:
+        path = Path(directory) / "export.json"
+        write_export(path, args.events, seed=args.seed)
+        cache = ParseCache(Path(directory) / "cache")
+        local(path, [], cache)
+
+        server = QueryServer(LogStore(), ("127.0.0.1", 0), [path])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = ServerClient("127.0.0.1", server.server_port)
+        start = time.perf_counter()
+        served(client, Query(paths=[str(path)], limit=0))
+        rows: list[tuple[object, ...]] = [
+            ("server first load", "", time.perf_counter() - start, "")
+        ]
+
+        queries = [
+            ("level ERROR", [LevelFilter(LogLevel.ERROR)], Query([str(path)], level="ERROR")),
+            ("search", [SearchFilter(["timeout"])], Query([str(path)], search=["timeout"])),
+            ("request id", [SearchFilter(["req-00000042"])], Query([str(path)], search=["req-00000042"])),
+        ]
+        for name, filters, query in queries:
+            rows.append((name, "parse", best_of(lambda: local(path, filters, None), repeat=3), local(path, filters, None)))
+            rows.append((name, "cache", best_of(lambda: local(path, filters, cache), repeat=3), ""))
+            rows.append((name, "server", best_of(lambda: served(client, query), repeat=3), served(client, query)))
+        server.shutdown()
+        server.server_close()
+
+    print(f"{args.events} events, best of 3")
+    print_table(["query", "via", "total", "entries"], rows)
+
+
+if __name__ == "__main__":
+    main()
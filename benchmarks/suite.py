@@ -0,0 +1,218 @@
+"""Reproducible benchmark suite with JSON baselines and regression checks.
+
+    python -m benchmarks.suite run --events 200000 --save benchmarks/baselines/main.json
+    python -m benchmarks.suite run --events 200000 --save current.json
+    python -m benchmarks.suite compare benchmarks/baselines/main.json current.json
+
+`run` generates a synthetic export (see benchmarks.generator) and times
+CloudWatchParser.iter_file and iter_batches, the per-event parser steps from
+benchmarks.parser, LevelFilter, SearchFilter and TableFormatter on it.
+benchmarks/baselines/main.json is the committed baseline to compare against.
+`compare` reports the throughput change per benchmark and exits with status 1
+when any of them slowed down by more than --threshold.
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+import tempfile
+from collections import deque
+from collections.abc import Callable
+from itertools import chain, islice
+from pathlib import Path
+
+from rich.console import Console
+
+from benchmarks.generator import parse_levels, write_export
+from benchmarks.harness import best_of, print_table
+from benchmarks.parser import parser_cases
+from logsentinel.filters import LevelFilter, SearchFilter
+from logsentinel.formatters import TableFormatter
+from logsentinel.models import LogLevel
+from logsentinel.parsers import CloudWatchParser
+
+BASELINE_VERSION = 1
+THRESHOLD = 0.10
+# Rich renders a few thousand rows per second, so the table runs on a prefix.
+TABLE_ENTRIES = 5_000
+# Cases on LogEntry objects and event dicts run on a prefix too, so the whole
+# export is only ever held as columnar batches; throughput is per item either way.
+SAMPLE_EVENTS = 50_000
+
+
+def run_suite(
+    export: Path,
+    repeat: int,
+    table_entries: int,
+    sample_events: int = SAMPLE_EVENTS,
+) -> dict[str, object]:
+    log_parser = CloudWatchParser()
+    batches = list(log_parser.iter_batches(export))
+    total = sum(map(len, batches))
+    entries = list(islice(chain.from_iterable(batches), sample_events))
+    sampled = list(islice(log_parser._iter_events(export), sample_events))
+    events = [event for event, _, _ in sampled]
+    source = sampled[0][1] if sampled else ""
+    level_filter = LevelFilter(LogLevel.WARNING)
+    search_filter = SearchFilter(["timeout", "payment"])
+    head = entries[:table_entries]
+
+    def table() -> None:
+        console = Console(file=io.StringIO(), width=160)
+        for chunk in TableFormatter().stream(head):
+            console.print(chunk)
+
+    # Parsing and the batch filters stream: each case drops its output as it
+    # goes rather than collecting it.
+    cases: list[tuple[str, Callable[[], object], int]] = [
+        ("iter_file", lambda: deque(log_parser.iter_file(export), maxlen=0), total),
+        ("iter_batches", lambda: deque(log_parser.iter_batches(export), maxlen=0), total),
+        *(
+            (f"parser_{name.lstrip('_')}", func, len(events))
+            for name, func in parser_cases(events, source)
+        ),
+        ("level_filter", lambda: level_filter.apply(entries), len(entries)),
+        (
+            "level_filter_batch",
+            lambda: deque(map(level_filter.apply_batch, batches), maxlen=0),
+            total,
+        ),
+        ("search_filter", lambda: search_filter.apply(entries), len(entries)),
+        (
+            "search_filter_batch",
+            lambda: deque(map(search_filter.apply_batch, batches), maxlen=0),
+            total,
+        ),
+        ("table_formatter", table, len(head)),
+    ]
+    results = {}
+    for name, func, items in cases:
+        seconds = best_of(func, repeat=1 if name == "table_formatter" else repeat)
+        results[name] = {
+            "seconds": seconds,
+            "items": items,
+            "per_second": items / seconds if seconds else 0.0,
+        }
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "export_bytes": export.stat().st_size,
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, object], current: dict[str, object], threshold: float
+) -> tuple[list[tuple[object, ...]], list[str]]:
+    # Throughput rather than wall time is compared, so runs over different event
+    # counts still line up.
+    old = baseline["results"]
+    new = current["results"]
+    assert isinstance(old, dict) and isinstance(new, dict)
+    rows = []
+    regressions = []
+    for name in sorted(old.keys() & new.keys()):
+        before = old[name]["per_second"]
+        after = new[name]["per_second"]
+        change = after / before - 1 if before else 0.0
+        status = "ok"
+        if change < -threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif change > threshold:
+            status = "faster"
+        rows.append((
+            name,
+            f"{before / 1e3:.0f}k/s",
+            f"{after / 1e3:.0f}k/s",
+            f"{change:+.1%}",
+            status,
+        ))
+    return rows, regressions
+
+
+def load(path: Path) -> dict[str, object]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+        raise SystemExit(f"{path}: not a version {BASELINE_VERSION} baseline")
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite and print its results")
+    run.add_argument("--events", type=int, default=200_000)
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--levels", type=parse_levels, default=None)
+    run.add_argument("--request-ids", type=int, default=10_000)
+    run.add_argument("--message-length", type=int, default=80)
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--table-entries", type=int, default=TABLE_ENTRIES)
+    run.add_argument("--sample-events", type=int, default=SAMPLE_EVENTS)
+    run.add_argument("--save", type=Path, help="write the results as a JSON baseline")
+    check = commands.add_parser("compare", help="compare two saved baselines")
+    check.add_argument("baseline", type=Path)
+    check.add_argument("current", type=Path)
+    check.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="slowdown that counts as a regression (default: 0.10 = 10%%)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        rows, regressions = compare(
+            load(args.baseline), load(args.current), args.threshold
+        )
+        print_table(["benchmark", "baseline", "current", "change", "status"], rows)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        export = Path(directory) / "export.json"
+        write_export(
+            export,
+            args.events,
+            args.seed,
+            args.levels,
+            args.request_ids,
+            args.message_length,
+        )
+        report = run_suite(
+            export, args.repeat, args.table_entries, args.sample_events
+        )
+    report["generator"] = {
+        "events": args.events,
+        "seed": args.seed,
+        "levels": args.levels,
+        "request_ids": args.request_ids,
+        "message_length": args.message_length,
+    }
+    results = report["results"]
+    assert isinstance(results, dict)
+    print(f"{args.events} events, best of {args.repeat} (table: one run)")
+    print_table(["benchmark", "total", "items", "throughput"], [
+        (
+            name,
+            result["seconds"],
+            result["items"],
+            f"{result['per_second'] / 1e3:.0f}k/s",
+        )
+        for name, result in results.items()
+    ])
+    if args.save is not None:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
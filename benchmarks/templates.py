@@ -0,0 +1,48 @@
+"""Template mining throughput on one core.
+
+    python -m benchmarks.templates --events 500000
+"""
+import argparse
+import random
+
+from benchmarks.harness import best_of, print_table
+from benchmarks.parser import make_events
+from logsentinel.analysis import TemplateMiner
+
+WORDS = ("alpha", "beta", "gamma", "delta", "omega", "users", "orders", "cache")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    lambda_lines = [str(event["message"]) for event in make_events(args.events, rng)]
+    # Word parameters defeat the repeat cache, so every line walks the tree.
+    word_lines = [
+        f"worker {rng.choice(WORDS)} moved {rng.choice(WORDS)} to {rng.choice(WORDS)}"
+        f" shard {rng.choice(WORDS)}{rng.choice(WORDS)}"
+        for _ in range(args.events)
+    ]
+
+    rows = []
+    for name, lines in [("lambda lines", lambda_lines), ("word params", word_lines)]:
+        miners = []
+
+        def mine() -> None:
+            miner = TemplateMiner()
+            for line in lines:
+                miner.add(line)
+            miners.append(miner)
+
+        elapsed = best_of(mine, repeat=3)
+        rate = len(lines) / elapsed * 60 / 1e6
+        rows.append((name, elapsed, len(miners[-1]), f"{rate:.1f}M lines/min"))
+    print(f"{args.events} lines per run, best of 3")
+    print_table(["input", "total", "templates", "throughput"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from logsentinel.analysis.executions import ExecutionGrouper as ExecutionGrouper
+from logsentinel.analysis.stats import LogStats as LogStats
+from logsentinel.analysis.templates import TemplateMiner as TemplateMiner
+
+__all__ = ["ExecutionGrouper", "LogStats", "TemplateMiner"]
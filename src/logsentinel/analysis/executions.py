@@ -0,0 +1,212 @@
+import json
+import tempfile
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from datetime import timedelta
+from pathlib import Path
+from typing import TextIO
+
+from logsentinel.models import Execution, LogEntry
+from logsentinel.models.log_batch import from_epoch_ms, to_epoch_ms
+
+WINDOW = timedelta(minutes=5)
+MAX_OPEN = 100_000
+SPILL_PARTITIONS = 64
+
+_SPILL_FILTER_BITS = 1 << 20
+# Lambda's closing lines for an invocation; unkeyed lines after them belong to
+# whatever runs next on the source.
+_INVOCATION_END = ("END RequestId:", "REPORT RequestId:")
+
+
+class _Group:
+    __slots__ = ("key", "source", "start", "end", "count", "errors")
+
+    def __init__(
+        self,
+        key: str,
+        source: str,
+        start: int,
+        end: int | None = None,
+        count: int = 0,
+        errors: int = 0,
+    ) -> None:
+        self.key = key
+        self.source = source
+        self.start = start
+        self.end = start if end is None else end
+        self.count = count
+        self.errors = errors
+
+    def add(self, timestamp: int, error: bool) -> None:
+        if timestamp < self.start:
+            self.start = timestamp
+        elif timestamp > self.end:
+            self.end = timestamp
+        self.count += 1
+        self.errors += error
+
+    def merge(self, other: "_Group") -> None:
+        self.start = min(self.start, other.start)
+        self.end = max(self.end, other.end)
+        self.count += other.count
+        self.errors += other.errors
+
+    def row(self) -> list[str | int]:
+        return [self.key, self.source, self.start, self.end, self.count, self.errors]
+
+    def to_execution(self) -> Execution:
+        return Execution(
+            key=self.key,
+            source=self.source,
+            start=from_epoch_ms(self.start),
+            end=from_epoch_ms(self.end),
+            entry_count=self.count,
+            error_count=self.errors,
+        )
+
+
+class _Spill:
+    def __init__(self, partitions: int = SPILL_PARTITIONS) -> None:
+        self.partitions = partitions
+        self.count = 0
+        self._directory: tempfile.TemporaryDirectory[str] | None = None
+        self._files: dict[int, TextIO] = {}
+        # One bit per key hash; a false positive only sends a group through the
+        # spill files, which is slower but still correct.
+        self._filter = bytearray(_SPILL_FILTER_BITS // 8)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return zlib.crc32(key.encode("utf-8", "surrogatepass"))
+
+    def __contains__(self, key: str) -> bool:
+        if not self.count:
+            return False
+        bit = self._hash(key) % _SPILL_FILTER_BITS
+        return bool(self._filter[bit >> 3] >> (bit & 7) & 1)
+
+    def write(self, group: _Group) -> None:
+        key_hash = self._hash(group.key)
+        bit = key_hash % _SPILL_FILTER_BITS
+        self._filter[bit >> 3] |= 1 << (bit & 7)
+        partition = key_hash % self.partitions
+        stream = self._files.get(partition)
+        if stream is None:
+            if self._directory is None:
+                self._directory = tempfile.TemporaryDirectory(prefix="logsentinel-")
+            path = Path(self._directory.name) / f"{partition}.jsonl"
+            stream = self._files[partition] = path.open("a", encoding="utf-8")
+        stream.write(json.dumps(group.row()) + "\n")
+        self.count += 1
+
+    def drain(self) -> Iterator[_Group]:
+        # Every partial of a key lands in the same partition, so partitions can be
+        # merged one at a time.
+        try:
+            for partition in sorted(self._files):
+                stream = self._files.pop(partition)
+                stream.close()
+                path = Path(stream.name)
+                merged: dict[str, _Group] = {}
+                with path.open(encoding="utf-8") as rows:
+                    for row in rows:
+                        group = _Group(*json.loads(row))
+                        existing = merged.get(group.key)
+                        if existing is None:
+                            merged[group.key] = group
+                        else:
+                            existing.merge(group)
+                yield from sorted(merged.values(), key=lambda group: group.start)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        for stream in self._files.values():
+            stream.close()
+        self._files.clear()
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+
+class ExecutionGrouper:
+    def __init__(
+        self,
+        window: timedelta = WINDOW,
+        max_open: int = MAX_OPEN,
+        spill_partitions: int = SPILL_PARTITIONS,
+    ) -> None:
+        self.window_ms = int(window.total_seconds() * 1000)
+        self.max_open = max_open
+        self.ungrouped = 0
+        # Least recently updated first: eviction and watermark checks both start
+        # at the front.
+        self._open: OrderedDict[str, _Group] = OrderedDict()
+        self._current: dict[str, str] = {}
+        self._watermark: int | None = None
+        self._spill = _Spill(spill_partitions)
+
+    @property
+    def spilled(self) -> int:
+        return self._spill.count
+
+    def _key(self, entry: LogEntry) -> str | None:
+        key = entry.correlation_id or entry.request_id
+        if key is not None:
+            if entry.message.startswith(_INVOCATION_END):
+                self._current.pop(entry.source, None)
+            else:
+                self._current[entry.source] = key
+            return key
+        # Lines between START and END of an invocation carry no request id; they
+        # belong to the execution last seen on the same source.
+        key = self._current.get(entry.source)
+        return key if key in self._open else None
+
+    def _close(self, cutoff: int) -> Iterator[Execution]:
+        while self._open:
+            key, group = next(iter(self._open.items()))
+            if group.end >= cutoff:
+                return
+            del self._open[key]
+            if key in self._spill:
+                self._spill.write(group)
+            else:
+                yield group.to_execution()
+
+    def feed(self, entries: Iterable[LogEntry]) -> Iterator[Execution]:
+        groups = self._open
+        for entry in entries:
+            key = self._key(entry)
+            if key is None:
+                self.ungrouped += 1
+                continue
+            timestamp = to_epoch_ms(entry.timestamp)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = _Group(key, entry.source, timestamp)
+                if len(groups) > self.max_open:
+                    self._spill.write(groups.popitem(last=False)[1])
+            else:
+                groups.move_to_end(key)
+            group.add(timestamp, entry.is_error())
+            if self._watermark is None or timestamp > self._watermark:
+                self._watermark = timestamp
+                yield from self._close(timestamp - self.window_ms)
+
+    def finish(self) -> Iterator[Execution]:
+        remaining = sorted(self._open.values(), key=lambda group: group.start)
+        self._open.clear()
+        for group in remaining:
+            if group.key in self._spill:
+                self._spill.write(group)
+            else:
+                yield group.to_execution()
+        for group in self._spill.drain():
+            yield group.to_execution()
+
+    def group(self, entries: Iterable[LogEntry]) -> Iterator[Execution]:
+        yield from self.feed(entries)
+        yield from self.finish()
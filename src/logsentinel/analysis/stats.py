@@ -0,0 +1,121 @@
+import re
+from collections import Counter
+from collections.abc import Iterable
+from datetime import timedelta
+
+from logsentinel.models import LogBatch, LogEntry, LogLevel
+from logsentinel.models.log_batch import iter_batches
+from logsentinel.utils.tdigest import TDigest
+
+BUCKET = timedelta(minutes=5)
+BATCH_SIZE = 4096
+ERROR_LEVELS = (LogLevel.ERROR, LogLevel.CRITICAL)
+
+# Lambda reports each invocation's duration on its closing REPORT line, next to
+# the billed and init durations.
+_REPORT = "REPORT RequestId:"
+_DURATION = re.compile(r"(?<!Billed )(?<!Init )\bDuration: ([\d.]+) ms")
+
+
+class SourceStats:
+    __slots__ = ("entries", "errors", "first_error", "last_error", "durations")
+
+    def __init__(self) -> None:
+        self.entries = 0
+        self.errors = 0
+        self.first_error: int | None = None
+        self.last_error: int | None = None
+        self.durations = TDigest()
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.entries if self.entries else 0.0
+
+    def _error_at(self, timestamp: int) -> None:
+        if self.first_error is None or timestamp < self.first_error:
+            self.first_error = timestamp
+        if self.last_error is None or timestamp > self.last_error:
+            self.last_error = timestamp
+
+    def merge(self, other: "SourceStats") -> None:
+        self.entries += other.entries
+        self.errors += other.errors
+        for timestamp in (other.first_error, other.last_error):
+            if timestamp is not None:
+                self._error_at(timestamp)
+        self.durations.merge(other.durations)
+
+
+class LogStats:
+    def __init__(self, bucket: timedelta = BUCKET) -> None:
+        self.bucket_ms = int(bucket.total_seconds() * 1000)
+        if self.bucket_ms <= 0:
+            raise ValueError("bucket must be positive")
+        # Memory follows sources x buckets x levels, never the number of entries.
+        self.counts: Counter[tuple[str, int, int]] = Counter()
+        self.sources: dict[str, SourceStats] = {}
+        self.durations = TDigest()
+
+    @property
+    def entries(self) -> int:
+        return sum(source.entries for source in self.sources.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(source.errors for source in self.sources.values())
+
+    def _source(self, name: str) -> SourceStats:
+        source = self.sources.get(name)
+        if source is None:
+            source = self.sources[name] = SourceStats()
+        return source
+
+    def add_batch(self, batch: LogBatch) -> None:
+        # Counting works on the columns directly: one Counter over
+        # (source id, bucket, level) tuples per batch instead of a dict update
+        # per entry.
+        bucket_ms = self.bucket_ms
+        timestamps = batch.timestamps
+        levels = batch.levels
+        source_ids = batch.source_ids
+        buckets = [timestamp - timestamp % bucket_ms for timestamp in timestamps]
+        names = batch.sources
+        for (source_id, bucket, level), count in Counter(
+            zip(source_ids, buckets, levels)
+        ).items():
+            name = names[source_id]
+            self.counts[name, bucket, level] += count
+            source = self._source(name)
+            source.entries += count
+            if level in ERROR_LEVELS:
+                source.errors += count
+        if any(level in levels for level in ERROR_LEVELS):
+            for index, level in enumerate(levels):
+                if level in ERROR_LEVELS:
+                    source = self.sources[names[source_ids[index]]]
+                    source._error_at(timestamps[index])
+        for index, message in enumerate(batch.messages):
+            if message.startswith(_REPORT):
+                match = _DURATION.search(message)
+                if match is not None:
+                    duration = float(match.group(1))
+                    self.sources[names[source_ids[index]]].durations.add(duration)
+                    self.durations.add(duration)
+
+    def feed(self, entries: Iterable[LogEntry]) -> None:
+        for batch in iter_batches(entries, BATCH_SIZE):
+            self.add_batch(batch)
+
+    def merge(self, other: "LogStats") -> None:
+        if other.bucket_ms != self.bucket_ms:
+            raise ValueError("Cannot merge stats with different buckets")
+        self.counts.update(other.counts)
+        for name, source in other.sources.items():
+            self._source(name).merge(source)
+        self.durations.merge(other.durations)
+
+    def buckets(self) -> list[tuple[int, str, dict[LogLevel, int]]]:
+        rows: dict[tuple[int, str], dict[LogLevel, int]] = {}
+        for (name, bucket, level), count in self.counts.items():
+            rows.setdefault((bucket, name), {})[LogLevel(level)] = count
+        return [(bucket, name, rows[bucket, name]) for bucket, name in sorted(rows)]
@@ -0,0 +1,212 @@
+import json
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Iterable
+from operator import eq
+from pathlib import Path
+
+from logsentinel.models import LogEntry, LogPattern
+
+DEPTH = 4
+SIMILARITY = 0.4
+MAX_CHILDREN = 100
+MAX_CLUSTERS = 50_000
+WILDCARD = "<*>"
+STATE_VERSION = 1
+
+_SEEN_SIZE = 100_000
+# Tokens holding a digit are ids, counts, timestamps or addresses often enough
+# that Drain treats them as parameters up front.
+_NUMERIC_TOKEN = re.compile(r"\S*\d\S*")
+
+
+class _Node:
+    __slots__ = ("children", "clusters")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.clusters: list[_Cluster] = []
+
+
+class _Cluster:
+    __slots__ = ("id", "tokens", "count", "example", "path", "leaf")
+
+    def __init__(
+        self,
+        cluster_id: int,
+        tokens: list[str],
+        count: int,
+        example: str,
+        path: tuple[str, ...],
+    ) -> None:
+        self.id = cluster_id
+        self.tokens = tokens
+        self.count = count
+        self.example = example
+        # Branches taken from the root, kept so a restored tree is identical even
+        # after the template generalised one of the routing tokens.
+        self.path = path
+        self.leaf: list[_Cluster] = []
+
+    def row(self) -> list[object]:
+        return [self.id, self.tokens, self.count, self.example, list(self.path)]
+
+    def to_pattern(self) -> LogPattern:
+        return LogPattern(
+            id=self.id,
+            template=" ".join(self.tokens),
+            count=self.count,
+            example=self.example,
+        )
+
+
+class TemplateMiner:
+    def __init__(
+        self,
+        depth: int = DEPTH,
+        similarity: float = SIMILARITY,
+        max_children: int = MAX_CHILDREN,
+        max_clusters: int = MAX_CLUSTERS,
+    ) -> None:
+        if depth < 3:
+            raise ValueError("depth must be at least 3")
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.evicted = 0
+        self._root = _Node()
+        # Least recently matched first, so eviction drops clusters that have
+        # stopped appearing.
+        self._clusters: OrderedDict[int, _Cluster] = OrderedDict()
+        self._next_id = 1
+        # Masked messages seen recently, mapped to their cluster; repeats skip the
+        # tree walk and the similarity scan. Ids are never reused, so an entry
+        # whose cluster was evicted is simply ignored.
+        self._seen: dict[str, _Cluster] = {}
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def _route(self, tokens: list[str]) -> tuple[str, ...]:
+        # Depth counts the root, the token-count layer and the leaf, as in Drain;
+        # the layers in between route on leading tokens.
+        path = [str(len(tokens))]
+        node = self._root.children.get(path[0])
+        for token in tokens[:self.depth - 3]:
+            if node is not None and token not in node.children:
+                if len(node.children) >= self.max_children:
+                    token = WILDCARD
+            path.append(token)
+            node = node.children.get(token) if node is not None else None
+        return tuple(path)
+
+    def _leaf(self, path: tuple[str, ...]) -> list[_Cluster]:
+        node = self._root
+        for token in path:
+            child = node.children.get(token)
+            if child is None:
+                child = node.children[token] = _Node()
+            node = child
+        return node.clusters
+
+    def _best(self, leaf: list[_Cluster], tokens: list[str]) -> _Cluster | None:
+        best = None
+        best_matches = -1
+        for cluster in leaf:
+            matches = sum(map(eq, cluster.tokens, tokens))
+            if matches > best_matches:
+                best, best_matches = cluster, matches
+        if best is None or best_matches < self.similarity * len(tokens):
+            return None
+        return best
+
+    def _evict(self) -> None:
+        while len(self._clusters) > self.max_clusters:
+            _, cluster = self._clusters.popitem(last=False)
+            cluster.leaf.remove(cluster)
+            self.evicted += 1
+
+    def _insert(self, cluster: _Cluster) -> None:
+        cluster.leaf = self._leaf(cluster.path)
+        cluster.leaf.append(cluster)
+        self._clusters[cluster.id] = cluster
+
+    def add(self, message: str) -> int:
+        masked = _NUMERIC_TOKEN.sub(WILDCARD, message)
+        cluster = self._seen.get(masked)
+        if cluster is not None and cluster.id in self._clusters:
+            cluster.count += 1
+            self._clusters.move_to_end(cluster.id)
+            return cluster.id
+        tokens = masked.split()
+        path = self._route(tokens)
+        leaf = self._leaf(path)
+        cluster = self._best(leaf, tokens)
+        if cluster is None:
+            cluster = _Cluster(self._next_id, tokens, 0, message, path)
+            self._next_id += 1
+            self._insert(cluster)
+            if len(self._clusters) > self.max_clusters:
+                self._evict()
+        elif cluster.tokens != tokens:
+            cluster.tokens = [
+                token if token == other else WILDCARD
+                for token, other in zip(cluster.tokens, tokens)
+            ]
+        cluster.count += 1
+        self._clusters.move_to_end(cluster.id)
+        if len(self._seen) >= _SEEN_SIZE:
+            self._seen.clear()
+        self._seen[masked] = cluster
+        return cluster.id
+
+    def feed(self, entries: Iterable[LogEntry]) -> None:
+        add = self.add
+        for entry in entries:
+            add(entry.message)
+
+    def patterns(self, top: int | None = None) -> list[LogPattern]:
+        clusters = sorted(
+            self._clusters.values(), key=lambda cluster: (-cluster.count, cluster.id)
+        )
+        return [cluster.to_pattern() for cluster in clusters[:top]]
+
+    def save(self, path: Path) -> None:
+        state = {
+            "version": STATE_VERSION,
+            "depth": self.depth,
+            "similarity": self.similarity,
+            "max_children": self.max_children,
+            "max_clusters": self.max_clusters,
+            "next_id": self._next_id,
+            "evicted": self.evicted,
+            "clusters": [cluster.row() for cluster in self._clusters.values()],
+        }
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TemplateMiner":
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+            if state.get("version") != STATE_VERSION:
+                raise ValueError(f"Unsupported template state version in {path}")
+            miner = cls(
+                state["depth"],
+                state["similarity"],
+                state["max_children"],
+                state["max_clusters"],
+            )
+            miner._next_id = state["next_id"]
+            miner.evicted = state["evicted"]
+            # Rows are stored least recently matched first, which rebuilds the
+            # eviction order as well.
+            for cluster_id, tokens, count, example, route in state["clusters"]:
+                cluster = _Cluster(cluster_id, tokens, count, example, tuple(route))
+                miner._insert(cluster)
+        except (AttributeError, KeyError, TypeError) as error:
+            raise ValueError(f"Invalid template state in {path}") from error
+        return miner
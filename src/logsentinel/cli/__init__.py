@@ -1,63 +1,361 @@
-from enum import Enum
 from pathlib import Path
 from typing import Optional
 
 import typer
-from rich.console import Console
 
 from logsentinel import __version__
-from logsentinel.filters import LevelFilter, SearchFilter
-from logsentinel.formatters import TableFormatter
-from logsentinel.models import LogLevel
-from logsentinel.parsers import CloudWatchParser
+from logsentinel.cli.options import (
+    AUTO,
+    DEPTH,
+    FORMAT_HELP,
+    HOST,
+    LATENESS,
+    MAX_CLUSTERS,
+    MAX_OPEN,
+    MEMORY_MB,
+    PORT,
+    QUEUE_SIZE,
+    SIMILARITY,
+    Match,
+    Order,
+    Output,
+)
 
+# Only Typer is loaded up front. Each command imports its implementation, and
+# with it Rich, the parsers and the rest, when it runs, so `version` or --help
+# start without them.
 app = typer.Typer(name="logsentinel", help="logsentinel CLI tool", add_completion=False)
 
 
-class Format(str, Enum):
-    cloudwatch = "cloudwatch"
-
-
 @app.command()
 def version() -> None:
     typer.echo("LogSentinel v{}".format(__version__))
 
 
-valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
+@app.command("index")
+def index_files(
+    files: list[Path] = typer.Argument(
+        ..., help="Export files, directories or glob patterns"
+    ),
+    format: str = typer.Option(AUTO, "--format", help=FORMAT_HELP),
+    force: bool = typer.Option(False, "--force", help="Rebuild up-to-date indexes"),
+) -> None:
+    from logsentinel.cli.commands.index import run
+
+    run(files, format, force)
 
 
 @app.command()
 def parse(
-    file: Path = typer.Argument(exists=True),
-    format: Format = typer.Option(Format.cloudwatch, "--format"),
+    files: list[Path] = typer.Argument(
+        ..., help="Export files, directories or glob patterns; - reads stdin"
+    ),
+    format: str = typer.Option(AUTO, "--format", help=FORMAT_HELP),
+    level: Optional[str] = typer.Option(None, "--level"),
+    search: Optional[list[str]] = typer.Option(
+        None, "--search", help="Keyword to look for; repeat for several"
+    ),
+    regex: Optional[list[str]] = typer.Option(
+        None, "--regex", help="Regular expression; repeat for several"
+    ),
+    match: Match = typer.Option(Match.any, "--match", help="Combine search terms"),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Parallel parse workers"),
+    order: Order = typer.Option(
+        Order.auto,
+        "--order",
+        help="auto (merge files in parallel, each in its written order), stream "
+        "(merge lazily, reordering up to --lateness) or external (sort through "
+        "temp files)",
+    ),
+    lateness: float = typer.Option(
+        LATENESS,
+        "--lateness",
+        min=0,
+        help="Seconds an entry may trail newer ones with --order stream",
+    ),
+    since: Optional[str] = typer.Option(None, "--since", help="ISO 8601, UTC if naive"),
+    until: Optional[str] = typer.Option(None, "--until", help="ISO 8601, UTC if naive"),
+    use_index: bool = typer.Option(
+        True, "--index/--no-index", help="Answer filters from an existing index"
+    ),
+    prefilter: bool = typer.Option(
+        True,
+        "--prefilter/--no-prefilter",
+        help="Scan raw bytes for keywords and levels before decoding events",
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parsed results of unchanged files"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="LOGSENTINEL_CACHE_DIR",
+        help="Parsed-result cache location (default ~/.cache/logsentinel)",
+    ),
+    use_server: bool = typer.Option(
+        True, "--server/--no-server", help="Ask a running `logsentinel serve`"
+    ),
+    head: Optional[int] = typer.Option(
+        None, "--head", "--limit", min=0, help="Stop after this many entries"
+    ),
+    tail: Optional[int] = typer.Option(
+        None, "--tail", min=0, help="Only the last entries; reads everything"
+    ),
+    pager: bool = typer.Option(
+        False, "--pager", help="Scroll through the results in the terminal"
+    ),
+    output: Output = typer.Option(
+        Output.table, "--output", "-o", help="table, or ndjson/csv/columnar for tools"
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Print time, throughput and memory per stage"
+    ),
+    profile_pstats: Optional[Path] = typer.Option(
+        None, "--profile-pstats", help="Write a cProfile/pstats dump here"
+    ),
+    profile_stacks: Optional[Path] = typer.Option(
+        None, "--profile-stacks", help="Write sampled stacks for flame graphs here"
+    ),
+) -> None:
+    from logsentinel.cli.commands.parse import run
+
+    run(
+        files,
+        format,
+        level,
+        search,
+        regex,
+        match,
+        jobs,
+        order,
+        lateness,
+        since,
+        until,
+        use_index,
+        prefilter,
+        use_cache,
+        cache_dir,
+        use_server,
+        head,
+        tail,
+        pager,
+        output,
+        profile,
+        profile_pstats,
+        profile_stacks,
+    )
+
+
+@app.command()
+def tail(
+    file: Path = typer.Argument(..., help="Log file; JSON lines are read as events"),
+    follow: bool = typer.Option(
+        False, "--follow", "-f", help="Keep printing entries as the file grows"
+    ),
+    lines: int = typer.Option(
+        10, "--lines", "-n", min=0, help="Start this many lines before the end"
+    ),
+    level: Optional[str] = typer.Option(None, "--level"),
+    search: Optional[list[str]] = typer.Option(
+        None, "--search", help="Keyword to look for; repeat for several"
+    ),
+    regex: Optional[list[str]] = typer.Option(
+        None, "--regex", help="Regular expression; repeat for several"
+    ),
+    match: Match = typer.Option(Match.any, "--match", help="Combine search terms"),
+) -> None:
+    from logsentinel.cli.commands.tail import run
+
+    run(file, follow, lines, level, search, regex, match)
+
+
+@app.command()
+def executions(
+    files: list[Path] = typer.Argument(
+        ..., help="Export files, directories or glob patterns"
+    ),
+    format: str = typer.Option(AUTO, "--format", help=FORMAT_HELP),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Parallel parse workers"),
+    window: float = typer.Option(
+        300, "--window", min=0, help="Seconds of silence that close an execution"
+    ),
+    max_open: int = typer.Option(
+        MAX_OPEN, "--max-open", min=1, help="Open executions kept before spilling"
+    ),
+    failed: bool = typer.Option(False, "--failed", help="Only executions with errors"),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parsed results of unchanged files"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="LOGSENTINEL_CACHE_DIR",
+        help="Parsed-result cache location (default ~/.cache/logsentinel)",
+    ),
+) -> None:
+    from logsentinel.cli.commands.executions import run
+
+    run(files, format, jobs, window, max_open, failed, use_cache, cache_dir)
+
+
+@app.command()
+def templates(
+    files: list[Path] = typer.Argument(
+        ..., help="Export files, directories or glob patterns"
+    ),
+    format: str = typer.Option(AUTO, "--format", help=FORMAT_HELP),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Parallel parse workers"),
+    top: int = typer.Option(20, "--top", min=1, help="Templates to show"),
+    state: Optional[Path] = typer.Option(
+        None, "--state", help="Load templates from this file first and save them back"
+    ),
+    similarity: float = typer.Option(
+        SIMILARITY, "--similarity", min=0, max=1, help="Share of tokens that must match"
+    ),
+    depth: int = typer.Option(DEPTH, "--depth", min=3, help="Parse tree depth"),
+    max_clusters: int = typer.Option(
+        MAX_CLUSTERS, "--max-clusters", min=1, help="Templates kept before evicting"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parsed results of unchanged files"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="LOGSENTINEL_CACHE_DIR",
+        help="Parsed-result cache location (default ~/.cache/logsentinel)",
+    ),
+) -> None:
+    from logsentinel.cli.commands.templates import run
+
+    run(
+        files,
+        format,
+        jobs,
+        top,
+        state,
+        similarity,
+        depth,
+        max_clusters,
+        use_cache,
+        cache_dir,
+    )
+
+
+@app.command()
+def stats(
+    files: list[Path] = typer.Argument(
+        ..., help="Export files, directories or glob patterns"
+    ),
+    format: str = typer.Option(AUTO, "--format", help=FORMAT_HELP),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Parallel parse workers"),
+    bucket: float = typer.Option(
+        300, "--bucket", min=1, help="Seconds per time bucket"
+    ),
+    show_buckets: bool = typer.Option(
+        True, "--buckets/--no-buckets", help="Counts per source and time bucket"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parsed results of unchanged files"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="LOGSENTINEL_CACHE_DIR",
+        help="Parsed-result cache location (default ~/.cache/logsentinel)",
+    ),
+) -> None:
+    from logsentinel.cli.commands.stats import run
+
+    run(files, format, jobs, bucket, show_buckets, use_cache, cache_dir)
+
+
+@app.command("ingest")
+def ingest_sources(
+    inputs: Optional[list[str]] = typer.Argument(
+        None, help="Export files, directories or glob patterns; - reads stdin"
+    ),
+    format: str = typer.Option(AUTO, "--format", help=FORMAT_HELP),
+    endpoint: Optional[str] = typer.Option(
+        None, "--endpoint", help="CloudWatch Logs API endpoint to fetch from"
+    ),
+    log_group: Optional[str] = typer.Option(None, "--log-group"),
+    log_stream: Optional[list[str]] = typer.Option(
+        None, "--log-stream", help="Stream to read; repeat for several (default all)"
+    ),
+    filter_pattern: Optional[str] = typer.Option(
+        None, "--filter-pattern", help="Server-side filter when reading all streams"
+    ),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Parse worker processes"),
+    queue_size: int = typer.Option(
+        QUEUE_SIZE, "--queue-size", min=1, help="Batches buffered before sources wait"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parsed results of unchanged files"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="LOGSENTINEL_CACHE_DIR",
+        help="Parsed-result cache location (default ~/.cache/logsentinel)",
+    ),
     level: Optional[str] = typer.Option(None, "--level"),
-    search: Optional[str] = typer.Option(None, "--search")
-) -> None:
-    if level is not None:
-        if level.upper() not in valid_levels:
-            typer.echo("Error: invalid level {}".format(level), err=True)
-            raise typer.Exit(code=1)
-    parser = CloudWatchParser()
-    try:
-        result = parser.parse_file(file)
-    except FileNotFoundError:
-        typer.echo("Error: file {} not found".format(file), err=True)
-        raise typer.Exit(code=1)
-    except ValueError:
-        typer.echo("Error: file {} not valid".format(file), err=True)
-        raise typer.Exit(code=1)
-    if len(result) == 0:
-        typer.echo("No log entries found.")
-        raise typer.Exit(code=0)
-
-    if level is not None:
-        min_level = LogLevel[level.upper()]
-        level_filter = LevelFilter(min_level)
-        result = level_filter.apply(result)
-
-    if search is not None:
-        result = SearchFilter(search).apply(result)
-
-    table = TableFormatter().format(entries=result)
-    Console().print(table)
+    search: Optional[list[str]] = typer.Option(
+        None, "--search", help="Keyword to look for; repeat for several"
+    ),
+    regex: Optional[list[str]] = typer.Option(
+        None, "--regex", help="Regular expression; repeat for several"
+    ),
+    match: Match = typer.Option(Match.any, "--match", help="Combine search terms"),
+    output: Output = typer.Option(
+        Output.table, "--output", "-o", help="table, or ndjson/csv/columnar for tools"
+    ),
+) -> None:
+    from logsentinel.cli.commands.ingest import run
+
+    run(
+        inputs,
+        format,
+        endpoint,
+        log_group,
+        log_stream,
+        filter_pattern,
+        jobs,
+        queue_size,
+        use_cache,
+        cache_dir,
+        level,
+        search,
+        regex,
+        match,
+        output,
+    )
+
+
+@app.command()
+def serve(
+    files: list[Path] = typer.Argument(
+        ..., help="Exports, directories or glob patterns to load and serve"
+    ),
+    format: str = typer.Option(AUTO, "--format", help=FORMAT_HELP),
+    host: str = typer.Option(HOST, "--host"),
+    port: int = typer.Option(PORT, "--port", min=0, help="0 picks a free port"),
+    memory: int = typer.Option(
+        MEMORY_MB,
+        "--memory",
+        min=1,
+        help="MiB of parsed logs to keep; least recently queried files go first",
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parsed results of unchanged files"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="LOGSENTINEL_CACHE_DIR",
+        help="Parsed-result cache and server state location",
+    ),
+) -> None:
+    from logsentinel.cli.commands.serve import run
 
+    run(files, format, host, port, memory, use_cache, cache_dir)
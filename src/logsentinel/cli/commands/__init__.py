@@ -0,0 +1,3 @@
+# Command implementations, one module each. Nothing is imported here: the CLI
+# loads a command's module, and with it Rich and the parsing stack, only when
+# that command runs.
@@ -0,0 +1,146 @@
+import re
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from datetime import UTC, datetime
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Optional, TypeVar
+
+import typer
+
+from logsentinel.cli.options import Match, Output
+from logsentinel.filters import Filter, LevelFilter, SearchFilter
+from logsentinel.formatters import WRITERS, BatchWriter
+from logsentinel.models import LogEntry, LogLevel
+from logsentinel.parsers import (
+    AUTO,
+    ParallelParser,
+    Parser,
+    detect_paths,
+    detect_stream,
+    expand_path,
+    get_parser,
+    iter_parsed,
+)
+from logsentinel.storage import ParseCache
+from logsentinel.utils.profiling import Profiler
+
+T = TypeVar("T")
+
+valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        typer.echo("Error: invalid date {}".format(value), err=True)
+        raise typer.Exit(code=1)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC)
+
+
+def check_level(level: Optional[str]) -> None:
+    if level is not None:
+        if level.upper() not in valid_levels:
+            typer.echo("Error: invalid level {}".format(level), err=True)
+            raise typer.Exit(code=1)
+
+
+def entry_filters(
+    level: Optional[str],
+    search: Optional[list[str]],
+    regex: Optional[list[str]],
+    match: Match,
+) -> list[Filter]:
+    filters: list[Filter] = []
+    if level is not None:
+        filters.append(LevelFilter(LogLevel[level.upper()]))
+    if search or regex:
+        try:
+            search_filter = SearchFilter(
+                search or [], patterns=regex or [], match_all=match is Match.all
+            )
+        except re.error as error:
+            typer.echo("Error: invalid pattern ({})".format(error), err=True)
+            raise typer.Exit(code=1)
+        filters.append(search_filter)
+    return filters
+
+
+def resolve_format(
+    format: str, paths: list[Path], stream: Optional[BinaryIO] = None
+) -> str:
+    if format != AUTO:
+        return format
+    try:
+        if stream is not None:
+            return detect_stream(stream)
+        return detect_paths(paths)
+    except ValueError as error:
+        typer.echo("Error: {}".format(error), err=True)
+        raise typer.Exit(code=1)
+
+
+def parser_for(
+    format: str, paths: list[Path], stream: Optional[BinaryIO] = None
+) -> Parser:
+    try:
+        return get_parser(resolve_format(format, paths, stream))
+    except ValueError as error:
+        typer.echo("Error: {}".format(error), err=True)
+        raise typer.Exit(code=1)
+
+
+def invalid_file(paths: list[Path], error: ValueError) -> str:
+    if not paths:
+        return "Error: stdin not valid"
+    # ParallelParser reports which of several files failed in the error message.
+    invalid = paths[0] if len(paths) == 1 else error
+    return "Error: file {} not valid".format(invalid)
+
+
+def expand_paths(files: list[Path]) -> list[Path]:
+    paths: list[Path] = []
+    for file in files:
+        matches = expand_path(file)
+        if not matches:
+            typer.echo("Error: file {} not found".format(file), err=True)
+            raise typer.Exit(code=1)
+        paths.extend(matches)
+    return paths
+
+
+def writer_for(output: Output) -> Optional[BatchWriter]:
+    # Machine-readable outputs go straight to the binary stdout, unstyled.
+    if output is Output.table:
+        return None
+    return WRITERS[output.value](sys.stdout.buffer)
+
+
+def staged(
+    profiler: Optional[Profiler],
+    name: str,
+    items: Iterator[T],
+    count: Callable[[T], int] = lambda item: 1,
+) -> Iterator[T]:
+    # Without --profile the pipeline is left exactly as built.
+    return items if profiler is None else profiler.wrap(name, items, count)
+
+
+def measured(
+    profiler: Optional[Profiler], name: str
+) -> AbstractContextManager[object]:
+    return nullcontext() if profiler is None else profiler.measure(name)
+
+
+def iter_entries(
+    parser: Parser, paths: list[Path], jobs: int, cache: Optional[ParseCache]
+) -> Iterator[LogEntry]:
+    if len(paths) == 1:
+        return chain.from_iterable(iter_parsed(parser, paths[0], cache))
+    return ParallelParser(parser, jobs, cache=cache).iter_files(paths)
@@ -0,0 +1,58 @@
+from collections.abc import Iterator
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+
+from logsentinel.analysis import ExecutionGrouper
+from logsentinel.cli.commands.common import (
+    expand_paths,
+    invalid_file,
+    iter_entries,
+    parser_for,
+)
+from logsentinel.formatters import ExecutionFormatter
+from logsentinel.models import Execution
+from logsentinel.storage import ParseCache
+
+
+def run(
+    files: list[Path],
+    format: str,
+    jobs: int,
+    window: float,
+    max_open: int,
+    failed: bool,
+    use_cache: bool,
+    cache_dir: Optional[Path],
+) -> None:
+    paths = expand_paths(files)
+    cache = ParseCache(cache_dir) if use_cache else None
+    grouper = ExecutionGrouper(timedelta(seconds=window), max_open)
+    entries = iter_entries(parser_for(format, paths), paths, jobs, cache)
+    totals = {"executions": 0, "failed": 0}
+
+    def counted(results: Iterator[Execution]) -> Iterator[Execution]:
+        for execution in results:
+            totals["executions"] += 1
+            totals["failed"] += execution.failed()
+            if execution.failed() or not failed:
+                yield execution
+
+    console = Console()
+    try:
+        for table in ExecutionFormatter().stream(counted(grouper.group(entries))):
+            console.print(table)
+    except FileNotFoundError:
+        typer.echo("Error: file {} not found".format(paths[0]), err=True)
+        raise typer.Exit(code=1)
+    except ValueError as error:
+        typer.echo(invalid_file(paths, error), err=True)
+        raise typer.Exit(code=1)
+    typer.echo(
+        "{} executions, {} failed, {} entries without an execution id".format(
+            totals["executions"], totals["failed"], grouper.ungrouped
+        )
+    )
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import typer
+
+from logsentinel.cli.commands.common import expand_paths, parser_for, resolve_format
+from logsentinel.parsers.compression import is_compressed
+from logsentinel.storage import LogIndex, build_index, index_is_fresh, index_path_for
+from logsentinel.storage.index import IndexableParser
+
+
+def run(files: list[Path], format: str, force: bool) -> None:
+    for path in expand_paths(files):
+        # Each file is detected on its own, like `serve` does.
+        # Directories pick up compressed files and other formats too; those are
+        # passed over rather than failing the whole run.
+        if is_compressed(path):
+            typer.echo("Skipping {}: compressed files cannot be indexed".format(path))
+            continue
+        name = resolve_format(format, [path])
+        parser = parser_for(name, [path])
+        if not isinstance(parser, IndexableParser):
+            typer.echo("Skipping {}: {} input cannot be indexed".format(path, name))
+            continue
+        if not force and index_is_fresh(path):
+            typer.echo("{} is already indexed".format(path))
+            continue
+        try:
+            build_index(parser, path)
+        except ValueError:
+            typer.echo("Error: file {} not valid".format(path), err=True)
+            raise typer.Exit(code=1)
+        with LogIndex(index_path_for(path)) as index:
+            typer.echo("Indexed {} entries from {}".format(index.count, path))
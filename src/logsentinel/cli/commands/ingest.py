@@ -0,0 +1,101 @@
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+
+from logsentinel.cli.commands.common import (
+    check_level,
+    entry_filters,
+    expand_paths,
+    invalid_file,
+    parser_for,
+    writer_for,
+)
+from logsentinel.cli.options import Match, Output
+from logsentinel.formatters import TableFormatter
+from logsentinel.parsers import AUTO, decompress, sniff_stream
+from logsentinel.sources import (
+    CloudWatchApiSource,
+    FileSource,
+    Source,
+    StreamSource,
+    ingest,
+    iterate,
+)
+from logsentinel.storage import ParseCache
+
+
+def run(
+    inputs: Optional[list[str]],
+    format: str,
+    endpoint: Optional[str],
+    log_group: Optional[str],
+    log_stream: Optional[list[str]],
+    filter_pattern: Optional[str],
+    jobs: int,
+    queue_size: int,
+    use_cache: bool,
+    cache_dir: Optional[Path],
+    level: Optional[str],
+    search: Optional[list[str]],
+    regex: Optional[list[str]],
+    match: Match,
+    output: Output,
+) -> None:
+    check_level(level)
+    filters = entry_filters(level, search, regex, match)
+    if (endpoint is None) != (log_group is None):
+        typer.echo("Error: --endpoint and --log-group go together", err=True)
+        raise typer.Exit(code=1)
+    inputs = inputs or []
+    if not inputs and endpoint is None:
+        typer.echo("Error: nothing to ingest", err=True)
+        raise typer.Exit(code=1)
+    cache = ParseCache(cache_dir) if use_cache else None
+    sources: list[Source] = []
+    if "-" in inputs:
+        # Detected from the head of the stream, as `parse -` does. Input no
+        # format recognises is read line by line, as JSON events or plain text.
+        stream = decompress(sys.stdin.buffer)
+        name = sniff_stream(stream) if format == AUTO else format
+        parser = None if name is None else parser_for(name, [])
+        sources.append(StreamSource(stream, parser=parser))
+    files = [Path(value) for value in inputs if value != "-"]
+    paths = expand_paths(files) if files else []
+    # Each file is detected on its own; one run can mix exports and NDJSON.
+    sources.extend(
+        FileSource(path, parser_for(format, [path]), cache) for path in paths
+    )
+    if endpoint is not None and log_group is not None:
+        try:
+            source = CloudWatchApiSource(
+                endpoint, log_group, log_stream or (), filter_pattern
+            )
+        except ValueError as error:
+            typer.echo("Error: {}".format(error), err=True)
+            raise typer.Exit(code=1)
+        sources.append(source)
+    executor: Optional[Executor] = ProcessPoolExecutor(jobs) if jobs > 1 else None
+    batches = iterate(ingest(sources, filters, queue_size, executor))
+    writer = writer_for(output)
+    console = Console()
+    try:
+        if writer is not None:
+            writer.write_batches(batches)
+        else:
+            for table in TableFormatter().stream_chunks(map(list, batches)):
+                console.print(table)
+    except OSError as error:
+        typer.echo("Error: {}".format(error), err=True)
+        raise typer.Exit(code=1)
+    except ValueError as error:
+        message = invalid_file(paths, error) if paths else "Error: {}".format(error)
+        typer.echo(message, err=True)
+        raise typer.Exit(code=1)
+    finally:
+        batches.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,245 @@
+import sys
+from collections import deque
+from collections.abc import Iterator
+from datetime import timedelta
+from itertools import chain, islice
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from logsentinel.cli.commands.common import (
+    check_level,
+    entry_filters,
+    expand_paths,
+    invalid_file,
+    measured,
+    parse_time,
+    parser_for,
+    resolve_format,
+    staged,
+    writer_for,
+)
+from logsentinel.cli.options import Match, Order, Output
+from logsentinel.filters import TimeRangeFilter
+from logsentinel.formatters import (
+    Pager,
+    ProfileFormatter,
+    TableFormatter,
+    terminal_keys,
+)
+from logsentinel.models import LogEntry
+from logsentinel.parsers import (
+    CloudWatchParser,
+    ParallelParser,
+    decompress,
+    iter_parsed,
+    stream_batches,
+)
+from logsentinel.server import Query, find_server
+from logsentinel.storage import ParseCache, default_cache_dir, open_index
+from logsentinel.storage.index import IndexableParser
+from logsentinel.utils.merge import ReorderBuffer, external_sort, merge_by_timestamp
+from logsentinel.utils.profiling import Profiler
+
+
+def _row_count(table: Table) -> int:
+    return table.row_count
+
+
+def _ordered(
+    streams: list[Iterator[LogEntry]], order: Order, buffer: ReorderBuffer
+) -> Iterator[LogEntry]:
+    if order is Order.external:
+        return external_sort(chain.from_iterable(streams))
+    return merge_by_timestamp(map(buffer.reorder, streams))
+
+
+def _served(directory: Path, query: Query) -> Optional[Iterator[LogEntry]]:
+    client = find_server(directory)
+    if client is None:
+        return None
+    try:
+        batches = client.query(query)
+    except OSError:
+        # The server went away since it answered; parse locally instead.
+        return None
+    return chain.from_iterable(batches)
+
+
+def run(
+    files: list[Path],
+    format: str,
+    level: Optional[str],
+    search: Optional[list[str]],
+    regex: Optional[list[str]],
+    match: Match,
+    jobs: int,
+    order: Order,
+    lateness: float,
+    since: Optional[str],
+    until: Optional[str],
+    use_index: bool,
+    prefilter: bool,
+    use_cache: bool,
+    cache_dir: Optional[Path],
+    use_server: bool,
+    head: Optional[int],
+    tail: Optional[int],
+    pager: bool,
+    output: Output,
+    profile: bool,
+    profile_pstats: Optional[Path],
+    profile_stacks: Optional[Path],
+) -> None:
+    check_level(level)
+    if head is not None and tail is not None:
+        typer.echo("Error: --head and --tail cannot be combined", err=True)
+        raise typer.Exit(code=1)
+    if lateness and order is not Order.stream:
+        typer.echo("Error: --lateness only applies to --order stream", err=True)
+        raise typer.Exit(code=1)
+    since_time = parse_time(since)
+    until_time = parse_time(until)
+    stdin = [str(file) for file in files] == ["-"]
+    paths = [] if stdin else expand_paths(files)
+
+    filters = entry_filters(level, search, regex, match)
+    if since_time is not None or until_time is not None:
+        filters.append(TimeRangeFilter(since_time, until_time))
+
+    stream = decompress(sys.stdin.buffer) if stdin else None
+    format = resolve_format(format, paths, stream)
+    parser = parser_for(format, paths)
+    cache = ParseCache(cache_dir) if use_cache else None
+    buffer = ReorderBuffer(timedelta(seconds=lateness))
+    profiler = None
+    if profile or profile_pstats is not None or profile_stacks is not None:
+        profiler = Profiler(pstats_path=profile_pstats, stacks_path=profile_stacks)
+        if head is None:
+            # With --head the input is only partly read, so there is no honest
+            # byte count.
+            profiler.stage("parse").bytes = sum(path.stat().st_size for path in paths)
+        profiler.start()
+    entries: Iterator[LogEntry]
+    try:
+        served = None
+        # A server answers with what a local parse would print; profiling always
+        # measures the local pipeline.
+        if use_server and paths and order is Order.auto and profiler is None:
+            query = Query(
+                paths=[str(path.resolve()) for path in paths],
+                format=format,
+                level=level,
+                search=search or [],
+                regex=regex or [],
+                match_all=match is Match.all,
+                since=None if since_time is None else since_time.isoformat(),
+                until=None if until_time is None else until_time.isoformat(),
+                limit=head,
+            )
+            served = _served(cache_dir or default_cache_dir(), query)
+        single = len(paths) == 1 and served is None
+        index = None
+        scanned = None
+        # Index and scan lookups decode and filter in one step, so all of their
+        # time is reported as parsing.
+        with measured(profiler, "parse"):
+            if single and use_index and filters:
+                if isinstance(parser, IndexableParser):
+                    index = open_index(parser, paths[0])
+            if single and index is None and prefilter and filters:
+                if isinstance(parser, CloudWatchParser):
+                    scanned = parser.scan(paths[0], filters)
+        if served is not None:
+            first = next(served, None)
+            found = first is not None
+            if first is not None:
+                entries = chain([first], served)
+        elif index is not None and isinstance(parser, IndexableParser):
+            with index, measured(profiler, "parse"):
+                found = index.count > 0
+                entries = iter(index.query(parser, paths[0], filters))
+        elif scanned is not None:
+            found = True
+            entries = iter(scanned)
+        elif single or stdin:
+            if stream is not None:
+                batches = stream_batches(parser, stream)
+            else:
+                batches = iter_parsed(parser, paths[0], cache)
+            batches = staged(profiler, "parse", batches, len)
+            first_batch = next(batches, None)
+            found = first_batch is not None
+            if first_batch is not None:
+                batches = chain([first_batch], batches)
+                if filters:
+                    for entry_filter in filters:
+                        batches = map(entry_filter.apply_batch, batches)
+                    batches = staged(profiler, "filter", batches, len)
+                entries = chain.from_iterable(batches)
+        else:
+            parallel = ParallelParser(
+                parser, jobs, filters, use_index, cache, prefilter
+            )
+            if order is Order.auto:
+                # Workers parse and filter together.
+                entries = parallel.iter_files(paths)
+            else:
+                # Files are read side by side in this process, so --jobs is unused.
+                entries = _ordered(parallel.iter_streams(paths), order, buffer)
+            entries = staged(profiler, "parse", entries)
+            first = next(entries, None)
+            found = first is not None
+            if first is not None:
+                entries = chain([first], entries)
+    except FileNotFoundError:
+        typer.echo("Error: file {} not found".format(paths[0]), err=True)
+        raise typer.Exit(code=1)
+    except ValueError as error:
+        typer.echo(invalid_file(paths, error), err=True)
+        raise typer.Exit(code=1)
+    writer = writer_for(output)
+    if not found:
+        if writer is None:
+            typer.echo("No log entries found.")
+            raise typer.Exit(code=0)
+        entries = iter(())
+    elif len(paths) <= 1 and order is not Order.auto:
+        # A single input is otherwise left in the order it was written.
+        entries = staged(profiler, "sort", _ordered([entries], order, buffer))
+
+    if head is not None:
+        # Stops pulling from the parser, so the rest of the input is never read.
+        entries = islice(entries, head)
+    console = Console()
+    try:
+        if tail is not None:
+            entries = iter(deque(entries, maxlen=tail))
+        if writer is not None:
+            with measured(profiler, "format"):
+                written = writer.write(entries)
+            if profiler is not None:
+                profiler.stage("format").entries += written
+        elif pager and console.is_terminal and sys.stdin.isatty():
+            with terminal_keys() as read_key:
+                Pager(entries, console).run(read_key)
+        else:
+            tables = TableFormatter().stream(entries)
+            for table in staged(profiler, "format", tables, _row_count):
+                with measured(profiler, "format"):
+                    console.print(table)
+    except ValueError as error:
+        typer.echo(invalid_file(paths, error), err=True)
+        raise typer.Exit(code=1)
+    if buffer.late:
+        typer.echo(
+            "Warning: {} entries trailed newer ones by more than --lateness and "
+            "are out of order".format(buffer.late),
+            err=True,
+        )
+    if profiler is not None:
+        stages = profiler.finish()
+        Console(stderr=True).print(ProfileFormatter().format(stages))
@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from logsentinel.cli.commands.common import expand_paths, parser_for
+from logsentinel.server import LogStore, QueryServer
+from logsentinel.server.client import remove_state, write_state
+from logsentinel.storage import ParseCache, default_cache_dir
+
+
+def run(
+    files: list[Path],
+    format: str,
+    host: str,
+    port: int,
+    memory: int,
+    use_cache: bool,
+    cache_dir: Optional[Path],
+) -> None:
+    directory = cache_dir or default_cache_dir()
+    cache = ParseCache(directory) if use_cache else None
+    store = LogStore(cache, memory_budget=memory * 1024**2)
+    paths = expand_paths(files)
+    # Directories stay open to files added later; globs only to what matched.
+    roots = paths + [file for file in files if file.is_dir()]
+    for path in paths:
+        # Each file is detected on its own, so one server can hold any mix.
+        parser = parser_for(format, [path])
+        try:
+            dataset = store.dataset(path, parser)
+        except ValueError:
+            typer.echo("Error: file {} not valid".format(path), err=True)
+            raise typer.Exit(code=1)
+        typer.echo("Loaded {} entries from {}".format(len(dataset), path), err=True)
+    store.evict()
+    try:
+        server = QueryServer(store, (host, port), roots)
+    except OSError as error:
+        message = "Error: cannot listen on {}:{} ({})".format(host, port, error)
+        typer.echo(message, err=True)
+        raise typer.Exit(code=1)
+    write_state(directory, host, server.server_port)
+    typer.echo("Serving on {} (Ctrl+C to stop)".format(server.url), err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        remove_state(directory)
+        server.server_close()
@@ -0,0 +1,72 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+
+from logsentinel.analysis import LogStats
+from logsentinel.cli.commands.common import expand_paths, invalid_file, parser_for
+from logsentinel.formatters import StatsFormatter
+from logsentinel.parsers import Parser, iter_parsed
+from logsentinel.storage import ParseCache
+
+
+def _file_stats(
+    parser: Parser, cache: Optional[ParseCache], bucket: timedelta, path: Path
+) -> LogStats:
+    # Runs in worker processes; the partial aggregates are merged by the caller.
+    stats = LogStats(bucket)
+    try:
+        for batch in iter_parsed(parser, path, cache):
+            stats.add_batch(batch)
+    except ValueError as error:
+        raise ValueError(str(path)) from error
+    return stats
+
+
+def run(
+    files: list[Path],
+    format: str,
+    jobs: int,
+    bucket: float,
+    show_buckets: bool,
+    use_cache: bool,
+    cache_dir: Optional[Path],
+) -> None:
+    paths = expand_paths(files)
+    cache = ParseCache(cache_dir) if use_cache else None
+    parser = parser_for(format, paths)
+    worker = partial(_file_stats, parser, cache, timedelta(seconds=bucket))
+    totals = LogStats(timedelta(seconds=bucket))
+    try:
+        if jobs > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(min(jobs, len(paths))) as executor:
+                for partial_stats in executor.map(worker, paths):
+                    totals.merge(partial_stats)
+        else:
+            for partial_stats in map(worker, paths):
+                totals.merge(partial_stats)
+    except FileNotFoundError:
+        typer.echo("Error: file {} not found".format(paths[0]), err=True)
+        raise typer.Exit(code=1)
+    except ValueError as error:
+        typer.echo(invalid_file(paths, error), err=True)
+        raise typer.Exit(code=1)
+    console = Console()
+    formatter = StatsFormatter()
+    if show_buckets:
+        for table in formatter.buckets(totals):
+            console.print(table)
+    console.print(formatter.sources(totals))
+    if len(totals.durations):
+        console.print(formatter.durations(totals))
+    typer.echo(
+        "{} entries, {} errors ({:.1%})".format(
+            totals.entries,
+            totals.errors,
+            totals.errors / totals.entries if totals.entries else 0,
+        )
+    )
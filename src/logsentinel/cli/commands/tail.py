@@ -0,0 +1,44 @@
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+
+from logsentinel.cli.commands.common import check_level, entry_filters
+from logsentinel.cli.options import Match
+from logsentinel.formatters import TableFormatter
+from logsentinel.parsers import NdjsonParser
+from logsentinel.parsers.compression import is_compressed
+from logsentinel.sources import FileFollower, open_watcher, tail_batches
+
+
+def run(
+    file: Path,
+    follow: bool,
+    lines: int,
+    level: Optional[str],
+    search: Optional[list[str]],
+    regex: Optional[list[str]],
+    match: Match,
+) -> None:
+    check_level(level)
+    filters = entry_filters(level, search, regex, match)
+    if not file.is_file():
+        typer.echo("Error: file {} not found".format(file), err=True)
+        raise typer.Exit(code=1)
+    if is_compressed(file):
+        # Byte offsets into the compressed file say nothing about where lines
+        # end, so there is nothing to follow.
+        message = "Error: cannot tail compressed file {}; use parse".format(file)
+        typer.echo(message, err=True)
+        raise typer.Exit(code=1)
+    follower = FileFollower(file)
+    follower.seek_last_lines(lines)
+    watcher = open_watcher(file) if follow else None
+    batches = tail_batches(follower, NdjsonParser(), filters, watcher)
+    console = Console()
+    try:
+        for table in TableFormatter().stream_chunks(map(list, batches)):
+            console.print(table)
+    except KeyboardInterrupt:
+        raise typer.Exit(code=0)
@@ -0,0 +1,59 @@
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+
+from logsentinel.analysis import TemplateMiner
+from logsentinel.cli.commands.common import (
+    expand_paths,
+    invalid_file,
+    iter_entries,
+    parser_for,
+)
+from logsentinel.formatters import TemplateFormatter
+from logsentinel.storage import ParseCache
+
+
+def run(
+    files: list[Path],
+    format: str,
+    jobs: int,
+    top: int,
+    state: Optional[Path],
+    similarity: float,
+    depth: int,
+    max_clusters: int,
+    use_cache: bool,
+    cache_dir: Optional[Path],
+) -> None:
+    paths = expand_paths(files)
+    cache = ParseCache(cache_dir) if use_cache else None
+    if state is not None and state.exists():
+        # A saved state keeps the settings it was mined with.
+        try:
+            miner = TemplateMiner.load(state)
+        except ValueError as error:
+            typer.echo("Error: {}".format(error), err=True)
+            raise typer.Exit(code=1)
+    else:
+        miner = TemplateMiner(depth, similarity, max_clusters=max_clusters)
+    entries = iter_entries(parser_for(format, paths), paths, jobs, cache)
+    try:
+        miner.feed(entries)
+    except FileNotFoundError:
+        typer.echo("Error: file {} not found".format(paths[0]), err=True)
+        raise typer.Exit(code=1)
+    except ValueError as error:
+        typer.echo(invalid_file(paths, error), err=True)
+        raise typer.Exit(code=1)
+    if state is not None:
+        miner.save(state)
+    patterns = miner.patterns()
+    total = sum(pattern.count for pattern in patterns)
+    Console().print(TemplateFormatter().format(patterns[:top], total))
+    typer.echo(
+        "{} templates covering {} entries, {} evicted".format(
+            len(patterns), total, miner.evicted
+        )
+    )
@@ -0,0 +1,37 @@
+from enum import Enum
+
+# Defaults shown in --help. They mirror constants of modules the CLI only loads
+# when a command runs, and tests keep the two in sync.
+MAX_OPEN = 100_000
+SIMILARITY = 0.4
+DEPTH = 4
+MAX_CLUSTERS = 50_000
+QUEUE_SIZE = 16
+LATENESS = 0.0
+HOST = "127.0.0.1"
+PORT = 0
+MEMORY_MB = 1024
+AUTO = "auto"
+
+FORMAT_HELP = (
+    "auto (sniff the input), cloudwatch, ndjson, subscription, step-functions, "
+    "lambda-text, or a format added by a plugin"
+)
+
+
+class Output(str, Enum):
+    table = "table"
+    ndjson = "ndjson"
+    csv = "csv"
+    columnar = "columnar"
+
+
+class Order(str, Enum):
+    auto = "auto"
+    stream = "stream"
+    external = "external"
+
+
+class Match(str, Enum):
+    any = "any"
+    all = "all"
@@ -1,4 +1,6 @@
+from logsentinel.filters.base import Filter as Filter
 from logsentinel.filters.level import LevelFilter as LevelFilter
 from logsentinel.filters.search import SearchFilter as SearchFilter
+from logsentinel.filters.time import TimeRangeFilter as TimeRangeFilter
 
-__all__ = ["LevelFilter", "SearchFilter"]
+__all__ = ["Filter", "LevelFilter", "SearchFilter", "TimeRangeFilter"]
@@ -0,0 +1,16 @@
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Protocol
+
+from logsentinel.models import LogBatch, LogEntry
+
+if TYPE_CHECKING:
+    from logsentinel.parsers.scan import ExportScanner
+    from logsentinel.storage.index import PostingIndex
+
+
+class Filter(Protocol):
+    def stream(self, entries: Iterable[LogEntry]) -> Iterator[LogEntry]:...
+    def apply(self, entries: list[LogEntry]) -> list[LogEntry]:...
+    def apply_batch(self, batch: LogBatch) -> LogBatch:...
+    def candidates(self, index: "PostingIndex") -> Sequence[int] | None:...
+    def scan_candidates(self, scanner: "ExportScanner") -> Sequence[int] | None:...
@@ -1,13 +1,46 @@
-from logsentinel.models import LogEntry, LogLevel
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING
+
+from logsentinel.models import LogBatch, LogEntry, LogLevel
+from logsentinel.utils.vector import level_table, select_levels
+
+if TYPE_CHECKING:
+    from logsentinel.parsers.scan import ExportScanner
+    from logsentinel.storage.index import PostingIndex
 
 
 class LevelFilter:
     def __init__(self, min_level: LogLevel):
         self.min_level = min_level
+        self._table = level_table(
+            {level.value for level in LogLevel if self._accepts(level)}
+        )
+
+    def _accepts(self, level: int) -> bool:
+        return level >= self.min_level or level == LogLevel.UNKNOWN
+
+    def stream(self, entries: Iterable[LogEntry]) -> Iterator[LogEntry]:
+        return (entry for entry in entries if self._accepts(entry.level))
 
     def apply(self, entries: list[LogEntry]) -> list[LogEntry]:
-        return [
-            entry
-            for entry in entries
-            if entry.level >= self.min_level or entry.level == LogLevel.UNKNOWN
-        ]
+        return list(self.stream(entries))
+
+    def apply_batch(self, batch: LogBatch) -> LogBatch:
+        selected = select_levels(batch.levels, self._table)
+        if len(selected) == len(batch):
+            return batch
+        return batch.take(selected)
+
+    def _narrow(
+        self, lookup: Callable[[Sequence[int]], Sequence[int] | None]
+    ) -> Sequence[int] | None:
+        accepted = [level.value for level in LogLevel if self._accepts(level)]
+        if len(accepted) == len(LogLevel):
+            return None
+        return lookup(accepted)
+
+    def candidates(self, index: "PostingIndex") -> Sequence[int] | None:
+        return self._narrow(index.level_candidates)
+
+    def scan_candidates(self, scanner: "ExportScanner") -> Sequence[int] | None:
+        return self._narrow(scanner.level_candidates)
@@ -0,0 +1,148 @@
+import re
+from collections import deque
+from collections.abc import Iterable, Sequence
+
+# Below this many literals, one `in` check per keyword (done in C) beats walking
+# the automaton character by character in Python.
+AUTOMATON_THRESHOLD = 128
+
+
+class AhoCorasick:
+    def __init__(self, terms: Sequence[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[frozenset[int]] = [frozenset()]
+        for term_id, term in enumerate(terms):
+            self._add(term, term_id)
+        self._link()
+
+    def _add(self, term: str, term_id: int) -> None:
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(frozenset())
+            state = next_state
+        self._output[state] = self._output[state] | {term_id}
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = (
+                    self._output[next_state] | self._output[self._fail[next_state]]
+                )
+
+    def contains_any(self, text: str) -> bool:
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return True
+        return False
+
+    def find(self, text: str) -> set[int]:
+        goto, fail, output = self._goto, self._fail, self._output
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class TermMatcher:
+    def __init__(
+        self,
+        keywords: Sequence[str] = (),
+        patterns: Sequence[str] = (),
+        case_sensitive: bool = False,
+        match_all: bool = False,
+    ) -> None:
+        self.case_sensitive = case_sensitive
+        self.match_all = match_all
+        literals = dict.fromkeys(
+            keyword if case_sensitive else keyword.casefold()
+            for keyword in keywords
+            if keyword
+        )
+        self._literals = list(literals)
+        self._automaton = (
+            AhoCorasick(self._literals)
+            if len(self._literals) >= AUTOMATON_THRESHOLD
+            else None
+        )
+        flags = 0 if case_sensitive else re.IGNORECASE
+        unique_patterns = list(dict.fromkeys(patterns))
+        self._patterns = [re.compile(pattern, flags) for pattern in unique_patterns]
+        self._combined = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in unique_patterns), flags)
+            if unique_patterns
+            else None
+        )
+        self._term_count = len(self._literals) + len(self._patterns)
+
+    def __bool__(self) -> bool:
+        return self._term_count > 0
+
+    def _fold(self, text: str) -> str:
+        return text if self.case_sensitive else text.casefold()
+
+    def _any(self, text: str) -> bool:
+        if self._literals:
+            folded = self._fold(text)
+            if self._automaton is not None:
+                if self._automaton.contains_any(folded):
+                    return True
+            elif any(literal in folded for literal in self._literals):
+                return True
+        return self._combined is not None and self._combined.search(text) is not None
+
+    def _collect(self, text: str, missing: set[int]) -> None:
+        literal_count = len(self._literals)
+        if self._literals and any(term_id < literal_count for term_id in missing):
+            folded = self._fold(text)
+            if self._automaton is not None:
+                missing.difference_update(self._automaton.find(folded))
+            else:
+                missing.difference_update(
+                    [
+                        term_id
+                        for term_id in missing
+                        if term_id < literal_count and self._literals[term_id] in folded
+                    ]
+                )
+        for term_id in [term_id for term_id in missing if term_id >= literal_count]:
+            if self._patterns[term_id - literal_count].search(text):
+                missing.discard(term_id)
+
+    def matches(self, message: str, values: Iterable[object] = ()) -> bool:
+        if not self.match_all:
+            if self._any(message):
+                return True
+            return any(self._any(value) for value in values if isinstance(value, str))
+        missing = set(range(self._term_count))
+        self._collect(message, missing)
+        for value in values:
+            if not missing:
+                break
+            if isinstance(value, str):
+                self._collect(value, missing)
+        return not missing
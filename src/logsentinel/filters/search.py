@@ -1,34 +1,79 @@
-from logsentinel.models import LogEntry
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING
+
+from logsentinel.filters.matcher import TermMatcher
+from logsentinel.models import LogBatch, LogEntry
+
+if TYPE_CHECKING:
+    from logsentinel.parsers.scan import ExportScanner
+    from logsentinel.storage.index import PostingIndex
 
 
 class SearchFilter:
-    def __init__(self, keyword: str, case_sensitive: bool = False) -> None:
-        self.keyword = keyword
+    def __init__(
+        self,
+        keyword: str | Sequence[str] = (),
+        case_sensitive: bool = False,
+        *,
+        patterns: Sequence[str] = (),
+        match_all: bool = False,
+    ) -> None:
+        self.keywords = [keyword] if isinstance(keyword, str) else list(keyword)
+        self.patterns = list(patterns)
         self.case_sensitive = case_sensitive
-
-    def _matches_message(self, entry: LogEntry) -> bool:
-        if self.case_sensitive:
-            return self.keyword in entry.message
-        return self.keyword.casefold() in entry.message.casefold()
-
-    def _matches_metadata(self, entry: LogEntry) -> bool:
-        if self.case_sensitive:
-            return any(
-                self.keyword in value
-                for value in entry.metadata.values()
-                if isinstance(value, str)
-            )
-        return any(
-            self.keyword.casefold() in value.casefold()
-            for value in entry.metadata.values()
-            if isinstance(value, str)
+        self.match_all = match_all
+        self._matcher = TermMatcher(
+            self.keywords, self.patterns, case_sensitive, match_all
         )
 
+    def _matches(self, entry: LogEntry) -> bool:
+        return self._matcher.matches(entry.message, entry.metadata.values())
+
+    def stream(self, entries: Iterable[LogEntry]) -> Iterator[LogEntry]:
+        if not self._matcher:
+            return iter(entries)
+        return (entry for entry in entries if self._matches(entry))
+
     def apply(self, entries: list[LogEntry]) -> list[LogEntry]:
-        if not self.keyword:
+        if not self._matcher:
             return entries
-        return [
-            entry
-            for entry in entries
-            if self._matches_message(entry) or self._matches_metadata(entry)
+        return list(self.stream(entries))
+
+    def apply_batch(self, batch: LogBatch) -> LogBatch:
+        if not self._matcher:
+            return batch
+        matches, metadata = self._matcher.matches, batch.metadata
+        selected = []
+        for index, message in enumerate(batch.messages):
+            values = metadata[index].values() if index in metadata else ()
+            if matches(message, values):
+                selected.append(index)
+        return batch.take(selected)
+
+    def _narrow(
+        self, lookup: Callable[[str], Sequence[int] | None]
+    ) -> Sequence[int] | None:
+        if not self._matcher or (self.patterns and not self.match_all):
+            return None
+        found = [
+            lookup(keyword.casefold())
+            for keyword in self.keywords
+            if keyword
         ]
+        narrowing = [candidates for candidates in found if candidates is not None]
+        if self.match_all:
+            if not narrowing:
+                return None
+            result = narrowing[0]
+            for candidates in narrowing[1:]:
+                result = sorted(set(result).intersection(candidates))
+            return result
+        if len(narrowing) < len(found):
+            return None
+        return sorted(set().union(*narrowing))
+
+    def candidates(self, index: "PostingIndex") -> Sequence[int] | None:
+        return self._narrow(index.substring_candidates)
+
+    def scan_candidates(self, scanner: "ExportScanner") -> Sequence[int] | None:
+        return self._narrow(scanner.substring_candidates)
@@ -0,0 +1,53 @@
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from logsentinel.models import LogBatch, LogEntry
+from logsentinel.models.log_batch import to_epoch_ms
+from logsentinel.utils.vector import select_range
+
+if TYPE_CHECKING:
+    from logsentinel.parsers.scan import ExportScanner
+    from logsentinel.storage.index import PostingIndex
+
+
+class TimeRangeFilter:
+    def __init__(self, since: datetime | None = None, until: datetime | None = None):
+        self.since = since
+        self.until = until
+        self._start: int | None = None
+        self._end = None if until is None else to_epoch_ms(until)
+        if since is not None:
+            # Round up so a sub-millisecond bound excludes the same entries as
+            # the datetime comparison does.
+            self._start = to_epoch_ms(since) + (since.microsecond % 1000 > 0)
+
+    def _accepts(self, entry: LogEntry) -> bool:
+        if self.since is not None and entry.timestamp < self.since:
+            return False
+        return self.until is None or entry.timestamp <= self.until
+
+    def stream(self, entries: Iterable[LogEntry]) -> Iterator[LogEntry]:
+        return (entry for entry in entries if self._accepts(entry))
+
+    def apply(self, entries: list[LogEntry]) -> list[LogEntry]:
+        return list(self.stream(entries))
+
+    def apply_batch(self, batch: LogBatch) -> LogBatch:
+        if self._start is None and self._end is None:
+            return batch
+        selected = select_range(
+            batch.timestamps, self._start, self._end, batch.timestamps_sorted
+        )
+        if len(selected) == len(batch):
+            return batch
+        return batch.take(selected)
+
+    def candidates(self, index: "PostingIndex") -> Sequence[int] | None:
+        if self._start is None and self._end is None:
+            return None
+        return index.time_candidates(self._start, self._end)
+
+    def scan_candidates(self, scanner: "ExportScanner") -> Sequence[int] | None:
+        # Timestamps sit in every event, so scanning for them narrows nothing.
+        return None
@@ -1,3 +1,29 @@
+from logsentinel.formatters.execution import ExecutionFormatter as ExecutionFormatter
+from logsentinel.formatters.pager import Pager as Pager
+from logsentinel.formatters.pager import terminal_keys as terminal_keys
+from logsentinel.formatters.profile import ProfileFormatter as ProfileFormatter
+from logsentinel.formatters.stats import StatsFormatter as StatsFormatter
 from logsentinel.formatters.table import TableFormatter as TableFormatter
+from logsentinel.formatters.template import TemplateFormatter as TemplateFormatter
+from logsentinel.formatters.writers import WRITERS as WRITERS
+from logsentinel.formatters.writers import BatchWriter as BatchWriter
+from logsentinel.formatters.writers import ColumnarWriter as ColumnarWriter
+from logsentinel.formatters.writers import CsvWriter as CsvWriter
+from logsentinel.formatters.writers import NdjsonWriter as NdjsonWriter
+from logsentinel.formatters.writers import read_columnar as read_columnar
 
-__all__ = ["TableFormatter"]
+__all__ = [
+    "WRITERS",
+    "BatchWriter",
+    "ColumnarWriter",
+    "CsvWriter",
+    "ExecutionFormatter",
+    "NdjsonWriter",
+    "Pager",
+    "ProfileFormatter",
+    "StatsFormatter",
+    "TableFormatter",
+    "TemplateFormatter",
+    "read_columnar",
+    "terminal_keys",
+]
@@ -0,0 +1,34 @@
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from itertools import islice
+from typing import TypeVar
+
+from rich.table import Table
+
+CHUNK_SIZE = 50
+
+Row = TypeVar("Row")
+
+
+def chunked(rows: Iterable[Row], chunk_size: int = CHUNK_SIZE) -> Iterator[list[Row]]:
+    iterator = iter(rows)
+    return iter(lambda: list(islice(iterator, chunk_size)), [])
+
+
+def stream_tables(
+    chunks: Iterable[Sequence[Row]],
+    widths: Callable[[Sequence[Row]], list[int]],
+    chunk_table: Callable[[Sequence[Row], list[int], bool], Table],
+) -> Iterator[Table]:
+    # Column widths are fixed from the first chunk so later chunks line up
+    # without Rich having to measure every row. Only the first table has a
+    # header, and no rows at all still give one.
+    fixed: list[int] | None = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        show_header = fixed is None
+        if fixed is None:
+            fixed = widths(chunk)
+        yield chunk_table(chunk, fixed, show_header)
+    if fixed is None:
+        yield chunk_table([], widths([]), True)
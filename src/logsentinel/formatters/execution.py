@@ -0,0 +1,66 @@
+from collections.abc import Iterable, Iterator, Sequence
+
+from rich import box
+from rich.table import Table
+
+from logsentinel.formatters.chunks import CHUNK_SIZE, chunked, stream_tables
+from logsentinel.formatters.table import SOURCE_WIDTH
+from logsentinel.models import Execution
+
+HEADERS = ("Execution", "Source", "Start", "Duration", "Entries", "Errors")
+KEY_WIDTH = 40
+FIXED_FROM = 2
+NUMERIC_FROM = 3
+
+
+class ExecutionFormatter:
+    def _row(self, execution: Execution) -> tuple[str, str, str, str, str, str]:
+        return (
+            execution.key,
+            execution.source,
+            execution.start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "{:.3f}s".format(execution.duration.total_seconds()),
+            str(execution.entry_count),
+            str(execution.error_count),
+        )
+
+    def stream(
+        self, executions: Iterable[Execution], chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[Table]:
+        chunks = chunked(executions, chunk_size)
+        return stream_tables(chunks, self.widths, self.chunk_table)
+
+    def widths(self, chunk: Sequence[Execution]) -> list[int]:
+        widths = [len(header) for header in HEADERS]
+        for execution in chunk:
+            cells = self._row(execution)
+            widths = [max(width, len(cell)) for width, cell in zip(widths, cells)]
+        widths[0] = min(widths[0], KEY_WIDTH)
+        widths[1] = min(widths[1], SOURCE_WIDTH)
+        return widths
+
+    def chunk_table(
+        self, chunk: Sequence[Execution], widths: list[int], show_header: bool
+    ) -> Table:
+        table = Table(
+            show_header=show_header,
+            header_style="bold",
+            box=box.SIMPLE_HEAD,
+            show_edge=False,
+        )
+        # Timestamps and numbers keep their width; ids and sources give way
+        # on narrow terminals.
+        for header, width in zip(HEADERS[:FIXED_FROM], widths):
+            table.add_column(header, ratio=1, max_width=width, overflow="fold")
+        for position, (header, width) in enumerate(zip(HEADERS, widths)):
+            if position >= FIXED_FROM:
+                table.add_column(
+                    header,
+                    width=width,
+                    no_wrap=True,
+                    justify="right" if position >= NUMERIC_FROM else "left",
+                )
+        for execution in chunk:
+            style = "red" if execution.failed() else "green"
+            table.add_row(*self._row(execution), style=style)
+        return table
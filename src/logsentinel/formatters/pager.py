@@ -0,0 +1,152 @@
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+from rich.console import Console, Group
+from rich.text import Text
+
+from logsentinel.formatters.table import TableFormatter
+from logsentinel.models import LogBatch, LogEntry
+
+# Header row plus the rule under it, and the status line.
+CHROME_LINES = 3
+WIDTH_SAMPLE = 200
+MAX_ROWS = 10_000
+
+KEYS = {
+    "j": "down",
+    "\x1b[B": "down",
+    "\r": "down",
+    "k": "up",
+    "\x1b[A": "up",
+    " ": "page_down",
+    "f": "page_down",
+    "\x1b[6~": "page_down",
+    "b": "page_up",
+    "\x1b[5~": "page_up",
+    "g": "home",
+    "\x1b[H": "home",
+    "G": "end",
+    "\x1b[F": "end",
+    "q": "quit",
+    "\x1b": "quit",
+}
+
+
+@contextmanager
+def terminal_keys() -> Iterator[Callable[[], str]]:
+    # POSIX only; imported here so the formatters still load elsewhere.
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+
+    def read_key() -> str:
+        # One read returns a whole escape sequence such as "\x1b[B".
+        return os.read(fd, 8).decode("utf-8", "replace")
+
+    try:
+        tty.setcbreak(fd)
+        yield read_key
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+class Pager:
+    def __init__(
+        self,
+        entries: Iterable[LogEntry],
+        console: Console,
+        formatter: TableFormatter | None = None,
+        max_rows: int = MAX_ROWS,
+    ) -> None:
+        self.console = console
+        self.formatter = formatter or TableFormatter()
+        self.top = 0
+        self.max_rows = max_rows
+        # Rows are pulled from the source only as far as the user scrolls, and
+        # kept columnar so scrolling back does not re-run the query. Only the
+        # last max_rows are kept; _first is the position of the oldest one.
+        self._rows = LogBatch()
+        self._first = 0
+        self._source = iter(entries)
+        self._exhausted = False
+        self._widths: list[int] | None = None
+
+    @property
+    def page_size(self) -> int:
+        return max(1, self.console.size.height - CHROME_LINES)
+
+    @property
+    def loaded(self) -> int:
+        return self._first + len(self._rows)
+
+    def _load(self, count: int) -> None:
+        while not self._exhausted and self.loaded < count:
+            entry = next(self._source, None)
+            if entry is None:
+                self._exhausted = True
+                break
+            self._rows.append_entry(entry)
+            # Trimming only once the buffer has doubled keeps the copy cheap
+            # per row; rows dropped here cannot be scrolled back to.
+            if len(self._rows) >= 2 * self.max_rows:
+                drop = len(self._rows) - self.max_rows
+                self._rows = self._rows.take(range(drop, len(self._rows)))
+                self._first += drop
+
+    def _last_top(self) -> int:
+        return max(self._first, self.loaded - self.page_size)
+
+    def scroll(self, delta: int) -> None:
+        self._load(self.top + delta + self.page_size)
+        self.top = max(self._first, min(self.top + delta, self._last_top()))
+
+    def handle(self, action: str) -> bool:
+        if action == "quit":
+            return False
+        if action == "down":
+            self.scroll(1)
+        elif action == "up":
+            self.scroll(-1)
+        elif action == "page_down":
+            self.scroll(self.page_size)
+        elif action == "page_up":
+            self.scroll(-self.page_size)
+        elif action == "home":
+            self.top = self._first
+        elif action == "end":
+            self._load(sys.maxsize)
+            self.top = self._last_top()
+        return True
+
+    def window(self) -> list[LogEntry]:
+        self._load(self.top + self.page_size)
+        start = self.top - self._first
+        end = min(start + self.page_size, len(self._rows))
+        return [self._rows[index] for index in range(start, end)]
+
+    def render(self) -> Group:
+        if self._widths is None:
+            self._load(WIDTH_SAMPLE)
+            sample = [self._rows[index] for index in range(len(self._rows))]
+            self._widths = self.formatter.widths(sample)
+        rows = self.window()
+        table = self.formatter.chunk_table(rows, self._widths, True, wrap=False)
+        total = str(self.loaded) if self._exhausted else f"{self.loaded}+"
+        last = self.top + len(rows)
+        status = Text(
+            f" {self.top + 1 if rows else 0}-{last} of {total}"
+            "  j/k line  space/b page  g/G ends  q quit",
+            style="reverse",
+        )
+        return Group(table, status)
+
+    def run(self, read_key: Callable[[], str]) -> None:
+        with self.console.screen(hide_cursor=True) as screen:
+            while True:
+                screen.update(self.render())
+                if not self.handle(KEYS.get(read_key(), "")):
+                    return
@@ -0,0 +1,36 @@
+from collections.abc import Iterable
+
+from rich import box
+from rich.table import Table
+
+from logsentinel.utils.profiling import StageStats
+
+HEADERS = ("Stage", "Wall", "Entries", "Entries/s", "MB", "MB/s", "Peak RSS")
+
+
+def _megabytes(value: float) -> str:
+    return "{:.1f}".format(value / 1e6) if value else "-"
+
+
+class ProfileFormatter:
+    def format(self, stages: Iterable[StageStats]) -> Table:
+        table = Table(
+            show_header=True,
+            header_style="bold",
+            box=box.SIMPLE_HEAD,
+            show_edge=False,
+        )
+        table.add_column(HEADERS[0])
+        for header in HEADERS[1:]:
+            table.add_column(header, justify="right", no_wrap=True)
+        for stage in stages:
+            table.add_row(
+                stage.name,
+                "{:.3f}s".format(stage.seconds),
+                str(stage.entries),
+                "{:,.0f}".format(stage.entries_per_second),
+                _megabytes(stage.bytes),
+                _megabytes(stage.bytes_per_second),
+                "{:.0f} MiB".format(stage.peak_rss / 2**20),
+            )
+        return table
@@ -0,0 +1,98 @@
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from rich import box
+from rich.table import Table
+
+from logsentinel.models import LogLevel
+from logsentinel.models.log_batch import from_epoch_ms
+
+if TYPE_CHECKING:
+    from logsentinel.analysis import LogStats
+
+SOURCE_HEADERS = ("Entries", "Errors", "Error %", "First error", "Last error")
+DURATION_HEADERS = ("Invocations", "p50 ms", "p90 ms", "p99 ms", "Max ms")
+QUANTILES = (0.5, 0.9, 0.99)
+# Day and time only: the buckets of one run rarely span a year.
+TIME_FORMAT = "%m-%d %H:%M:%S"
+
+
+def _time(timestamp: int | None) -> str:
+    return "-" if timestamp is None else from_epoch_ms(timestamp).strftime(TIME_FORMAT)
+
+
+def _table(first: str, numbers: tuple[str, ...], title: str | None = None) -> Table:
+    table = Table(
+        title=title,
+        title_justify="left",
+        title_style="bold",
+        show_header=True,
+        header_style="bold",
+        box=box.SIMPLE_HEAD,
+        show_edge=False,
+        collapse_padding=True,
+    )
+    # Numbers keep their width; the first column folds on narrow terminals.
+    table.add_column(first, ratio=1, overflow="fold")
+    for header in numbers:
+        table.add_column(header, justify="right", no_wrap=True, min_width=len(header))
+    return table
+
+
+def _percent(part: int, total: int) -> str:
+    return "{:.1%}".format(part / total if total else 0)
+
+
+class StatsFormatter:
+    def sources(self, stats: "LogStats") -> Table:
+        table = _table("Source", SOURCE_HEADERS)
+        # Failing sources first, and among them the one failing the longest.
+        ordered = sorted(
+            stats.sources.items(),
+            key=lambda item: (-item[1].error_rate, item[1].first_error or 0, item[0]),
+        )
+        for name, source in ordered:
+            table.add_row(
+                name,
+                str(source.entries),
+                str(source.errors),
+                _percent(source.errors, source.entries),
+                _time(source.first_error),
+                _time(source.last_error),
+                style="red" if source.errors else None,
+            )
+        return table
+
+    def durations(self, stats: "LogStats") -> Table:
+        table = _table("Source", DURATION_HEADERS)
+        for name, source in sorted(stats.sources.items()):
+            durations = source.durations
+            if len(durations):
+                table.add_row(
+                    name,
+                    str(len(durations)),
+                    *(
+                        "{:.1f}".format(durations.quantile(quantile))
+                        for quantile in (*QUANTILES, 1.0)
+                    ),
+                )
+        return table
+
+    def buckets(self, stats: "LogStats") -> Iterator[Table]:
+        # One table per source keeps the level columns readable at 80 columns.
+        levels = list(LogLevel)
+        headers = (*(level.name for level in levels), "Error %")
+        tables: dict[str, Table] = {}
+        for bucket, name, counts in stats.buckets():
+            table = tables.get(name)
+            if table is None:
+                table = tables[name] = _table("Bucket", headers, title=name)
+            errors = counts.get(LogLevel.ERROR, 0) + counts.get(LogLevel.CRITICAL, 0)
+            table.add_row(
+                _time(bucket),
+                *(str(counts.get(level, 0)) for level in levels),
+                _percent(errors, sum(counts.values())),
+                style="red" if errors else None,
+            )
+        for _, table in sorted(tables.items()):
+            yield table
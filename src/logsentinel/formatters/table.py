@@ -1,5 +1,9 @@
+from collections.abc import Iterable, Iterator, Sequence
+
+from rich import box
 from rich.table import Table
 
+from logsentinel.formatters.chunks import CHUNK_SIZE, chunked, stream_tables
 from logsentinel.models import LogEntry, LogLevel
 
 STYLES = {
@@ -10,26 +14,68 @@ STYLES = {
     LogLevel.DEBUG: "blue",
 }
 
+HEADERS = ("Timestamp", "Level", "Source", "Message")
+MESSAGE_WIDTH = 80
+SOURCE_WIDTH = 32
+
 class TableFormatter:
     def _level_style(self, level: LogLevel) -> str:
         return STYLES.get(level, "dim")
+
+    def _row(self, entry: LogEntry) -> tuple[str, str, str, str]:
+        formated_timestamp = entry.timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+        formatted_message = entry.message
+        if len(formatted_message) > MESSAGE_WIDTH:
+            formatted_message = formatted_message[:MESSAGE_WIDTH - 1] + "…"
+        return formated_timestamp, entry.level.name, entry.source, formatted_message
+
     def format(self, entries: list[LogEntry]) -> Table:
         table = Table(show_header=True, header_style="bold")
-        table.add_column("Timestamp")
-        table.add_column("Level")
-        table.add_column("Source")
-        table.add_column("Message")
+        for header in HEADERS:
+            table.add_column(header)
         for entry in entries:
-            formated_timestamp = entry.timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
-            formatted_message = entry.message
-            if len(formatted_message) > 80:
-                formatted_message = formatted_message[:79] + "…"
-            row_style = self._level_style(entry.level)
-            table.add_row(
-                formated_timestamp,
-                entry.level.name,
-                entry.source,
-                formatted_message,
-                style=row_style
-            )
-        return table
\ No newline at end of file
+            table.add_row(*self._row(entry), style=self._level_style(entry.level))
+        return table
+
+    def stream(
+        self, entries: Iterable[LogEntry], chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[Table]:
+        return self.stream_chunks(chunked(entries, chunk_size))
+
+    def widths(self, chunk: Sequence[LogEntry]) -> list[int]:
+        widths = [len(header) for header in HEADERS[:-1]]
+        widths[1] = max(len(level.name) for level in LogLevel)
+        for entry in chunk:
+            cells = self._row(entry)
+            widths = [max(width, len(cell)) for width, cell in zip(widths, cells)]
+        # Long log group names are cut with an ellipsis rather than squeezing
+        # the message column out.
+        widths[-1] = min(widths[-1], SOURCE_WIDTH)
+        return widths
+
+    def chunk_table(
+        self,
+        chunk: Sequence[LogEntry],
+        widths: list[int],
+        show_header: bool,
+        wrap: bool = True,
+    ) -> Table:
+        table = Table(
+            show_header=show_header,
+            header_style="bold",
+            box=box.SIMPLE_HEAD,
+            show_edge=False,
+        )
+        for header, width in zip(HEADERS, widths):
+            table.add_column(header, width=width, no_wrap=True, overflow="ellipsis")
+        # Without wrapping every row is one line, which the pager relies on.
+        table.add_column(
+            HEADERS[-1], ratio=1, max_width=MESSAGE_WIDTH, no_wrap=not wrap
+        )
+        for entry in chunk:
+            table.add_row(*self._row(entry), style=self._level_style(entry.level))
+        return table
+
+    def stream_chunks(self, chunks: Iterable[Sequence[LogEntry]]) -> Iterator[Table]:
+        # The message column takes whatever width the fixed ones leave.
+        return stream_tables(chunks, self.widths, self.chunk_table)
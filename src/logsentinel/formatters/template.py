@@ -0,0 +1,33 @@
+from collections.abc import Iterable
+
+from rich import box
+from rich.table import Table
+
+from logsentinel.models import LogPattern
+
+HEADERS = ("ID", "Count", "Share", "Template", "Example")
+
+
+class TemplateFormatter:
+    def format(self, patterns: Iterable[LogPattern], total: int) -> Table:
+        table = Table(
+            show_header=True,
+            header_style="bold",
+            box=box.SIMPLE_HEAD,
+            show_edge=False,
+        )
+        for header in HEADERS[:3]:
+            table.add_column(header, justify="right", no_wrap=True)
+        # The template is what the reader came for; the example gives way first.
+        table.add_column(HEADERS[3], ratio=3, overflow="fold")
+        table.add_column(HEADERS[4], ratio=2, overflow="ellipsis", no_wrap=True)
+        for pattern in patterns:
+            share = pattern.count / total if total else 0.0
+            table.add_row(
+                str(pattern.id),
+                str(pattern.count),
+                "{:.1%}".format(share),
+                pattern.template,
+                pattern.example,
+            )
+        return table
@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO
+
+from logsentinel.models import LogBatch, LogEntry
+from logsentinel.models.log_batch import LEVELS_BY_VALUE, from_epoch_ms, iter_batches
+from logsentinel.storage.codec import (
+    decode_batch,
+    encode_batch,
+    read_frame,
+    write_frame,
+)
+
+BATCH_SIZE = 4096
+# One schema for the text outputs, named after CloudWatch's event fields so
+# NdjsonParser reads them back. raw is only set where it differs from message.
+# NDJSON leaves out empty fields and writes epoch milliseconds; CSV has every
+# column, ISO 8601 timestamps and metadata as a JSON object.
+FIELDS = (
+    "timestamp",
+    "level",
+    "logGroupName",
+    "message",
+    "raw",
+    "requestId",
+    "correlationId",
+    "metadata",
+)
+COLUMNAR_MAGIC = b"LSCOL1\n"
+
+_LEVEL_NAMES = {value: level.name for value, level in LEVELS_BY_VALUE.items()}
+_quote = json.encoder.encode_basestring
+
+
+def _iso_timestamps(timestamps: Iterable[int]) -> list[str]:
+    # Neighbouring entries share a second, so only the millisecond part is
+    # formatted per entry.
+    seconds: dict[int, str] = {}
+    formatted = []
+    for timestamp in timestamps:
+        second, millisecond = divmod(timestamp, 1000)
+        prefix = seconds.get(second)
+        if prefix is None:
+            prefix = from_epoch_ms(second * 1000).strftime("%Y-%m-%dT%H:%M:%S")
+            seconds[second] = prefix
+        formatted.append(f"{prefix}.{millisecond:03d}Z")
+    return formatted
+
+
+class BatchWriter(ABC):
+    def __init__(self, stream: BinaryIO, batch_size: int = BATCH_SIZE) -> None:
+        self.stream = stream
+        self.batch_size = batch_size
+
+    def _start(self) -> None:
+        pass
+
+    @abstractmethod
+    def _encode(self, batch: LogBatch) -> bytes:...
+
+    def write(self, entries: Iterable[LogEntry]) -> int:
+        return self.write_batches(iter_batches(entries, self.batch_size))
+
+    def write_batches(self, batches: Iterable[LogBatch]) -> int:
+        # Each batch is encoded into one buffer and written with a single call,
+        # so the stream is hit once per few thousand entries.
+        self._start()
+        count = 0
+        for batch in batches:
+            if len(batch):
+                self.stream.write(self._encode(batch))
+                count += len(batch)
+        self.stream.flush()
+        return count
+
+
+class NdjsonWriter(BatchWriter):
+    def _encode(self, batch: LogBatch) -> bytes:
+        # Every field is a known string or integer, so lines are assembled from
+        # C-escaped strings instead of running the JSON encoder per event.
+        sources = [_quote(source) for source in batch.sources]
+        source_ids = batch.source_ids
+        levels = batch.levels
+        timestamps = batch.timestamps
+        raws = batch.raws
+        lines = []
+        for index, message in enumerate(map(_quote, batch.messages)):
+            line = (
+                f'{{"timestamp":{timestamps[index]},'
+                f'"level":"{_LEVEL_NAMES[levels[index]]}",'
+                f'"logGroupName":{sources[source_ids[index]]},"message":{message}'
+            )
+            raw = raws.get(index)
+            if raw is not None:
+                line += ',"raw":' + _quote(raw)
+            request_id = batch.request_ids[index]
+            if request_id is not None:
+                line += ',"requestId":' + _quote(request_id)
+            correlation_id = batch.correlation_ids.get(index)
+            if correlation_id is not None:
+                line += ',"correlationId":' + _quote(correlation_id)
+            metadata = batch.metadata.get(index)
+            if metadata:
+                line += ',"metadata":' + json.dumps(metadata, ensure_ascii=False)
+            lines.append(line + "}\n")
+        return "".join(lines).encode("utf-8", "surrogatepass")
+
+
+class CsvWriter(BatchWriter):
+    def _start(self) -> None:
+        self.stream.write(",".join(FIELDS).encode() + b"\r\n")
+
+    def _encode(self, batch: LogBatch) -> bytes:
+        buffer = io.StringIO()
+        sources = batch.sources
+        levels = [_LEVEL_NAMES[level] for level in batch.levels]
+        timestamps = _iso_timestamps(batch.timestamps)
+        indices = range(len(batch))
+        metadata: list[str | None] = [None] * len(batch)
+        for index, values in batch.metadata.items():
+            metadata[index] = json.dumps(values, ensure_ascii=False)
+        csv.writer(buffer).writerows(
+            zip(
+                timestamps,
+                levels,
+                [sources[source_id] for source_id in batch.source_ids],
+                batch.messages,
+                map(batch.raws.get, indices),
+                batch.request_ids,
+                map(batch.correlation_ids.get, indices),
+                metadata,
+            )
+        )
+        return buffer.getvalue().encode("utf-8", "surrogatepass")
+
+
+class ColumnarWriter(BatchWriter):
+    # A magic line followed by the cache's length-prefixed LogBatch frames:
+    # packed timestamp/level/source-id columns and one UTF-8 blob plus offsets
+    # per string column, readable without any text parsing.
+    def _start(self) -> None:
+        self.stream.write(COLUMNAR_MAGIC)
+
+    def _encode(self, batch: LogBatch) -> bytes:
+        buffer = io.BytesIO()
+        write_frame(buffer, encode_batch(batch))
+        return buffer.getvalue()
+
+
+def read_columnar(stream: BinaryIO) -> Iterator[LogBatch]:
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a logsentinel columnar export")
+    while (frame := read_frame(stream)) is not None:
+        yield decode_batch(memoryview(frame))
+
+
+WRITERS: dict[str, type[BatchWriter]] = {
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+    "columnar": ColumnarWriter,
+}
@@ -1,4 +1,7 @@
+from .execution import Execution as Execution
+from .log_batch import LogBatch as LogBatch
 from .log_entry import LogEntry as LogEntry
 from .log_entry import LogLevel as LogLevel
+from .log_pattern import LogPattern as LogPattern
 
-__all__ = ["LogEntry", "LogLevel"]
+__all__ = ["Execution", "LogBatch", "LogEntry", "LogLevel", "LogPattern"]
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+
+@dataclass(frozen=True, slots=True)
+class Execution:
+    key: str
+    source: str
+    start: datetime
+    end: datetime
+    entry_count: int
+    error_count: int
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end - self.start
+
+    def failed(self) -> bool:
+        return self.error_count > 0
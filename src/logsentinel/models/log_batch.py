@@ -0,0 +1,227 @@
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import UTC, datetime
+from functools import lru_cache
+from operator import itemgetter
+from typing import TypeVar
+
+from .log_entry import LogEntry, LogLevel
+
+T = TypeVar("T")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+LEVELS_BY_VALUE = {level.value: level for level in LogLevel}
+
+
+def to_epoch_ms(timestamp: datetime) -> int:
+    delta = timestamp - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+
+# Neighbouring events often share a millisecond; datetimes are immutable, so one
+# object per millisecond can be handed out repeatedly.
+@lru_cache(maxsize=4096)
+def from_epoch_ms(timestamp_ms: int) -> datetime:
+    return datetime.fromtimestamp(timestamp_ms / 1000, UTC)
+
+
+def _gather(values: Sequence[T], selected: list[int]) -> list[T]:
+    if len(selected) < 2:
+        return [values[index] for index in selected]
+    return list(itemgetter(*selected)(values))
+
+
+def _slice_sparse(column: dict[int, T], start: int, stop: int) -> dict[int, T]:
+    return {
+        index - start: value
+        for index, value in column.items()
+        if start <= index < stop
+    }
+
+
+def _take_sparse(column: dict[int, T], selected: list[int]) -> dict[int, T]:
+    if not column:
+        return {}
+    return {
+        position: column[index]
+        for position, index in enumerate(selected)
+        if index in column
+    }
+
+
+class LogBatch:
+    __slots__ = (
+        "timestamps",
+        "levels",
+        "messages",
+        "raws",
+        "sources",
+        "source_ids",
+        "request_ids",
+        "correlation_ids",
+        "metadata",
+        "timestamps_sorted",
+        "_source_index",
+    )
+
+    def __init__(self) -> None:
+        self.timestamps = array("q")
+        self.levels = bytearray()
+        self.messages: list[str] = []
+        # Sparse columns: only entries whose raw differs from the message, or
+        # that carry a correlation id / metadata, get a slot.
+        self.raws: dict[int, str] = {}
+        self.sources: list[str] = []
+        self.source_ids = array("I")
+        self.request_ids: list[str | None] = []
+        self.correlation_ids: dict[int, str] = {}
+        self.metadata: dict[int, dict[str, str]] = {}
+        # Kept up to date as rows arrive, so time filters can bisect without
+        # scanning the timestamps first.
+        self.timestamps_sorted = True
+        self._source_index: dict[str, int] = {}
+
+    def _source_id(self, source: str) -> int:
+        source_id = self._source_index.get(source)
+        if source_id is None:
+            source_id = len(self.sources)
+            self.sources.append(source)
+            self._source_index[source] = source_id
+        return source_id
+
+    def append(
+        self,
+        timestamp_ms: int,
+        level: LogLevel,
+        message: str,
+        source: str,
+        raw: str | None = None,
+        request_id: str | None = None,
+        correlation_id: str | None = None,
+        metadata: dict[str, str] | None = None,
+    ) -> None:
+        index = len(self.messages)
+        timestamps = self.timestamps
+        if self.timestamps_sorted and timestamps and timestamp_ms < timestamps[-1]:
+            self.timestamps_sorted = False
+        timestamps.append(timestamp_ms)
+        self.levels.append(level)
+        self.messages.append(message)
+        self.source_ids.append(self._source_id(source))
+        self.request_ids.append(request_id)
+        if raw is not None and raw != message:
+            self.raws[index] = raw
+        if correlation_id is not None:
+            self.correlation_ids[index] = correlation_id
+        if metadata:
+            self.metadata[index] = metadata
+
+    def append_entry(self, entry: LogEntry) -> None:
+        self.append(
+            to_epoch_ms(entry.timestamp),
+            entry.level,
+            entry.message,
+            entry.source,
+            raw=entry.raw,
+            request_id=entry.request_id,
+            correlation_id=entry.correlation_id,
+            metadata=entry.metadata,
+        )
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[LogEntry]) -> "LogBatch":
+        batch = cls()
+        for entry in entries:
+            batch.append_entry(entry)
+        return batch
+
+    def extend(self, other: "LogBatch") -> None:
+        offset = len(self.messages)
+        source_ids = [self._source_id(source) for source in other.sources]
+        if self.timestamps and other.timestamps:
+            follows = self.timestamps[-1] <= other.timestamps[0]
+            self.timestamps_sorted = self.timestamps_sorted and follows
+        self.timestamps_sorted = self.timestamps_sorted and other.timestamps_sorted
+        self.timestamps.extend(other.timestamps)
+        self.levels.extend(other.levels)
+        self.messages.extend(other.messages)
+        self.source_ids.extend(source_ids[source_id] for source_id in other.source_ids)
+        self.request_ids.extend(other.request_ids)
+        self.raws.update((offset + index, raw) for index, raw in other.raws.items())
+        self.correlation_ids.update(
+            (offset + index, value) for index, value in other.correlation_ids.items()
+        )
+        self.metadata.update(
+            (offset + index, value) for index, value in other.metadata.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __getitem__(self, index: int) -> LogEntry:
+        if index < 0:
+            index += len(self.messages)
+        message = self.messages[index]
+        return LogEntry(
+            timestamp=from_epoch_ms(self.timestamps[index]),
+            level=LEVELS_BY_VALUE[self.levels[index]],
+            message=message,
+            source=self.sources[self.source_ids[index]],
+            raw=self.raws.get(index, message),
+            correlation_id=self.correlation_ids.get(index),
+            request_id=self.request_ids[index],
+            metadata=dict(self.metadata.get(index, {})),
+        )
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return (self[index] for index in range(len(self.messages)))
+
+    def _share_sources(self) -> "LogBatch":
+        batch = LogBatch()
+        # The source table is append-only, so derived batches can share it.
+        batch.sources = self.sources
+        batch._source_index = self._source_index
+        return batch
+
+    def _take_range(self, start: int, stop: int) -> "LogBatch":
+        batch = self._share_sources()
+        batch.timestamps = self.timestamps[start:stop]
+        batch.timestamps_sorted = self.timestamps_sorted
+        batch.levels = self.levels[start:stop]
+        batch.messages = self.messages[start:stop]
+        batch.source_ids = self.source_ids[start:stop]
+        batch.request_ids = self.request_ids[start:stop]
+        batch.raws = _slice_sparse(self.raws, start, stop)
+        batch.correlation_ids = _slice_sparse(self.correlation_ids, start, stop)
+        batch.metadata = _slice_sparse(self.metadata, start, stop)
+        return batch
+
+    def take(self, indices: Iterable[int]) -> "LogBatch":
+        if isinstance(indices, range) and indices.step == 1:
+            return self._take_range(indices.start, indices.stop)
+        selected = indices if isinstance(indices, list) else list(indices)
+        batch = self._share_sources()
+        batch.timestamps = array("q", _gather(self.timestamps, selected))
+        # Callers pass ascending indices, which keep a sorted batch sorted; one
+        # taking rows in another order sets the flag itself.
+        batch.timestamps_sorted = self.timestamps_sorted
+        batch.levels = bytearray(_gather(self.levels, selected))
+        batch.messages = _gather(self.messages, selected)
+        batch.source_ids = array("I", _gather(self.source_ids, selected))
+        batch.request_ids = _gather(self.request_ids, selected)
+        batch.raws = _take_sparse(self.raws, selected)
+        batch.correlation_ids = _take_sparse(self.correlation_ids, selected)
+        batch.metadata = _take_sparse(self.metadata, selected)
+        return batch
+
+
+def iter_batches(entries: Iterable[LogEntry], batch_size: int) -> Iterator[LogBatch]:
+    batch = LogBatch()
+    for entry in entries:
+        batch.append_entry(entry)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = LogBatch()
+    if len(batch):
+        yield batch
@@ -11,7 +11,7 @@ class LogLevel(IntEnum):
     CRITICAL = 50
     UNKNOWN = 60
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LogEntry:
     timestamp: datetime
     level: LogLevel
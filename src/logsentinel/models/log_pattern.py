@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class LogPattern:
+    id: int
+    template: str
+    count: int
+    example: str
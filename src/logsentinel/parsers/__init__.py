@@ -1,4 +1,47 @@
+from logsentinel.parsers.base import EventParser as EventParser
 from logsentinel.parsers.base import Parser as Parser
+from logsentinel.parsers.base import StreamParser as StreamParser
 from logsentinel.parsers.cloudwatch import CloudWatchParser as CloudWatchParser
+from logsentinel.parsers.compression import decompress as decompress
+from logsentinel.parsers.compression import open_input as open_input
+from logsentinel.parsers.lambda_text import LambdaTextParser as LambdaTextParser
+from logsentinel.parsers.ndjson import NdjsonParser as NdjsonParser
+from logsentinel.parsers.parallel import ParallelParser as ParallelParser
+from logsentinel.parsers.parallel import expand_path as expand_path
+from logsentinel.parsers.parallel import iter_parsed as iter_parsed
+from logsentinel.parsers.parallel import stream_batches as stream_batches
+from logsentinel.parsers.registry import AUTO as AUTO
+from logsentinel.parsers.registry import detect as detect
+from logsentinel.parsers.registry import detect_paths as detect_paths
+from logsentinel.parsers.registry import detect_stream as detect_stream
+from logsentinel.parsers.registry import get_parser as get_parser
+from logsentinel.parsers.registry import parser_types as parser_types
+from logsentinel.parsers.registry import sniff_stream as sniff_stream
+from logsentinel.parsers.step_functions import (
+    StepFunctionsParser as StepFunctionsParser,
+)
+from logsentinel.parsers.subscription import SubscriptionParser as SubscriptionParser
 
-__all__ = ["Parser", "CloudWatchParser"]
+__all__ = [
+    "AUTO",
+    "EventParser",
+    "Parser",
+    "StreamParser",
+    "CloudWatchParser",
+    "LambdaTextParser",
+    "NdjsonParser",
+    "ParallelParser",
+    "StepFunctionsParser",
+    "SubscriptionParser",
+    "decompress",
+    "detect",
+    "detect_paths",
+    "detect_stream",
+    "expand_path",
+    "get_parser",
+    "iter_parsed",
+    "open_input",
+    "parser_types",
+    "sniff_stream",
+    "stream_batches",
+]
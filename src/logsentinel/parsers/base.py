@@ -1,9 +1,95 @@
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from itertools import chain
 from pathlib import Path
-from typing import Protocol
+from typing import Any, BinaryIO, Protocol, runtime_checkable
 
-from logsentinel.models import LogEntry
+from logsentinel.models import LogBatch, LogEntry, LogLevel
+from logsentinel.models.log_batch import from_epoch_ms
+from logsentinel.parsers.json_stream import CHUNK_SIZE
+
+BATCH_SIZE = 4096
+
+LEVELS_BY_NAME = {level.name: level for level in LogLevel}
+
+_LEVEL = re.compile(r"\[(\w+)\]")
+_REQUEST_ID = re.compile(r"RequestId:\s+(\S+)")
 
 
 class Parser(Protocol):
+    def iter_file(self, path:Path) -> Iterator[LogEntry]:...
+    def iter_batches(self, path:Path, batch_size:int = ...) -> Iterator[LogBatch]:...
     def parse_file(self, path:Path) -> list[LogEntry]:...
-    def parse_string(self, content:str) -> list[LogEntry]:...
\ No newline at end of file
+    def parse_string(self, content:str) -> list[LogEntry]:...
+
+
+@runtime_checkable
+class StreamParser(Protocol):
+    def iter_stream(
+        self, stream: BinaryIO, source: str = ..., batch_size: int = ...
+    ) -> Iterator[LogBatch]:...
+
+
+class EventParser(ABC):
+    # What the built-in formats share: level and request id extraction from the
+    # message text, and the file entry points around _iter_batches. Only the
+    # formats that can be indexed or byte-scanned add those methods.
+    def __init__(self, chunk_size: int = CHUNK_SIZE) -> None:
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _extract_fields(message: str) -> tuple[LogLevel, str | None]:
+        # The startswith/in checks run in C and keep most events out of the regex
+        # engine entirely.
+        level = LogLevel.UNKNOWN
+        if message.startswith("["):
+            level_match = _LEVEL.match(message)
+            if level_match is not None:
+                level = LEVELS_BY_NAME.get(level_match.group(1), LogLevel.UNKNOWN)
+        request_id = None
+        if "RequestId:" in message:
+            request_match = _REQUEST_ID.search(message)
+            if request_match is not None:
+                request_id = request_match.group(1)
+        return level, request_id
+
+    def _parse_event(self, event: dict[str, Any], source: str) -> LogEntry:
+        raw_message = event["message"]
+        level, request_id = self._extract_fields(raw_message)
+        return LogEntry(
+            timestamp=from_epoch_ms(event["timestamp"]),
+            level=level,
+            raw=raw_message,
+            source=source,
+            request_id=request_id,
+            message=raw_message,
+        )
+
+    def append_event(
+        self, batch: LogBatch, event: dict[str, Any], source: str
+    ) -> None:
+        raw_message = event["message"]
+        level, request_id = self._extract_fields(raw_message)
+        batch.append(
+            int(event["timestamp"]), level, raw_message, source, request_id=request_id
+        )
+
+    @abstractmethod
+    def _iter_batches(self, path: Path, batch_size: int) -> Iterator[LogBatch]:...
+
+    @abstractmethod
+    def parse_string(self, content: str) -> list[LogEntry]:...
+
+    def iter_batches(
+        self, path: Path, batch_size: int = BATCH_SIZE
+    ) -> Iterator[LogBatch]:
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        return self._iter_batches(path, batch_size)
+
+    def iter_file(self, path: Path) -> Iterator[LogEntry]:
+        return chain.from_iterable(self.iter_batches(path))
+
+    def parse_file(self, path: Path) -> list[LogEntry]:
+        return list(self.iter_file(path))
@@ -1,43 +1,22 @@
 import json
-import re
-from datetime import datetime, timezone
+from collections.abc import Iterator, Sequence
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from logsentinel.models import LogEntry, LogLevel
+from logsentinel.models import LogBatch, LogEntry
+from logsentinel.parsers.base import EventParser
+from logsentinel.parsers.compression import is_compressed, open_input
+from logsentinel.parsers.json_stream import JsonStreamReader
+from logsentinel.parsers.scan import scan_export
 
+if TYPE_CHECKING:
+    from logsentinel.filters import Filter
 
-class CloudWatchParser:
-    @staticmethod
-    def _extract_level(message: str) -> LogLevel:
-        level_string = re.match(r"^\[(\w+)\]", message)
-        if level_string is None:
-            return LogLevel.UNKNOWN
-        try:
-            return LogLevel[level_string.group(1)]
-        except KeyError:
-            return LogLevel.UNKNOWN
 
+class CloudWatchParser(EventParser):
     @staticmethod
-    def _extract_request_id(message: str) -> str | None:
-        request_id = re.search(r"RequestId:\s+(\S+)", message)
-        if request_id:
-            return request_id.group(1)
-        return None
-
-    def _parse_event(self, event: dict[str, Any], source: str) -> LogEntry:
-        raw_message = event["message"]
-        timestamp = datetime.fromtimestamp(event["timestamp"] / 1000, timezone.utc)
-        level = self._extract_level(raw_message)
-        request_id = self._extract_request_id(raw_message)
-        return LogEntry(
-            timestamp=timestamp,
-            level=level,
-            raw=raw_message,
-            source=source,
-            request_id=request_id,
-            message=raw_message,
-        )
+    def sniff(head: bytes) -> bool:
+        return head.lstrip().startswith(b"{") and b'"logEvents"' in head
 
     def parse_string(self, content: str) -> list[LogEntry]:
         raw_json = json.loads(content)
@@ -46,8 +25,71 @@ class CloudWatchParser:
         source = raw_json.get("logGroupName", "unknown")
         return [self._parse_event(event, source) for event in raw_json["logEvents"]]
 
-    def parse_file(self, path: Path) -> list[LogEntry]:
+    def _scan_source(self, path: Path) -> str:
+        with open_input(path) as stream:
+            reader = JsonStreamReader(stream, self.chunk_size)
+            for key in reader.iter_object():
+                if key == "logGroupName":
+                    return str(reader.read_value())
+                reader.skip_value()
+        return "unknown"
+
+    def _iter_events(
+        self, path: Path, track_offsets: bool = False
+    ) -> Iterator[tuple[dict[str, Any], str, tuple[int, int] | None]]:
+        with open_input(path) as stream:
+            reader = JsonStreamReader(stream, self.chunk_size, track_offsets)
+            source: str | None = None
+            has_events = False
+            for key in reader.iter_object():
+                if key == "logGroupName" and source is None:
+                    source = str(reader.read_value())
+                elif key == "logEvents" and not has_events:
+                    has_events = True
+                    if source is None:
+                        # logGroupName comes after the events: look it up with a second,
+                        # value-skipping pass instead of buffering the events.
+                        source = self._scan_source(path)
+                    for event in reader.iter_array():
+                        yield event, source, reader.span() if track_offsets else None
+                else:
+                    reader.skip_value()
+        if not has_events:
+            raise ValueError("Missing 'logEvents' key in CloudWatch JSON")
+
+    def iter_file(self, path: Path) -> Iterator[LogEntry]:
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        events = self._iter_events(path)
+        return (self._parse_event(event, source) for event, source, _ in events)
+
+    def _iter_batches(self, path: Path, batch_size: int) -> Iterator[LogBatch]:
+        batch = LogBatch()
+        for event, source, _ in self._iter_events(path):
+            self.append_event(batch, event, source)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = LogBatch()
+        if len(batch):
+            yield batch
+
+    def iter_event_spans(
+        self, path: Path
+    ) -> Iterator[tuple[dict[str, Any], str, int, int]]:
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        if is_compressed(path):
+            # Offsets into the inflated stream cannot be read back from the file.
+            raise ValueError(f"Cannot index compressed file {path}")
+        for event, source, span in self._iter_events(path, track_offsets=True):
+            assert span is not None
+            yield event, source, span[0], span[1]
+
+    def scan(self, path: Path, filters: Sequence["Filter"]) -> LogBatch | None:
+        # Decodes only the events whose raw bytes can match; None when the
+        # filters cannot narrow a byte scan.
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
-        content = path.read_text(encoding="utf-8")
-        return self.parse_string(content)
+        if is_compressed(path):
+            return None
+        return scan_export(self, path, filters)
@@ -0,0 +1,58 @@
+import gzip
+import io
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, BinaryIO, cast
+
+zstd: Any
+try:
+    from compression import zstd  # type: ignore[import-not-found, no-redef]
+except ImportError:  # pragma: no cover - before Python 3.14
+    try:
+        import zstandard as zstd  # type: ignore[import-not-found, no-redef]
+    except ImportError:
+        zstd = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+MAGIC_SIZE = 4
+
+Opener = Callable[[Any, str], Any]
+
+
+def _opener(head: bytes) -> Opener | None:
+    if head.startswith(GZIP_MAGIC):
+        return gzip.open
+    if head.startswith(ZSTD_MAGIC):
+        if zstd is None:
+            raise ValueError("zstd input needs Python 3.14 or the zstandard package")
+        return cast(Opener, zstd.open)
+    return None
+
+
+def is_compressed(path: Path) -> bool:
+    with path.open("rb") as stream:
+        head = stream.read(MAGIC_SIZE)
+    return head.startswith((GZIP_MAGIC, ZSTD_MAGIC))
+
+
+def open_input(path: Path) -> BinaryIO:
+    # Decompressing readers inflate one buffer at a time, so a compressed export
+    # is never held in memory as a whole.
+    with path.open("rb") as stream:
+        head = stream.read(MAGIC_SIZE)
+    opener = _opener(head)
+    if opener is None:
+        return path.open("rb")
+    return cast(BinaryIO, opener(path, "rb"))
+
+
+def decompress(stream: BinaryIO) -> BinaryIO:
+    # Pipes cannot seek back, so the magic bytes are peeked, not read.
+    buffered = stream if isinstance(stream, io.BufferedReader) else io.BufferedReader(
+        cast(Any, stream)
+    )
+    opener = _opener(buffered.peek(MAGIC_SIZE)[:MAGIC_SIZE])
+    if opener is None:
+        return cast(BinaryIO, buffered)
+    return cast(BinaryIO, opener(buffered, "rb"))
@@ -0,0 +1,179 @@
+import codecs
+import json
+import re
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_TOKEN = re.compile(r"[^ \t\n\r]*")
+_STRING = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+# Plain text, strings and containers with nothing nested in them, all skipped
+# in one regex call; only nested brackets are left to count.
+_SKIPPABLE = re.compile(
+    rf'(?:[^"\[\]{{}}]++|{_STRING}|[\[{{](?:[^"\[\]{{}}]++|{_STRING})*+[\]}}])*+',
+    re.DOTALL,
+)
+# The longest text a value can end on and still be cut short by a chunk edge,
+# such as "-Infinit" or a \uXXXX escape.
+_PARTIAL_LENGTH = 8
+
+
+class JsonStreamReader:
+    def __init__(
+        self,
+        stream: BinaryIO,
+        chunk_size: int = CHUNK_SIZE,
+        track_offsets: bool = False,
+    ) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._track_offsets = track_offsets
+        # Byte offset in the stream of the character at self._mark.
+        self._offset = 0
+        self._mark = 0
+        self._value_span = (0, 0)
+
+    def _advance(self, pos: int) -> int:
+        segment = self._buffer[self._mark:pos]
+        self._offset += len(segment) if segment.isascii() else len(segment.encode())
+        self._mark = pos
+        return self._offset
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if chunk:
+            text = self._decoder.decode(chunk)
+        else:
+            text = self._decoder.decode(b"", final=True)
+            self._eof = True
+        if self._track_offsets:
+            self._advance(self._pos)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        self._mark = 0
+        return True
+
+    def span(self) -> tuple[int, int]:
+        if not self._track_offsets:
+            raise ValueError("Reader was created without track_offsets")
+        start, end = self._value_span
+        return self._advance(start), self._advance(end)
+
+    def position(self) -> int:
+        if not self._track_offsets:
+            raise ValueError("Reader was created without track_offsets")
+        return self._advance(self._pos)
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r}")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                # Only a value cut off at the end of the buffer can be completed
+                # by reading on; anything else is malformed input.
+                truncated = error.msg.startswith("Unterminated string") or (
+                    error.pos >= len(self._buffer) - _PARTIAL_LENGTH
+                )
+                if truncated and self._fill():
+                    continue
+                raise
+            # A scalar ending near the buffer edge may be cut short there, as "12."
+            # decodes as 12, so it is only accepted once more input follows it.
+            near_edge = end >= len(self._buffer) - _PARTIAL_LENGTH
+            if near_edge and not isinstance(value, dict | list) and self._fill():
+                continue
+            self._value_span = (self._pos, end)
+            self._pos = end
+            return value
+
+    def read_token(self) -> str:
+        # A bare run of non-whitespace, for inputs mixing JSON with plain text.
+        self.peek()
+        while True:
+            end = _TOKEN.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if end == len(self._buffer) and self._fill():
+                continue
+            token = self._buffer[self._pos:end]
+            self._pos = end
+            return token
+
+    def iter_array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            separator = self.peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' but found {separator!r}")
+
+    def iter_object(self) -> Iterator[str]:
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("Object keys must be strings")
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' but found {separator!r}")
+
+    def skip_value(self) -> None:
+        # Containers are skipped by matching brackets outside strings, without
+        # decoding them; their contents are not validated.
+        if self.peek() not in ("[", "{"):
+            self.read_value()
+            return
+        self._pos += 1
+        depth = 1
+        while depth:
+            self._pos = _SKIPPABLE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            char = self._buffer[self._pos:self._pos + 1]
+            if char == "[" or char == "{":
+                depth += 1
+            elif char == "]" or char == "}":
+                depth -= 1
+            else:
+                # The end of the buffer, or a string it cuts off.
+                self._fill_or_fail()
+                continue
+            self._pos += 1
+
+    def _fill_or_fail(self) -> None:
+        if not self._fill():
+            raise ValueError("Unexpected end of JSON input")
@@ -0,0 +1,147 @@
+import io
+import re
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO
+
+from logsentinel.models import LogBatch, LogEntry, LogLevel
+from logsentinel.models.log_batch import to_epoch_ms
+from logsentinel.parsers.base import BATCH_SIZE, LEVELS_BY_NAME, EventParser
+from logsentinel.parsers.compression import open_input
+from logsentinel.parsers.ndjson import READ_SIZE, STDIN_SOURCE
+
+SNIFF_LINES = 5
+
+LEVEL_ALIASES = {
+    **LEVELS_BY_NAME,
+    "WARN": LogLevel.WARNING,
+    "FATAL": LogLevel.CRITICAL,
+    "TRACE": LogLevel.DEBUG,
+}
+# Lines the Lambda platform writes around each invocation.
+PLATFORM_PREFIXES = (
+    "START RequestId:",
+    "END RequestId:",
+    "REPORT RequestId:",
+    "INIT_START ",
+    "INIT_REPORT ",
+    "EXTENSION\t",
+    "TELEMETRY\t",
+)
+
+_TIMESTAMP = r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?(?:Z|[+-]\d\d:\d\d)"
+# `aws logs tail` puts the event time and the log stream in front of each line.
+_TAIL_PREFIX = re.compile(rf"({_TIMESTAMP}) (\S+) ")
+# Python runtime: [LEVEL]\ttimestamp\trequest id\tmessage.
+_PYTHON = re.compile(rf"\[(\w+)\]\t({_TIMESTAMP})\t(\S+)\t")
+# Node.js and most other runtimes: timestamp\trequest id\tLEVEL\tmessage.
+_NODE = re.compile(rf"({_TIMESTAMP})\t(\S+)\t(\w+)\t")
+
+
+_Entry = tuple[int | None, LogLevel, str, str | None]
+
+
+def _epoch_ms(value: str) -> int:
+    return to_epoch_ms(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+class LambdaTextParser(EventParser):
+    # Plain-text Lambda logs as downloaded from the console or printed by
+    # `aws logs tail`. Lines without a timestamp of their own, such as stack
+    # traces, continue the entry before them.
+    def __init__(self, chunk_size: int = READ_SIZE) -> None:
+        super().__init__(chunk_size)
+
+    @staticmethod
+    def _starts_entry(line: str) -> bool:
+        return bool(
+            line.startswith(PLATFORM_PREFIXES)
+            or _TAIL_PREFIX.match(line)
+            or _PYTHON.match(line)
+            or _NODE.match(line)
+        )
+
+    @classmethod
+    def sniff(cls, head: bytes) -> bool:
+        lines = head.decode("utf-8", "replace").lstrip().splitlines()[:SNIFF_LINES]
+        return any(cls._starts_entry(line) for line in lines)
+
+    def _parse_line(self, line: str, timestamp: int | None) -> _Entry | None:
+        tail = _TAIL_PREFIX.match(line)
+        if tail is not None:
+            timestamp = _epoch_ms(tail.group(1))
+            line = line[tail.end():]
+        python = _PYTHON.match(line)
+        if python is not None:
+            level = LEVEL_ALIASES.get(python.group(1), LogLevel.UNKNOWN)
+            return _epoch_ms(python.group(2)), level, line, python.group(3)
+        node = _NODE.match(line)
+        if node is not None:
+            level = LEVEL_ALIASES.get(node.group(3), LogLevel.UNKNOWN)
+            return _epoch_ms(node.group(1)), level, line, node.group(2)
+        if tail is not None or line.startswith(PLATFORM_PREFIXES):
+            level, request_id = self._extract_fields(line)
+            return timestamp, level, line, request_id
+        return None
+
+    def _iter_entries(self, stream: BinaryIO) -> Iterator[_Entry]:
+        # Each entry is held back until the next one starts, since the lines in
+        # between continue it.
+        pending: _Entry | None = None
+        timestamp: int | None = None
+        for raw in stream:
+            line = raw.decode("utf-8").rstrip("\r\n")
+            if not line:
+                continue
+            parsed = self._parse_line(line, timestamp)
+            if parsed is None:
+                if pending is not None:
+                    pending = (*pending[:2], f"{pending[2]}\n{line}", pending[3])
+                    continue
+                level, request_id = self._extract_fields(line)
+                parsed = (timestamp, level, line, request_id)
+            if pending is not None:
+                yield pending
+            pending = parsed
+            timestamp = parsed[0] if parsed[0] is not None else timestamp
+        if pending is not None:
+            yield pending
+
+    def iter_stream(
+        self, stream: BinaryIO, source: str = STDIN_SOURCE, batch_size: int = BATCH_SIZE
+    ) -> Iterator[LogBatch]:
+        batch = LogBatch()
+        # Platform lines before the first timestamped line take its time.
+        undated: list[_Entry] = []
+        for entry in self._iter_entries(stream):
+            if entry[0] is None and len(undated) < batch_size:
+                undated.append(entry)
+                continue
+            # Past a batch of them there is no telling when the first one comes.
+            first = entry[0] or 0
+            for timestamp, level, message, request_id in [*undated, entry]:
+                batch.append(
+                    first if timestamp is None else timestamp,
+                    level,
+                    message,
+                    source,
+                    request_id=request_id,
+                )
+            undated.clear()
+            if len(batch) >= batch_size:
+                yield batch
+                batch = LogBatch()
+        for _, level, message, request_id in undated:
+            batch.append(0, level, message, source, request_id=request_id)
+        if len(batch):
+            yield batch
+
+    def _iter_batches(self, path: Path, batch_size: int) -> Iterator[LogBatch]:
+        with open_input(path) as stream:
+            yield from self.iter_stream(stream, path.name, batch_size)
+
+    def parse_string(self, content: str) -> list[LogEntry]:
+        stream = io.BytesIO(content.encode("utf-8"))
+        return list(chain.from_iterable(self.iter_stream(stream)))
@@ -0,0 +1,174 @@
+import json
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from logsentinel.models import LogBatch, LogEntry, LogLevel
+from logsentinel.parsers.base import BATCH_SIZE, LEVELS_BY_NAME, EventParser
+from logsentinel.parsers.compression import is_compressed, open_input
+from logsentinel.utils.vector import is_sorted
+
+READ_SIZE = 4 * 1024 * 1024
+STDIN_SOURCE = "stdin"
+
+_EXPLICIT_FIELDS = frozenset(("level", "requestId"))
+# Only written for the entries that have them; see NdjsonWriter.
+_SPARSE_FIELDS = frozenset(("raw", "correlationId", "metadata"))
+
+
+def _sparse(
+    event: dict[str, Any],
+) -> tuple[str | None, str | None, dict[str, str] | None]:
+    raw = event.get("raw")
+    correlation_id = event.get("correlationId")
+    metadata = event.get("metadata")
+    if not isinstance(metadata, dict) or not all(
+        isinstance(value, str) for value in metadata.values()
+    ):
+        metadata = None
+    return (
+        raw if isinstance(raw, str) else None,
+        correlation_id if isinstance(correlation_id, str) else None,
+        metadata,
+    )
+
+
+class NdjsonParser(EventParser):
+    def __init__(self, chunk_size: int = READ_SIZE) -> None:
+        super().__init__(chunk_size)
+
+    @staticmethod
+    def sniff(head: bytes) -> bool:
+        first = head.lstrip().split(b"\n", 1)[0].rstrip()
+        return first.startswith(b"{") and first.endswith(b"}") and b'"message"' in first
+
+    @staticmethod
+    def _decode(lines: list[bytes]) -> list[Any]:
+        lines = [line for line in lines if line and not line.isspace()]
+        if not lines:
+            return []
+        # One json.loads over the whole run of lines stays in C instead of paying
+        # the call and str conversion overhead per event.
+        try:
+            events: list[Any] = json.loads(b"[%s]" % b",".join(lines))
+        except ValueError:
+            events = []
+        # A line holding "{...}, {...}" decodes as two events, so the count has
+        # to match as well.
+        if len(events) != len(lines):
+            for line in lines:
+                try:
+                    json.loads(line)
+                except ValueError as error:
+                    raise ValueError(f"Invalid NDJSON line: {line[:80]!r}") from error
+            raise ValueError("Invalid NDJSON input")
+        return events
+
+    def _fields(self, event: dict[str, Any]) -> tuple[LogLevel, str | None]:
+        # Events written by `--output ndjson` state their level and request id;
+        # those win over what the message text suggests.
+        level, request_id = self._extract_fields(event["message"])
+        if not _EXPLICIT_FIELDS.isdisjoint(event):
+            name = event.get("level")
+            if isinstance(name, str):
+                level = LEVELS_BY_NAME.get(name.upper(), level)
+            explicit = event.get("requestId")
+            if isinstance(explicit, str):
+                request_id = explicit
+        return level, request_id
+
+    def append_event(
+        self, batch: LogBatch, event: dict[str, Any], source: str
+    ) -> None:
+        level, request_id = self._fields(event)
+        raw, correlation_id, metadata = _sparse(event)
+        batch.append(
+            int(event["timestamp"]),
+            level,
+            event["message"],
+            source,
+            raw=raw,
+            request_id=request_id,
+            correlation_id=correlation_id,
+            metadata=metadata,
+        )
+
+    def _to_batch(self, events: list[Any], source: str) -> LogBatch:
+        # Filling whole columns at once skips the per-event LogBatch.append call,
+        # which costs more than decoding the JSON.
+        batch = LogBatch()
+        try:
+            batch.messages = [event["message"] for event in events]
+            batch.timestamps = array("q", [int(event["timestamp"]) for event in events])
+            batch.timestamps_sorted = is_sorted(batch.timestamps)
+            sources = [event.get("logGroupName", source) for event in events]
+        except (AttributeError, KeyError, TypeError) as error:
+            raise ValueError("Invalid NDJSON event") from error
+        if not all(type(message) is str for message in batch.messages):
+            raise ValueError("Invalid NDJSON event: message is not a string")
+        fields = list(map(self._fields, events))
+        batch.levels = bytearray(level for level, _ in fields)
+        batch.request_ids = [request_id for _, request_id in fields]
+        batch.source_ids = array("I", map(batch._source_id, sources))
+        messages = batch.messages
+        for index, event in enumerate(events):
+            if _SPARSE_FIELDS.isdisjoint(event):
+                continue
+            raw, correlation_id, metadata = _sparse(event)
+            if raw is not None and raw != messages[index]:
+                batch.raws[index] = raw
+            if correlation_id is not None:
+                batch.correlation_ids[index] = correlation_id
+            if metadata:
+                batch.metadata[index] = metadata
+        return batch
+
+    def _iter_chunks(self, stream: BinaryIO) -> Iterator[list[bytes]]:
+        # read1 hands back whatever a pipe has buffered instead of waiting for a
+        # full chunk, so slow writers still see their lines promptly.
+        read = getattr(stream, "read1", stream.read)
+        partial = b""
+        while chunk := read(self.chunk_size):
+            *lines, partial = (partial + chunk).split(b"\n")
+            if lines:
+                yield lines
+        if partial:
+            yield [partial]
+
+    def iter_stream(
+        self, stream: BinaryIO, source: str = STDIN_SOURCE, batch_size: int = BATCH_SIZE
+    ) -> Iterator[LogBatch]:
+        for lines in self._iter_chunks(stream):
+            for start in range(0, len(lines), batch_size):
+                events = self._decode(lines[start:start + batch_size])
+                if events:
+                    yield self._to_batch(events, source)
+
+    def _iter_batches(self, path: Path, batch_size: int) -> Iterator[LogBatch]:
+        with open_input(path) as stream:
+            yield from self.iter_stream(stream, path.name, batch_size)
+
+    def iter_event_spans(
+        self, path: Path
+    ) -> Iterator[tuple[dict[str, Any], str, int, int]]:
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        if is_compressed(path):
+            raise ValueError(f"Cannot index compressed file {path}")
+        with path.open("rb") as stream:
+            offset = 0
+            for lines in self._iter_chunks(stream):
+                events = iter(self._decode(lines))
+                for line in lines:
+                    end = offset + len(line)
+                    if line and not line.isspace():
+                        event = next(events)
+                        if not isinstance(event, dict):
+                            raise ValueError(f"Invalid NDJSON event: {event!r:.80}")
+                        yield event, event.get("logGroupName", path.name), offset, end
+                    offset = end + 1
+
+    def parse_string(self, content: str) -> list[LogEntry]:
+        lines = content.encode("utf-8").split(b"\n")
+        return list(self._to_batch(self._decode(lines), STDIN_SOURCE))
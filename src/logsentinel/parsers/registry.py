@@ -0,0 +1,87 @@
+from collections.abc import Callable, Sequence
+from functools import cache
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import BinaryIO, cast
+
+from logsentinel.parsers.base import Parser
+from logsentinel.parsers.cloudwatch import CloudWatchParser
+from logsentinel.parsers.compression import open_input
+from logsentinel.parsers.lambda_text import LambdaTextParser
+from logsentinel.parsers.ndjson import NdjsonParser
+from logsentinel.parsers.step_functions import StepFunctionsParser
+from logsentinel.parsers.subscription import SubscriptionParser
+
+ENTRY_POINT_GROUP = "logsentinel.parsers"
+AUTO = "auto"
+DEFAULT_FORMAT = "cloudwatch"
+SNIFF_SIZE = 4096
+
+Sniffer = Callable[[bytes], bool]
+
+# Sniffed in this order: the more specific layouts come first, since a decoded
+# subscription payload also looks like an export and anything looks like text.
+BUILTIN_PARSERS: dict[str, type[Parser]] = {
+    "subscription": SubscriptionParser,
+    "step-functions": StepFunctionsParser,
+    "cloudwatch": CloudWatchParser,
+    "ndjson": NdjsonParser,
+    "lambda-text": LambdaTextParser,
+}
+
+
+@cache
+def parser_types() -> dict[str, type[Parser]]:
+    # Other packages add formats under the "logsentinel.parsers" entry point
+    # group; a class with a `sniff(head: bytes) -> bool` method takes part in
+    # detection. Built-in names cannot be replaced.
+    plugins: dict[str, type[Parser]] = {}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name not in BUILTIN_PARSERS:
+            plugins[entry_point.name] = entry_point.load()
+    return {**plugins, **BUILTIN_PARSERS}
+
+
+def get_parser(name: str) -> Parser:
+    parser_type = parser_types().get(name)
+    if parser_type is None:
+        choices = ", ".join([AUTO, *parser_types()])
+        raise ValueError(f"Unknown format {name} (choose from {choices})")
+    return parser_type()
+
+
+def sniff(head: bytes) -> str | None:
+    for name, parser_type in parser_types().items():
+        sniffer = cast(Sniffer | None, getattr(parser_type, "sniff", None))
+        if sniffer is not None and sniffer(head):
+            return name
+    return None
+
+
+def detect(head: bytes) -> str:
+    # Whatever is left is reported as an invalid export, as before detection.
+    return sniff(head) or DEFAULT_FORMAT
+
+
+def read_head(path: Path) -> bytes:
+    with open_input(path) as stream:
+        return stream.read(SNIFF_SIZE)
+
+
+def detect_paths(paths: Sequence[Path]) -> str:
+    names = {path: detect(read_head(path)) for path in paths}
+    found = set(names.values())
+    if len(found) > 1:
+        listed = ", ".join(f"{path} is {name}" for path, name in names.items())
+        raise ValueError(f"Inputs have different formats ({listed}); pass --format")
+    return found.pop() if found else DEFAULT_FORMAT
+
+
+def detect_stream(stream: BinaryIO) -> str:
+    return sniff_stream(stream) or DEFAULT_FORMAT
+
+
+def sniff_stream(stream: BinaryIO) -> str | None:
+    # Only peeks, so the parser still reads the stream from its first byte.
+    peek = getattr(stream, "peek", None)
+    return sniff(peek(SNIFF_SIZE)[:SNIFF_SIZE]) if peek is not None else None
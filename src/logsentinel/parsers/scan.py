@@ -0,0 +1,270 @@
+import json
+import mmap
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+from logsentinel.models import LogBatch, LogLevel
+from logsentinel.parsers.json_stream import JsonStreamReader
+from logsentinel.storage.index import IndexableParser
+
+if TYPE_CHECKING:
+    from logsentinel.filters import Filter
+
+SCAN_CHUNK = 1024 * 1024
+DECODE_WINDOW = 4096
+# Once matching events cover this share of the bytes scanned so far, decoding
+# everything is cheaper than locating events one by one.
+MAX_SELECTIVITY = 0.2
+MIN_SELECTIVITY_SPAN = SCAN_CHUNK
+
+# Printable ASCII written as a \u escape would hide a keyword or level marker
+# from a byte scan.
+_ESCAPED_ASCII = re.compile(rb"\\u00[2-7][0-9a-f]", re.IGNORECASE)
+# Characters outside ASCII whose casefold contains ASCII (every such character
+# is in the BMP), so a message holding one can match an ASCII keyword that is
+# not in its raw bytes.
+_FOLDING_CHARS = (
+    "\u00df\u0130\u0149\u017f\u01f0\u1e96\u1e97\u1e98\u1e99"
+    "\u1e9a\u1e9e\u212a\ufb00\ufb01\ufb02\ufb03\ufb04\ufb05\ufb06"
+)
+_FOLDING = re.compile(
+    b"|".join(
+        [re.escape(char.encode("utf-8")) for char in _FOLDING_CHARS]
+        + [rb"\\u%04x" % ord(char) for char in _FOLDING_CHARS]
+    ),
+    re.IGNORECASE,
+)
+_ESCAPED_QUOTE = re.compile(rb'(?<!\\)(?:\\\\)*\\"')
+_EMPTY_ARRAY = re.compile(rb"\s*\]")
+_MESSAGE_KEY = rb'"message"\s*:\s*"'
+_PLAIN_KEYWORD = re.compile(r"[ !#-.0-\[\]-~]+")
+
+
+def _is_event(value: Any) -> bool:
+    return isinstance(value, dict) and "timestamp" in value and "message" in value
+
+
+class _Unselective(Exception):
+    pass
+
+
+def _intersect(left: Sequence[int], right: Sequence[int]) -> list[int]:
+    return sorted(set(left).intersection(right))
+
+
+class ExportScanner:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.source: str | None = None
+        self._events_start: int | None = None
+        with path.open("rb") as stream:
+            reader = JsonStreamReader(stream, track_offsets=True)
+            for key in reader.iter_object():
+                if key == "logGroupName" and self.source is None:
+                    self.source = str(reader.read_value())
+                elif key == "logEvents":
+                    if reader.peek() == "[":
+                        self._events_start = reader.position() + 1
+                    break
+                else:
+                    reader.skip_value()
+        self._stream = path.open("rb")
+        self._mmap = mmap.mmap(self._stream.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._events_start is not None and _EMPTY_ARRAY.match(
+            self._mmap, self._events_start
+        ):
+            # Nothing to narrow; the regular parse reports the empty export.
+            self._events_start = None
+        self._json = json.JSONDecoder()
+        self._events: dict[int, dict[str, Any]] = {}
+        self._escapes: tuple[bool, bool] | None = None
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._stream.close()
+
+    def __enter__(self) -> "ExportScanner":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _chunks(self, overlap: int) -> Iterator[tuple[int, bytes]]:
+        assert self._events_start is not None
+        for start in range(self._events_start, len(self._mmap), SCAN_CHUNK):
+            yield start, self._mmap[start:start + SCAN_CHUNK + overlap]
+
+    def _scan_escapes(self) -> tuple[bool, bool]:
+        # Returns (escaped ASCII anywhere, case-folding characters anywhere).
+        if self._escapes is None:
+            escaped = folding = False
+            for _, data in self._chunks(overlap=8):
+                has_escape = b"\\u" in data
+                escaped = escaped or bool(has_escape and _ESCAPED_ASCII.search(data))
+                if not folding and (has_escape or not data.isascii()):
+                    folding = _FOLDING.search(data) is not None
+            self._escapes = (escaped, folding)
+        return self._escapes
+
+    def _quotes(self, start: int, end: int) -> int:
+        segment = self._mmap[start:end]
+        count = segment.count(b'"')
+        if count and b'\\"' in segment:
+            count -= len(_ESCAPED_QUOTE.findall(segment))
+        return count
+
+    def _decode_at(self, start: int) -> tuple[Any, int]:
+        window = DECODE_WINDOW
+        while True:
+            data = self._mmap[start:start + window]
+            text = data.decode("utf-8", "surrogateescape")
+            try:
+                value, end = self._json.raw_decode(text)
+            except json.JSONDecodeError:
+                if start + window >= len(self._mmap):
+                    raise
+                window *= 4
+                continue
+            if not data.isascii():
+                end = len(text[:end].encode("utf-8", "surrogateescape"))
+            return value, start + end
+
+    def _is_nested(self, start: int) -> bool:
+        # Events follow the array's `[` or a `,`; an object after a `:` or
+        # another `[` is a value inside an event.
+        position = start - 1
+        while self._mmap[position] in b" \t\r\n":
+            position -= 1
+        before = self._mmap[position]
+        assert self._events_start is not None
+        return before == ord(":") or (
+            before == ord("[") and position != self._events_start - 1
+        )
+
+    def _enclosing_event(self, hit: int, bound: int) -> tuple[int, int] | None:
+        # `bound` is a position known to be outside any string, so the parity of
+        # unescaped quotes since then tells whether a `{` is structural.
+        quotes = self._quotes(bound, hit)
+        position = hit
+        while (start := self._mmap.rfind(b"{", bound, position)) >= 0:
+            position = start
+            if (quotes - self._quotes(start, hit)) % 2 or self._is_nested(start):
+                continue
+            value, end = self._decode_at(start)
+            if _is_event(value):
+                if end <= hit:
+                    return None
+                self._events[start] = value
+                return start, end
+        return None
+
+    def _events_for(self, hits: Iterable[int]) -> list[int]:
+        assert self._events_start is not None
+        starts: list[int] = []
+        bound = self._events_start
+        matched = 0
+        for hit in hits:
+            if hit < bound:
+                continue
+            found = self._enclosing_event(hit, bound)
+            if found is not None:
+                starts.append(found[0])
+                bound = found[1]
+                matched += found[1] - found[0]
+                scanned = bound - self._events_start
+                if scanned > MIN_SELECTIVITY_SPAN:
+                    if matched > scanned * MAX_SELECTIVITY:
+                        raise _Unselective
+        return starts
+
+    def level_candidates(self, levels: Sequence[int]) -> list[int] | None:
+        if self._events_start is None or self._scan_escapes()[0]:
+            return None
+        # Mirrors CloudWatchParser: a level is a known name in brackets at the
+        # very start of the message, anything else is UNKNOWN.
+        names = [level.name for level in LogLevel if level is not LogLevel.UNKNOWN]
+        if LogLevel.UNKNOWN in levels:
+            rejected = [name for name in names if LogLevel[name] not in levels]
+            if not rejected:
+                return None
+            marker = b"(?!\\[(?:%s)\\])" % "|".join(rejected).encode()
+        else:
+            accepted = [name for name in names if LogLevel[name] in levels]
+            if not accepted:
+                return []
+            marker = b"\\[(?:%s)\\]" % "|".join(accepted).encode()
+        pattern = re.compile(_MESSAGE_KEY + marker)
+        return self._events_for(self._pattern_hits(pattern))
+
+    def _pattern_hits(self, pattern: "re.Pattern[bytes]") -> Iterator[int]:
+        # search() in a loop rather than finditer: a suspended finditer holds an
+        # export of the map, which would keep it from closing after an error.
+        assert self._events_start is not None
+        position = self._events_start
+        while (match := pattern.search(self._mmap, position)) is not None:
+            position = match.end()
+            yield match.start()
+
+    def _keyword_hits(self, keyword: bytes) -> Iterator[int]:
+        # Lower-casing a chunk and using bytes.find is far faster than an
+        # IGNORECASE regex over the whole map.
+        for start, data in self._chunks(overlap=len(keyword) - 1):
+            lowered = data.lower()
+            position = lowered.find(keyword)
+            while 0 <= position < SCAN_CHUNK:
+                yield start + position
+                position = lowered.find(keyword, position + 1)
+
+    def substring_candidates(self, folded: str) -> list[int] | None:
+        if self._events_start is None or not _PLAIN_KEYWORD.fullmatch(folded):
+            return None
+        if any(self._scan_escapes()):
+            return None
+        return self._events_for(self._keyword_hits(folded.lower().encode("ascii")))
+
+    def query(
+        self, parser: IndexableParser, filters: Sequence["Filter"]
+    ) -> LogBatch | None:
+        if self.source is None:
+            return None
+        candidates: Sequence[int] | None = None
+        try:
+            for entry_filter in filters:
+                narrowed = entry_filter.scan_candidates(self)
+                if narrowed is not None:
+                    candidates = (
+                        narrowed
+                        if candidates is None
+                        else _intersect(candidates, narrowed)
+                    )
+        except _Unselective:
+            return None
+        if candidates is None:
+            return None
+        batch = LogBatch()
+        for start in candidates:
+            event = self._events.get(start)
+            if event is None:
+                event = self._decode_at(start)[0]
+            parser.append_event(batch, event, self.source)
+        # As with the index, the scan only narrows; the filters decide.
+        for entry_filter in filters:
+            batch = entry_filter.apply_batch(batch)
+        return batch
+
+
+def scan_export(
+    parser: IndexableParser, path: Path, filters: Sequence["Filter"]
+) -> LogBatch | None:
+    if not filters:
+        return None
+    with ExportScanner(path) as scanner:
+        return scanner.query(parser, filters)
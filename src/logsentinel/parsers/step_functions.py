@@ -0,0 +1,99 @@
+import io
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from logsentinel.models import LogBatch, LogEntry, LogLevel
+from logsentinel.models.log_batch import to_epoch_ms
+from logsentinel.parsers.base import BATCH_SIZE, EventParser
+from logsentinel.parsers.compression import open_input
+from logsentinel.parsers.json_stream import JsonStreamReader
+from logsentinel.parsers.ndjson import STDIN_SOURCE
+
+ERROR_SUFFIXES = ("Failed", "TimedOut")
+WARNING_SUFFIXES = ("Aborted",)
+
+
+def _epoch_ms(value: Any) -> int:
+    # The CLI prints ISO 8601 strings, the SDKs epoch seconds.
+    if isinstance(value, (int, float)):
+        return int(value * 1000)
+    return to_epoch_ms(datetime.fromisoformat(str(value).replace("Z", "+00:00")))
+
+
+class StepFunctionsParser(EventParser):
+    # Execution histories as returned by GetExecutionHistory: an object with an
+    # "events" array, or the bare array. Each history event becomes one entry.
+    @staticmethod
+    def sniff(head: bytes) -> bool:
+        start = head.lstrip()[:1]
+        return start in (b"{", b"[") and b'"previousEventId"' in head
+
+    @staticmethod
+    def _level(event_type: str) -> LogLevel:
+        if event_type.endswith(ERROR_SUFFIXES):
+            return LogLevel.ERROR
+        if event_type.endswith(WARNING_SUFFIXES):
+            return LogLevel.WARNING
+        return LogLevel.INFO
+
+    @staticmethod
+    def _message(event: dict[str, Any]) -> str:
+        parts = [str(event["type"])]
+        # Every event carries its fields in a single "<type>EventDetails" object.
+        for key, details in event.items():
+            if key.endswith("EventDetails") and isinstance(details, dict):
+                for field in ("name", "resource", "error"):
+                    if details.get(field):
+                        parts.append(str(details[field]))
+                if details.get("cause"):
+                    parts.append(f"- {details['cause']}")
+        return " ".join(parts)
+
+    def _append(self, batch: LogBatch, event: Any, source: str) -> None:
+        try:
+            batch.append(
+                _epoch_ms(event["timestamp"]),
+                self._level(str(event["type"])),
+                self._message(event),
+                source,
+            )
+        except (KeyError, TypeError) as error:
+            raise ValueError("Invalid Step Functions history event") from error
+
+    def _iter_history(self, stream: BinaryIO) -> Iterator[Any]:
+        reader = JsonStreamReader(stream, self.chunk_size)
+        if reader.peek() == "[":
+            yield from reader.iter_array()
+            return
+        has_events = False
+        for key in reader.iter_object():
+            if key == "events":
+                has_events = True
+                yield from reader.iter_array()
+            else:
+                reader.skip_value()
+        if not has_events:
+            raise ValueError("Missing 'events' key in Step Functions history")
+
+    def iter_stream(
+        self, stream: BinaryIO, source: str = STDIN_SOURCE, batch_size: int = BATCH_SIZE
+    ) -> Iterator[LogBatch]:
+        batch = LogBatch()
+        for event in self._iter_history(stream):
+            self._append(batch, event, source)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = LogBatch()
+        if len(batch):
+            yield batch
+
+    def _iter_batches(self, path: Path, batch_size: int) -> Iterator[LogBatch]:
+        with open_input(path) as stream:
+            yield from self.iter_stream(stream, path.name, batch_size)
+
+    def parse_string(self, content: str) -> list[LogEntry]:
+        stream = io.BytesIO(content.encode("utf-8"))
+        return list(chain.from_iterable(self.iter_stream(stream)))
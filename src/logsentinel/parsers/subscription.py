@@ -0,0 +1,96 @@
+import base64
+import binascii
+import gzip
+import io
+import json
+import zlib
+from collections.abc import Iterator
+from itertools import chain
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from logsentinel.models import LogBatch, LogEntry
+from logsentinel.parsers.base import BATCH_SIZE, EventParser
+from logsentinel.parsers.compression import open_input
+from logsentinel.parsers.json_stream import JsonStreamReader
+from logsentinel.parsers.ndjson import READ_SIZE, STDIN_SOURCE
+
+# "H4sI" is how every base64-encoded gzip stream starts.
+GZIP_BASE64 = b"H4sI"
+CONTROL_MESSAGE = "CONTROL_MESSAGE"
+
+
+class SubscriptionParser(EventParser):
+    # CloudWatch Logs subscription payloads: gzip-compressed JSON, base64 encoded
+    # in Lambda events and Kinesis records, concatenated as-is in Firehose
+    # deliveries. Records may be bare base64 lines, {"awslogs": {"data": ...}}
+    # events, Kinesis {"data": ...} records or decoded payloads, in any mix.
+    def __init__(self, chunk_size: int = READ_SIZE) -> None:
+        super().__init__(chunk_size)
+
+    @staticmethod
+    def sniff(head: bytes) -> bool:
+        start = head.lstrip().lstrip(b'["')
+        return (
+            start.startswith(GZIP_BASE64)
+            or b'"awslogs"' in head
+            or b'"messageType"' in head
+        )
+
+    def _iter_records(self, stream: BinaryIO) -> Iterator[Any]:
+        reader = JsonStreamReader(stream, self.chunk_size)
+        while char := reader.peek():
+            if char in '{["':
+                record = reader.read_value()
+            else:
+                record = reader.read_token()
+            if isinstance(record, list):
+                yield from record
+            else:
+                yield record
+
+    @staticmethod
+    def _payload(record: Any) -> dict[str, Any] | None:
+        if isinstance(record, dict) and "awslogs" in record:
+            record = record["awslogs"]
+        if isinstance(record, dict) and "data" in record:
+            record = record["data"]
+        if isinstance(record, str):
+            try:
+                record = json.loads(gzip.decompress(base64.b64decode(record)))
+            except (binascii.Error, EOFError, OSError, zlib.error) as error:
+                raise ValueError("Invalid subscription record") from error
+        if not isinstance(record, dict):
+            raise ValueError("Invalid subscription record")
+        # Control messages only check that the destination is reachable.
+        if record.get("messageType") == CONTROL_MESSAGE:
+            return None
+        return record
+
+    def iter_stream(
+        self, stream: BinaryIO, source: str = STDIN_SOURCE, batch_size: int = BATCH_SIZE
+    ) -> Iterator[LogBatch]:
+        batch = LogBatch()
+        for record in self._iter_records(stream):
+            payload = self._payload(record)
+            if payload is None:
+                continue
+            group = str(payload.get("logGroup", source))
+            try:
+                for event in payload["logEvents"]:
+                    self.append_event(batch, event, group)
+            except (KeyError, TypeError) as error:
+                raise ValueError("Invalid subscription payload") from error
+            if len(batch) >= batch_size:
+                yield batch
+                batch = LogBatch()
+        if len(batch):
+            yield batch
+
+    def _iter_batches(self, path: Path, batch_size: int) -> Iterator[LogBatch]:
+        with open_input(path) as stream:
+            yield from self.iter_stream(stream, path.name, batch_size)
+
+    def parse_string(self, content: str) -> list[LogEntry]:
+        stream = io.BytesIO(content.encode("utf-8"))
+        return list(chain.from_iterable(self.iter_stream(stream)))
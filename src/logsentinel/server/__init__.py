@@ -0,0 +1,17 @@
+from logsentinel.server.client import ServerClient as ServerClient
+from logsentinel.server.client import find_server as find_server
+from logsentinel.server.http import QueryServer as QueryServer
+from logsentinel.server.query import Query as Query
+from logsentinel.server.store import Dataset as Dataset
+from logsentinel.server.store import LogStore as LogStore
+from logsentinel.server.store import MemoryIndex as MemoryIndex
+
+__all__ = [
+    "Dataset",
+    "LogStore",
+    "MemoryIndex",
+    "Query",
+    "QueryServer",
+    "ServerClient",
+    "find_server",
+]
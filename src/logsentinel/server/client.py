@@ -0,0 +1,129 @@
+import http.client
+import json
+import os
+from collections.abc import Iterator
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from logsentinel.models import LogBatch
+from logsentinel.server.query import Query
+from logsentinel.storage.codec import decode_batch, read_frame
+
+STATE_NAME = "server.json"
+# Only for finding out whether a server is there, which on localhost takes
+# milliseconds; queries wait as long as loading the files takes.
+CONNECT_TIMEOUT = 0.2
+
+
+def state_path(directory: Path) -> Path:
+    return directory / STATE_NAME
+
+
+def write_state(directory: Path, host: str, port: int) -> Path:
+    path = state_path(directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(json.dumps({"host": host, "port": port, "pid": os.getpid()}))
+    os.replace(temporary, path)
+    return path
+
+
+def remove_state(directory: Path) -> None:
+    # A newer server may have taken over the file; it is only ours to remove if
+    # it still names this process.
+    path = state_path(directory)
+    try:
+        owner = json.loads(path.read_text()).get("pid")
+    except (OSError, ValueError):
+        return
+    if owner == os.getpid():
+        path.unlink(missing_ok=True)
+
+
+class ServerClient:
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+
+    def _request(
+        self, method: str, route: str, payload: Any = None, timeout: float | None = None
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        try:
+            connection.request(
+                method, route, body=body, headers={"Content-Type": "application/json"}
+            )
+            response = connection.getresponse()
+        except BaseException:
+            connection.close()
+            raise
+        if response.status != 200:
+            try:
+                error = json.loads(response.read())
+            except ValueError:
+                error = {"error": f"HTTP {response.status}"}
+            finally:
+                connection.close()
+            if response.status == 403:
+                # An OSError, so callers fall back to reading the file themselves.
+                raise PermissionError(error["error"])
+            raise ValueError(error.get("path") or error["error"])
+        return connection, response
+
+    def _json(
+        self, method: str, route: str, payload: Any = None, timeout: float | None = None
+    ) -> Any:
+        connection, response = self._request(method, route, payload, timeout)
+        with closing(connection):
+            return json.loads(response.read())
+
+    def status(self, timeout: float | None = CONNECT_TIMEOUT) -> dict[str, Any]:
+        result: dict[str, Any] = self._json("GET", "/status", timeout=timeout)
+        return result
+
+    def query(self, query: Query) -> Iterator[LogBatch]:
+        # Sends the request right away, so a missing server shows up here and not
+        # half way through the output.
+        connection, response = self._request("POST", "/query", query.to_dict())
+        return self._frames(connection, response)
+
+    @staticmethod
+    def _frames(
+        connection: http.client.HTTPConnection, response: http.client.HTTPResponse
+    ) -> Iterator[LogBatch]:
+        with closing(connection):
+            while (frame := read_frame(response)) is not None:
+                yield decode_batch(memoryview(frame))
+
+
+def _alive(pid: int) -> bool:
+    # Signal 0 only checks that the process exists. Elsewhere os.kill would
+    # really signal it, so the status request alone decides there.
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def find_server(directory: Path) -> ServerClient | None:
+    try:
+        state = json.loads(state_path(directory).read_text())
+        client = ServerClient(str(state["host"]), int(state["port"]))
+        pid = int(state.get("pid", 0))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    # A server that exited without cleaning up is found without connecting.
+    if pid and not _alive(pid):
+        return None
+    try:
+        client.status()
+    except (OSError, ValueError):
+        return None
+    return client
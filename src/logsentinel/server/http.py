@@ -0,0 +1,153 @@
+import io
+import json
+import os
+from collections.abc import Sequence
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from logsentinel.models import LogBatch
+from logsentinel.parsers import AUTO, detect_paths, get_parser
+from logsentinel.server.query import Query
+from logsentinel.server.store import LogStore
+from logsentinel.storage.codec import encode_batch, write_frame
+
+HOST = "127.0.0.1"
+PORT = 0
+FRAME_SIZE = 8192
+COLUMNAR_TYPE = "application/x-logsentinel-columnar"
+
+
+class QueryServer(ThreadingHTTPServer):
+    # Answers queries from the store over HTTP on a local port. Each query holds
+    # the store's lock until its answer is sent, so requests are served one
+    # after another. There is no authentication, so only files among or under
+    # the roots it was started with are read for a query.
+    daemon_threads = True
+
+    def __init__(
+        self,
+        store: LogStore,
+        address: tuple[str, int] = (HOST, PORT),
+        roots: Sequence[Path] = (),
+    ):
+        super().__init__(address, _Handler)
+        self.store = store
+        self.roots = [root.resolve() for root in roots]
+        self.queries = 0
+
+    def serves(self, path: Path) -> bool:
+        path = path.resolve()
+        return any(path == root or root in path.parents for root in self.roots)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def run(self, query: Query) -> LogBatch:
+        filters = query.filters()
+        paths = [Path(path) for path in query.paths]
+        for path in paths:
+            if not self.serves(path):
+                raise NotServed(f"file {path} not served")
+        name = detect_paths(paths) if query.format == AUTO else query.format
+        parser = get_parser(name)
+        self.queries += 1
+        try:
+            batch = self.store.query(paths, parser, filters)
+        except ValueError as error:
+            raise InvalidFile(str(error)) from error
+        if query.limit is not None and query.limit < len(batch):
+            batch = batch.take(range(query.limit))
+        return batch
+
+    def status(self) -> dict[str, Any]:
+        store = self.store
+        with store.lock:
+            datasets = [
+                {
+                    "path": str(dataset.path),
+                    "entries": len(dataset),
+                    "bytes": dataset.nbytes,
+                }
+                for dataset in store.datasets.values()
+            ]
+            return {
+                "pid": os.getpid(),
+                "datasets": datasets,
+                "bytes": store.nbytes,
+                "memory_budget": store.memory_budget,
+                "queries": self.queries,
+                "loads": store.loads,
+                "appends": store.appends,
+                "evictions": store.evictions,
+            }
+
+
+class InvalidFile(ValueError):
+    pass
+
+
+class NotServed(ValueError):
+    pass
+
+
+def _frames(batch: LogBatch) -> bytes:
+    # Same framing as the cache and `--output columnar`, so the client decodes a
+    # few thousand entries at a time.
+    stream = io.BytesIO()
+    for start in range(0, len(batch), FRAME_SIZE):
+        write_frame(stream, encode_batch(batch.take(range(start, start + FRAME_SIZE))))
+    return stream.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: QueryServer
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, payload: Any) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def do_GET(self) -> None:
+        if self.path == "/status":
+            self._json(HTTPStatus.OK, self.server.status())
+        else:
+            self._json(HTTPStatus.NOT_FOUND, {"error": f"No route {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/query":
+            self._json(HTTPStatus.NOT_FOUND, {"error": f"No route {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            query = Query.from_dict(json.loads(self.rfile.read(length)))
+            # The answer may share the store's rows, which an append to the
+            # same file would extend, so the lock is held while encoding.
+            with self.server.store.lock:
+                body = _frames(self.server.run(query))
+            self._send(HTTPStatus.OK, body, COLUMNAR_TYPE)
+        except NotServed as error:
+            self._json(HTTPStatus.FORBIDDEN, {"error": str(error)})
+        except FileNotFoundError as error:
+            missing = {"error": f"file {error.filename} not found"}
+            self._json(HTTPStatus.NOT_FOUND, missing)
+        except InvalidFile as error:
+            path = str(error)
+            self._json(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {"error": f"file {path} not valid", "path": path},
+            )
+        except ValueError as error:
+            self._json(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
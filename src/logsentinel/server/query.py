@@ -0,0 +1,105 @@
+import re
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from logsentinel.filters import Filter, LevelFilter, SearchFilter, TimeRangeFilter
+from logsentinel.models import LogLevel
+from logsentinel.parsers import AUTO
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC)
+
+
+def _is_text(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def _is_optional_text(value: Any) -> bool:
+    return value is None or isinstance(value, str)
+
+
+def _is_texts(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _is_limit(value: Any) -> bool:
+    # bool is an int subclass, but true is not a row count.
+    return value is None or (
+        isinstance(value, int) and not isinstance(value, bool) and value >= 0
+    )
+
+
+# What each field must hold, so a malformed request is refused with a 400
+# rather than failing somewhere inside the query.
+_FIELD_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "paths": _is_texts,
+    "format": _is_text,
+    "level": _is_optional_text,
+    "search": _is_texts,
+    "regex": _is_texts,
+    "match_all": lambda value: isinstance(value, bool),
+    "since": _is_optional_text,
+    "until": _is_optional_text,
+    "limit": _is_limit,
+}
+
+
+@dataclass
+class Query:
+    # What a client asks the server for, as sent over the wire. Paths are
+    # absolute, since the server runs in a directory of its own.
+    paths: list[str]
+    format: str = AUTO
+    level: str | None = None
+    search: list[str] = field(default_factory=list)
+    regex: list[str] = field(default_factory=list)
+    match_all: bool = False
+    since: str | None = None
+    until: str | None = None
+    limit: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "Query":
+        try:
+            query = cls(**data)
+        except TypeError as error:
+            raise ValueError(f"Invalid query ({error})") from error
+        for name, check in _FIELD_CHECKS.items():
+            if not check(getattr(query, name)):
+                raise ValueError(f"Invalid query ({name} {getattr(query, name)!r})")
+        if not query.paths:
+            raise ValueError("Invalid query (no paths)")
+        return query
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def filters(self) -> list[Filter]:
+        filters: list[Filter] = []
+        if self.level is not None:
+            try:
+                filters.append(LevelFilter(LogLevel[self.level.upper()]))
+            except KeyError:
+                raise ValueError(f"Invalid level {self.level}") from None
+        if self.search or self.regex:
+            try:
+                filters.append(
+                    SearchFilter(
+                        self.search, patterns=self.regex, match_all=self.match_all
+                    )
+                )
+            except re.error as error:
+                raise ValueError(f"Invalid pattern ({error})") from error
+        if self.since is not None or self.until is not None:
+            filters.append(
+                TimeRangeFilter(_parse_time(self.since), _parse_time(self.until))
+            )
+        return filters
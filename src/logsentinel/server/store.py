@@ -0,0 +1,216 @@
+import heapq
+import io
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Collection, Sequence
+from pathlib import Path
+from threading import RLock
+
+from logsentinel.filters import Filter
+from logsentinel.models import LogBatch
+from logsentinel.parsers import NdjsonParser, Parser, iter_parsed
+from logsentinel.parsers.compression import is_compressed
+from logsentinel.storage import ParseCache
+from logsentinel.storage.fingerprint import Fingerprint, hash_file
+from logsentinel.storage.index import IndexBuilder, PostingIndex
+
+MEMORY_BUDGET = 1024**3
+
+# Rough per-entry cost of the columns and posting lists, on top of the text
+# itself; every character also lands in about one trigram posting.
+_ENTRY_BYTES = 160
+_CHAR_BYTES = 6
+
+
+def _intersect(left: Sequence[int], right: Sequence[int]) -> list[int]:
+    if len(left) > len(right):
+        left, right = right, left
+    return sorted(set(left).intersection(right))
+
+
+class MemoryIndex(PostingIndex):
+    # The on-disk index's posting lists, kept in memory and extended as batches
+    # arrive.
+    def __init__(self) -> None:
+        self._builder = IndexBuilder()
+        self.timestamps = self._builder.timestamps
+        self.timestamps_sorted = True
+        self.levels = self._builder.levels
+        self.tokens = self._builder.tokens
+        self.trigrams = self._builder.trigrams
+        self._by_time: array[int] | None = None
+        self._sorted_times = array("q")
+
+    def add(self, batch: LogBatch) -> None:
+        first = len(self.timestamps)
+        if self.timestamps_sorted and len(batch):
+            follows = not first or self.timestamps[-1] <= batch.timestamps[0]
+            self.timestamps_sorted = follows and batch.timestamps_sorted
+        self._builder.add(batch)
+        self._by_time = None
+
+    def time_candidates(self, start: int | None, end: int | None) -> Sequence[int]:
+        if self.timestamps_sorted:
+            return super().time_candidates(start, end)
+        # Files interleaving several streams get a row order by time, built on
+        # the first time query.
+        if self._by_time is None:
+            timestamps = self.timestamps
+            self._by_time = array(
+                "I", sorted(range(len(timestamps)), key=timestamps.__getitem__)
+            )
+            self._sorted_times = array("q", (timestamps[row] for row in self._by_time))
+        low = 0 if start is None else bisect_left(self._sorted_times, start)
+        high = (
+            len(self._sorted_times)
+            if end is None
+            else bisect_right(self._sorted_times, end)
+        )
+        return sorted(self._by_time[low:high])
+
+
+class Dataset:
+    def __init__(self, path: Path, parser: Parser, fingerprint: Fingerprint) -> None:
+        self.path = path
+        self.parser = parser
+        self.fingerprint = fingerprint
+        self.batch = LogBatch()
+        self.index = MemoryIndex()
+        self.nbytes = 0
+        self.appendable = False
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    def add(self, batch: LogBatch) -> None:
+        self.index.add(batch)
+        self.batch.extend(batch)
+        chars = sum(map(len, batch.messages)) + sum(map(len, batch.raws.values()))
+        self.nbytes += len(batch) * _ENTRY_BYTES + chars * _CHAR_BYTES
+
+    def query(self, filters: Sequence[Filter]) -> LogBatch:
+        candidates: Sequence[int] | None = None
+        for entry_filter in filters:
+            narrowed = entry_filter.candidates(self.index)
+            if narrowed is not None:
+                candidates = (
+                    narrowed if candidates is None else _intersect(candidates, narrowed)
+                )
+        # Without candidates the filters run on the loaded rows directly, and
+        # without filters the rows are handed out as they are: the store's lock
+        # is held until the result has been sent.
+        batch = self.batch if candidates is None else self.batch.take(candidates)
+        # Posting lists only narrow the candidates; the filters decide.
+        for entry_filter in filters:
+            batch = entry_filter.apply_batch(batch)
+        return batch
+
+
+class LogStore:
+    # Parsed files kept in memory with their indexes, for a server answering
+    # repeated queries. Changed files are loaded again on their next query, and
+    # past the memory budget the least recently queried ones are dropped.
+    def __init__(
+        self, cache: ParseCache | None = None, memory_budget: int = MEMORY_BUDGET
+    ) -> None:
+        self.cache = cache
+        self.memory_budget = memory_budget
+        self.datasets: OrderedDict[Path, Dataset] = OrderedDict()
+        self.loads = 0
+        self.appends = 0
+        self.evictions = 0
+        self.lock = RLock()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(dataset.nbytes for dataset in self.datasets.values())
+
+    def _load(self, path: Path, parser: Parser) -> Dataset:
+        dataset = Dataset(path, parser, Fingerprint.of(path))
+        for batch in iter_parsed(parser, path, self.cache):
+            dataset.add(batch)
+        # Appends are only safe to pick up where the loaded bytes end, so a file
+        # that changed while it was parsed is loaded in full next time.
+        dataset.appendable = (
+            isinstance(parser, NdjsonParser)
+            and not is_compressed(path)
+            and dataset.fingerprint.matches(path)
+        )
+        self.loads += 1
+        return dataset
+
+    def _append(self, dataset: Dataset) -> bool:
+        # Lines added to the end of an NDJSON file are parsed on their own; any
+        # other change loads the file again.
+        known, parser = dataset.fingerprint, dataset.parser
+        if not dataset.appendable or not isinstance(parser, NdjsonParser):
+            return False
+        stat = dataset.path.stat()
+        if stat.st_size < known.size:
+            return False
+        if hash_file(dataset.path, known.size) != known.digest:
+            return False
+        with dataset.path.open("rb") as stream:
+            stream.seek(known.size)
+            appended = stream.read(stat.st_size - known.size)
+        # A line still being written is left for the next query.
+        appended = appended[: appended.rfind(b"\n") + 1]
+        for batch in parser.iter_stream(io.BytesIO(appended), dataset.path.name):
+            dataset.add(batch)
+        size = known.size + len(appended)
+        dataset.fingerprint = Fingerprint(
+            size=size, mtime_ns=stat.st_mtime_ns, digest=hash_file(dataset.path, size)
+        )
+        self.appends += 1
+        return True
+
+    def dataset(self, path: Path, parser: Parser) -> Dataset:
+        path = path.resolve()
+        dataset = self.datasets.get(path)
+        fresh = (
+            dataset is not None
+            and type(dataset.parser) is type(parser)
+            and (dataset.fingerprint.matches(path) or self._append(dataset))
+        )
+        if dataset is None or not fresh:
+            dataset = self.datasets[path] = self._load(path, parser)
+        self.datasets.move_to_end(path)
+        return dataset
+
+    def evict(self, keep: Collection[Dataset] = ()) -> None:
+        total = self.nbytes
+        # Oldest first: every query moves its datasets to the end.
+        for path, dataset in list(self.datasets.items()):
+            if total <= self.memory_budget:
+                break
+            if dataset not in keep:
+                del self.datasets[path]
+                total -= dataset.nbytes
+                self.evictions += 1
+
+    def query(
+        self, paths: Sequence[Path], parser: Parser, filters: Sequence[Filter]
+    ) -> LogBatch:
+        with self.lock:
+            datasets = []
+            for path in paths:
+                try:
+                    datasets.append(self.dataset(path, parser))
+                except ValueError as error:
+                    raise ValueError(str(path)) from error
+            self.evict(keep=datasets)
+            results = [dataset.query(filters) for dataset in datasets]
+        if len(results) == 1:
+            return results[0]
+        # Each file keeps the order it was written in and the files are
+        # heap-merged by time, as `parse` does without a server.
+        result = LogBatch()
+        runs = []
+        for batch in results:
+            runs.append(range(len(result), len(result) + len(batch)))
+            result.extend(batch)
+        order = heapq.merge(*runs, key=result.timestamps.__getitem__)
+        merged = result.take(list(order))
+        merged.timestamps_sorted = all(batch.timestamps_sorted for batch in results)
+        return merged
@@ -0,0 +1,31 @@
+from logsentinel.sources.aio import CloudWatchApiSource as CloudWatchApiSource
+from logsentinel.sources.aio import ConnectionPool as ConnectionPool
+from logsentinel.sources.aio import FileSource as FileSource
+from logsentinel.sources.aio import Source as Source
+from logsentinel.sources.aio import StreamSource as StreamSource
+from logsentinel.sources.aio import ingest as ingest
+from logsentinel.sources.aio import iterate as iterate
+from logsentinel.sources.tail import FileFollower as FileFollower
+from logsentinel.sources.tail import InotifyWatcher as InotifyWatcher
+from logsentinel.sources.tail import PollingWatcher as PollingWatcher
+from logsentinel.sources.tail import Watcher as Watcher
+from logsentinel.sources.tail import open_watcher as open_watcher
+from logsentinel.sources.tail import parse_lines as parse_lines
+from logsentinel.sources.tail import tail_batches as tail_batches
+
+__all__ = [
+    "CloudWatchApiSource",
+    "ConnectionPool",
+    "FileFollower",
+    "FileSource",
+    "InotifyWatcher",
+    "PollingWatcher",
+    "Source",
+    "StreamSource",
+    "Watcher",
+    "ingest",
+    "iterate",
+    "open_watcher",
+    "parse_lines",
+    "tail_batches",
+]
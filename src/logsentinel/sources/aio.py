@@ -0,0 +1,352 @@
+import asyncio
+import json
+import ssl
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator, Sequence
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol, TypeVar
+from urllib.parse import urlsplit
+
+from logsentinel.filters import Filter
+from logsentinel.models import LogBatch
+from logsentinel.parsers import (
+    CloudWatchParser,
+    NdjsonParser,
+    Parser,
+    iter_parsed,
+    stream_batches,
+)
+from logsentinel.sources.tail import parse_lines
+from logsentinel.storage import ParseCache
+
+T = TypeVar("T")
+
+QUEUE_SIZE = 16
+READ_SIZE = 1024 * 1024
+POOL_SIZE = 4
+PREFETCH = 2
+API_TARGET = "Logs_20140328"
+
+Emit = Callable[[LogBatch], Awaitable[None]]
+
+
+class Source(Protocol):
+    async def produce(self, emit: Emit, executor: Executor | None) -> None:...
+
+
+def parse_file(parser: Parser, path: Path, cache: ParseCache | None) -> LogBatch:
+    result = LogBatch()
+    for batch in iter_parsed(parser, path, cache):
+        result.extend(batch)
+    return result
+
+
+class FileSource:
+    def __init__(
+        self, path: Path, parser: Parser | None = None, cache: ParseCache | None = None
+    ) -> None:
+        self.path = path
+        self.parser = parser or CloudWatchParser()
+        self.cache = cache
+
+    async def produce(self, emit: Emit, executor: Executor | None) -> None:
+        if executor is not None:
+            # A generator cannot cross into a worker process, so the worker
+            # parses the whole file and ships it back as one columnar batch.
+            loop = asyncio.get_running_loop()
+            parsed = await loop.run_in_executor(
+                executor, parse_file, self.parser, self.path, self.cache
+            )
+            await emit(parsed)
+            return
+        # The parse generator advances one batch at a time on a thread, so a
+        # full queue also pauses the read.
+        batches = iter_parsed(self.parser, self.path, self.cache)
+        while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+            await emit(batch)
+
+
+class StreamSource:
+    def __init__(
+        self,
+        stream: BinaryIO,
+        source: str = "stdin",
+        parser: Parser | None = None,
+    ) -> None:
+        self.stream = stream
+        self.source = source
+        self.parser = parser
+
+    async def produce(self, emit: Emit, executor: Executor | None) -> None:
+        if self.parser is not None:
+            # The stream cannot cross into a worker process, so a known format
+            # is parsed on a thread, one batch at a time as for files.
+            batches = stream_batches(self.parser, self.stream, self.source)
+            while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                await emit(batch)
+            return
+        # Without a format, each line is a JSON event or plain text, as in tail.
+        loop = asyncio.get_running_loop()
+        read = getattr(self.stream, "read1", self.stream.read)
+        partial = b""
+        while chunk := await asyncio.to_thread(read, READ_SIZE):
+            *lines, partial = (partial + chunk).split(b"\n")
+            if lines:
+                batch = await loop.run_in_executor(
+                    executor, parse_lines, NdjsonParser(), lines, self.source
+                )
+                await emit(batch)
+        if partial.strip():
+            await emit(parse_lines(NdjsonParser(), [partial], self.source))
+
+
+class ConnectionPool:
+    def __init__(self, endpoint: str, size: int = POOL_SIZE) -> None:
+        parts = urlsplit(endpoint)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported endpoint: {endpoint}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.path = parts.path or "/"
+        self._ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+
+    async def _exchange(
+        self,
+        connection: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        head: bytes,
+        body: bytes,
+    ) -> tuple[int, bytes, bool]:
+        reader, writer = connection
+        writer.write(head + body)
+        await writer.drain()
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers: dict[str, str] = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "content-length" not in headers:
+            raise ConnectionError("Response without Content-Length")
+        payload = await reader.readexactly(int(headers["content-length"]))
+        return status, payload, headers.get("connection", "").lower() != "close"
+
+    async def post(self, headers: dict[str, str], body: bytes) -> tuple[int, bytes]:
+        lines = [f"POST {self.path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines += [f"Content-Length: {len(body)}", "Connection: keep-alive", "", ""]
+        head = "\r\n".join(lines).encode("latin-1")
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await self._connect()
+            try:
+                status, payload, keep = await self._exchange(connection, head, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+                # The server may have dropped an idle keep-alive connection.
+                connection = await self._connect()
+                status, payload, keep = await self._exchange(connection, head, body)
+            if keep:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+            return status, payload
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            await writer.wait_closed()
+
+
+def decode_page(
+    body: bytes, source: str, token_field: str
+) -> tuple[LogBatch, str | None]:
+    page = json.loads(body)
+    parser = CloudWatchParser()
+    batch = LogBatch()
+    for event in page.get("events", []):
+        parser.append_event(batch, event, source)
+    token = page.get(token_field)
+    return batch, token if isinstance(token, str) else None
+
+
+class CloudWatchApiSource:
+    def __init__(
+        self,
+        endpoint: str,
+        log_group: str,
+        log_streams: Sequence[str] = (),
+        filter_pattern: str | None = None,
+        start_time: int | None = None,
+        end_time: int | None = None,
+        pool_size: int = POOL_SIZE,
+        prefetch: int = PREFETCH,
+    ) -> None:
+        self.endpoint = endpoint
+        self.log_group = log_group
+        self.log_streams = list(log_streams)
+        self.filter_pattern = filter_pattern
+        self.start_time = start_time
+        self.end_time = end_time
+        self.pool_size = pool_size
+        self.prefetch = prefetch
+
+    def _requests(self) -> list[tuple[str, dict[str, Any], str]]:
+        bounds = (("startTime", self.start_time), ("endTime", self.end_time))
+        window = {key: value for key, value in bounds if value is not None}
+        if not self.log_streams:
+            request: dict[str, Any] = {"logGroupName": self.log_group, **window}
+            if self.filter_pattern:
+                request["filterPattern"] = self.filter_pattern
+            return [("FilterLogEvents", request, "nextToken")]
+        return [
+            (
+                "GetLogEvents",
+                {
+                    "logGroupName": self.log_group,
+                    "logStreamName": stream,
+                    "startFromHead": True,
+                    **window,
+                },
+                "nextForwardToken",
+            )
+            for stream in self.log_streams
+        ]
+
+    async def _fetch_pages(
+        self,
+        pool: ConnectionPool,
+        executor: Executor | None,
+        action: str,
+        request: dict[str, Any],
+        token_field: str,
+        pages: "asyncio.Queue[LogBatch | None]",
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        headers = {
+            "Content-Type": "application/x-amz-json-1.1",
+            "X-Amz-Target": f"{API_TARGET}.{action}",
+        }
+        token: str | None = None
+        try:
+            while True:
+                page = {**request, "nextToken": token} if token else request
+                body = json.dumps(page).encode("utf-8")
+                status, payload = await pool.post(headers, body)
+                if status != 200:
+                    raise ConnectionError(f"{action} failed with HTTP {status}")
+                batch, next_token = await loop.run_in_executor(
+                    executor, decode_page, payload, self.log_group, token_field
+                )
+                # Up to `prefetch` decoded pages wait here while the next request
+                # is already in flight.
+                await pages.put(batch)
+                # GetLogEvents repeats the token it was given once it runs dry.
+                if next_token is None or next_token == token:
+                    break
+                token = next_token
+        except asyncio.CancelledError:
+            # Only produce cancels a fetcher, once it has stopped reading pages,
+            # so the queue may never have room for the end marker.
+            raise
+        except Exception:
+            await pages.put(None)
+            raise
+        await pages.put(None)
+
+    async def produce(self, emit: Emit, executor: Executor | None) -> None:
+        pool = ConnectionPool(self.endpoint, self.pool_size)
+        requests = self._requests()
+        pages: asyncio.Queue[LogBatch | None] = asyncio.Queue(
+            max(1, self.prefetch) * len(requests)
+        )
+        fetchers = [
+            asyncio.create_task(
+                self._fetch_pages(pool, executor, action, request, token_field, pages)
+            )
+            for action, request, token_field in requests
+        ]
+        try:
+            remaining = len(fetchers)
+            while remaining:
+                batch = await pages.get()
+                if batch is None:
+                    remaining -= 1
+                elif len(batch):
+                    await emit(batch)
+            await asyncio.gather(*fetchers)
+        finally:
+            for fetcher in fetchers:
+                fetcher.cancel()
+            await asyncio.gather(*fetchers, return_exceptions=True)
+            await pool.close()
+
+
+class _Done:
+    def __init__(self, error: BaseException | None = None) -> None:
+        self.error = error
+
+
+async def ingest(
+    sources: Sequence[Source],
+    filters: Sequence[Filter] = (),
+    queue_size: int = QUEUE_SIZE,
+    executor: Executor | None = None,
+) -> AsyncIterator[LogBatch]:
+    # Producers block on the bounded queue whenever the filters fall behind.
+    queue: asyncio.Queue[LogBatch | _Done] = asyncio.Queue(queue_size)
+
+    async def run(source: Source) -> None:
+        try:
+            await source.produce(queue.put, executor)
+        except Exception as error:
+            await queue.put(_Done(error))
+        else:
+            await queue.put(_Done())
+
+    tasks = [asyncio.create_task(run(source)) for source in sources]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if isinstance(item, _Done):
+                if item.error is not None:
+                    raise item.error
+                remaining -= 1
+                continue
+            for entry_filter in filters:
+                item = entry_filter.apply_batch(item)
+            if len(item):
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def iterate(batches: AsyncIterator[T]) -> Generator[T, None, None]:
+    # Producers only run while the consumer waits for the next item, which is
+    # all the backpressure a synchronous caller needs.
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(batches))
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(batches, "aclose", None)
+        if aclose is not None:
+            loop.run_until_complete(aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
@@ -0,0 +1,249 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol
+
+from logsentinel.filters import Filter
+from logsentinel.models import LogBatch
+from logsentinel.parsers import NdjsonParser
+
+READ_SIZE = 1024 * 1024
+POLL_INTERVAL = 0.1
+MAX_POLL_INTERVAL = 2.0
+
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+
+
+class Watcher(Protocol):
+    def wait(self) -> None:...
+    def activity(self) -> None:...
+    def close(self) -> None:...
+
+
+class PollingWatcher:
+    def __init__(
+        self, interval: float = POLL_INTERVAL, max_interval: float = MAX_POLL_INTERVAL
+    ) -> None:
+        self.interval = interval
+        self.max_interval = max_interval
+        self._current = interval
+
+    def wait(self) -> None:
+        time.sleep(self._current)
+        # Back off while the file stays idle; activity() snaps back.
+        self._current = min(self._current * 2, self.max_interval)
+
+    def activity(self) -> None:
+        self._current = self.interval
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    def __init__(self, path: Path, timeout: float = MAX_POLL_INTERVAL) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watching the directory rather than the file also reports a rotated
+        # file being recreated under the same name.
+        mask = _IN_MODIFY | _IN_ATTRIB | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        directory = os.fsencode(path.resolve().parent)
+        if libc.inotify_add_watch(fd, directory, mask) < 0:
+            error = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(error, "inotify_add_watch failed")
+        self._fd = fd
+        self.timeout = timeout
+
+    def wait(self) -> None:
+        # The timeout is a safety net for filesystems that drop events.
+        readable, _, _ = select.select([self._fd], [], [], self.timeout)
+        if readable:
+            try:
+                while os.read(self._fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def activity(self) -> None:
+        pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def open_watcher(path: Path) -> Watcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher()
+
+
+class FileFollower:
+    def __init__(self, path: Path, offset: int = 0) -> None:
+        self.path = path
+        self.offset = offset
+        self._stream: BinaryIO | None = None
+        self._identity: tuple[int, int] | None = None
+        self._partial = b""
+
+    def seek_last_lines(self, lines: int) -> None:
+        with self.path.open("rb") as stream:
+            end = stream.seek(0, os.SEEK_END)
+            self.offset = end if lines == 0 else 0
+            position, found = end, 0
+            while lines and position > 0:
+                start = max(0, position - READ_SIZE)
+                stream.seek(start)
+                block = stream.read(position - start)
+                index = len(block)
+                while (index := block.rfind(b"\n", 0, index)) >= 0:
+                    # A trailing newline ends the last line, it does not start one.
+                    if start + index == end - 1:
+                        continue
+                    found += 1
+                    if found == lines:
+                        self.offset = start + index + 1
+                        return
+                position = start
+
+    def _open(self) -> bool:
+        try:
+            stream = self.path.open("rb")
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(stream.fileno())
+        self._stream = stream
+        self._identity = (stat.st_dev, stat.st_ino)
+        return True
+
+    def _read_available(self, stream: BinaryIO) -> list[bytes]:
+        stream.seek(self.offset)
+        chunks = [self._partial]
+        # A line longer than one read is gathered until it ends or the file
+        # does, so a partial line only ever stands for the end of the file.
+        while data := stream.read(READ_SIZE):
+            self.offset += len(data)
+            chunks.append(data)
+            if b"\n" in data or len(data) < READ_SIZE:
+                break
+        *lines, self._partial = b"".join(chunks).split(b"\n")
+        return lines
+
+    def read_lines(self) -> list[bytes]:
+        if self._stream is None and not self._open():
+            return []
+        assert self._stream is not None
+        lines = self._read_available(self._stream)
+        if lines:
+            return lines
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            # Rotated away and not recreated yet.
+            return []
+        if (stat.st_dev, stat.st_ino) != self._identity:
+            # The old file is drained, so whatever is left over is its last line.
+            pending = self.flush()
+            self._stream.close()
+            self._stream = None
+            self.offset = 0
+            if self._open():
+                assert self._stream is not None
+                pending.extend(self._read_available(self._stream))
+            return pending
+        if stat.st_size < self.offset:
+            # Truncated in place: start over from the beginning.
+            self.offset = 0
+            self._partial = b""
+            return self._read_available(self._stream)
+        return []
+
+    def flush(self) -> list[bytes]:
+        partial, self._partial = self._partial, b""
+        return [partial] if partial.strip() else []
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+def _is_event(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and isinstance(value.get("timestamp"), int | float)
+        and isinstance(value.get("message"), str)
+    )
+
+
+def parse_lines(
+    parser: NdjsonParser, lines: Sequence[bytes], source: str
+) -> LogBatch:
+    batch = LogBatch()
+    arrival_ms: int | None = None
+    for line in lines:
+        text = line.decode("utf-8", "replace").strip()
+        if not text:
+            continue
+        if text.startswith("{"):
+            try:
+                event = json.loads(text)
+            except ValueError:
+                event = None
+            # NDJSON events keep an explicit level and requestId, as written by
+            # `--output ndjson`.
+            if _is_event(event):
+                parser.append_event(batch, event, source)
+                continue
+        # Plain text lines carry no timestamp of their own: use the time they
+        # were read.
+        if arrival_ms is None:
+            arrival_ms = time.time_ns() // 1_000_000
+        parser.append_event(batch, {"timestamp": arrival_ms, "message": text}, source)
+    return batch
+
+
+def tail_batches(
+    follower: FileFollower,
+    parser: NdjsonParser,
+    filters: Sequence[Filter] = (),
+    watcher: Watcher | None = None,
+) -> Iterator[LogBatch]:
+    source = follower.path.name
+    try:
+        while True:
+            lines = follower.read_lines()
+            if not lines:
+                if watcher is None:
+                    lines = follower.flush()
+                    if not lines:
+                        return
+                else:
+                    watcher.wait()
+                    continue
+            elif watcher is not None:
+                watcher.activity()
+            batch = parse_lines(parser, lines, source)
+            for entry_filter in filters:
+                batch = entry_filter.apply_batch(batch)
+            if len(batch):
+                yield batch
+    finally:
+        follower.close()
+        if watcher is not None:
+            watcher.close()
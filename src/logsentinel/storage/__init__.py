@@ -0,0 +1,27 @@
+from logsentinel.storage.cache import ParseCache as ParseCache
+from logsentinel.storage.cache import default_cache_dir as default_cache_dir
+from logsentinel.storage.codec import decode_batch as decode_batch
+from logsentinel.storage.codec import encode_batch as encode_batch
+from logsentinel.storage.fingerprint import Fingerprint as Fingerprint
+from logsentinel.storage.fingerprint import hash_file as hash_file
+from logsentinel.storage.index import IndexableParser as IndexableParser
+from logsentinel.storage.index import LogIndex as LogIndex
+from logsentinel.storage.index import build_index as build_index
+from logsentinel.storage.index import index_is_fresh as index_is_fresh
+from logsentinel.storage.index import index_path_for as index_path_for
+from logsentinel.storage.index import open_index as open_index
+
+__all__ = [
+    "Fingerprint",
+    "IndexableParser",
+    "LogIndex",
+    "ParseCache",
+    "build_index",
+    "decode_batch",
+    "default_cache_dir",
+    "encode_batch",
+    "hash_file",
+    "index_is_fresh",
+    "index_path_for",
+    "open_index",
+]
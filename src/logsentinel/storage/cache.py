@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+from logsentinel.models import LogBatch
+from logsentinel.storage.codec import (
+    decode_batch,
+    encode_batch,
+    read_frame,
+    write_frame,
+)
+from logsentinel.storage.fingerprint import Fingerprint
+
+if TYPE_CHECKING:
+    from logsentinel.parsers import Parser
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".lsc"
+DEFAULT_MAX_BYTES = 1024**3
+
+_MAGIC = b"LSCACHE\x01"
+
+
+def default_cache_dir() -> Path:
+    configured = os.environ.get("LOGSENTINEL_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "logsentinel"
+
+
+class ParseCache:
+    def __init__(
+        self, directory: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @property
+    def _entries(self) -> Path:
+        return self.directory / "entries"
+
+    def _digest(self, path: Path) -> str:
+        # Entries are keyed by content; a per-path fingerprint lets unchanged files
+        # skip hashing.
+        name = hashlib.blake2b(str(path.resolve()).encode(), digest_size=16)
+        alias = self.directory / "paths" / f"{name.hexdigest()}.json"
+        stat = path.stat()
+        try:
+            known = Fingerprint.from_dict(json.loads(alias.read_text()))
+        except (OSError, ValueError, KeyError):
+            known = None
+        if known and (known.size, known.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return known.digest
+        fingerprint = Fingerprint.of(path)
+        alias.parent.mkdir(parents=True, exist_ok=True)
+        alias.write_text(json.dumps(fingerprint.to_dict()))
+        return fingerprint.digest
+
+    def entry_path(self, parser: "Parser", path: Path) -> Path:
+        key = f"{self._digest(path)}-{type(parser).__name__}-v{CACHE_VERSION}"
+        return self._entries / f"{key}{CACHE_SUFFIX}"
+
+    def iter_batches(self, parser: "Parser", path: Path) -> Iterator[LogBatch]:
+        entry = self.entry_path(parser, path)
+        try:
+            stream = entry.open("rb")
+        except FileNotFoundError:
+            return self._store(parser, path, entry)
+        if stream.read(len(_MAGIC)) != _MAGIC:
+            stream.close()
+            entry.unlink(missing_ok=True)
+            return self._store(parser, path, entry)
+        # Hits refresh the mtime, which is what eviction orders by.
+        os.utime(entry)
+        return self._load(stream)
+
+    def _load(self, stream: BinaryIO) -> Iterator[LogBatch]:
+        with stream:
+            while (data := read_frame(stream)) is not None:
+                yield decode_batch(memoryview(data))
+
+    def _store(self, parser: "Parser", path: Path, entry: Path) -> Iterator[LogBatch]:
+        before = path.stat()
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        temporary = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        stored = False
+        try:
+            with temporary.open("wb") as stream:
+                stream.write(_MAGIC)
+                for batch in parser.iter_batches(path):
+                    write_frame(stream, encode_batch(batch))
+                    yield batch
+            after = path.stat()
+            # A file rewritten while it was parsed no longer matches its digest.
+            unchanged = after.st_size == before.st_size
+            if unchanged and after.st_mtime_ns == before.st_mtime_ns:
+                os.replace(temporary, entry)
+                stored = True
+                self.evict()
+        finally:
+            if not stored:
+                temporary.unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        entries = []
+        for entry in self._entries.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
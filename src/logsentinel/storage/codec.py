@@ -0,0 +1,117 @@
+import json
+import struct
+from array import array
+from itertools import accumulate, islice
+from typing import BinaryIO
+
+from logsentinel.models import LogBatch
+from logsentinel.utils.vector import is_sorted
+
+_LENGTH = struct.Struct("<Q")
+
+
+def _pack_strings(strings: list[str]) -> list[bytes]:
+    offsets = array("Q", accumulate(map(len, strings), initial=0))
+    return [offsets.tobytes(), "".join(strings).encode("utf-8", "surrogatepass")]
+
+
+def _pack_sparse(column: dict[int, str]) -> list[bytes]:
+    return [array("I", column).tobytes(), *_pack_strings(list(column.values()))]
+
+
+def encode_batch(batch: LogBatch) -> bytes:
+    request_ids = {
+        index: request_id
+        for index, request_id in enumerate(batch.request_ids)
+        if request_id is not None
+    }
+    metadata = {index: json.dumps(values) for index, values in batch.metadata.items()}
+    sections = [
+        batch.timestamps.tobytes(),
+        bytes(batch.levels),
+        batch.source_ids.tobytes(),
+        *_pack_strings(batch.messages),
+        *_pack_strings(batch.sources),
+        *_pack_sparse(batch.raws),
+        *_pack_sparse(request_ids),
+        *_pack_sparse(batch.correlation_ids),
+        *_pack_sparse(metadata),
+        bytes([batch.timestamps_sorted]),
+    ]
+    return b"".join(
+        part for section in sections for part in (_LENGTH.pack(len(section)), section)
+    )
+
+
+class _Reader:
+    def __init__(self, buffer: memoryview) -> None:
+        self._buffer = buffer
+        self._position = 0
+
+    def section(self) -> memoryview:
+        (size,) = _LENGTH.unpack_from(self._buffer, self._position)
+        start = self._position + _LENGTH.size
+        self._position = start + size
+        if self._position > len(self._buffer):
+            raise ValueError("Truncated batch")
+        return self._buffer[start:self._position]
+
+    def done(self) -> bool:
+        return self._position == len(self._buffer)
+
+    def numbers(self, typecode: str) -> "array[int]":
+        values = array(typecode)
+        values.frombytes(self.section())
+        return values
+
+    def strings(self) -> list[str]:
+        offsets = self.numbers("Q")
+        text = str(self.section(), "utf-8", "surrogatepass")
+        bounds = map(slice, offsets, islice(offsets, 1, None))
+        return list(map(text.__getitem__, bounds))
+
+    def sparse(self) -> dict[int, str]:
+        indices = self.numbers("I")
+        return dict(zip(indices, self.strings()))
+
+
+def decode_batch(buffer: memoryview) -> LogBatch:
+    reader = _Reader(buffer)
+    batch = LogBatch()
+    batch.timestamps = reader.numbers("q")
+    batch.levels = bytearray(reader.section())
+    batch.source_ids = reader.numbers("I")
+    batch.messages = reader.strings()
+    for source in reader.strings():
+        batch._source_id(source)
+    batch.raws = reader.sparse()
+    request_ids = reader.sparse()
+    batch.request_ids = list(map(request_ids.get, range(len(batch.messages))))
+    batch.correlation_ids = reader.sparse()
+    batch.metadata = {
+        index: json.loads(values) for index, values in reader.sparse().items()
+    }
+    # Frames written before the flag existed end here and are checked once.
+    if reader.done():
+        batch.timestamps_sorted = is_sorted(batch.timestamps)
+    else:
+        batch.timestamps_sorted = bool(reader.section()[0])
+    return batch
+
+
+def write_frame(stream: BinaryIO, data: bytes) -> None:
+    stream.write(_LENGTH.pack(len(data)))
+    stream.write(data)
+
+
+def read_frame(stream: BinaryIO) -> bytes | None:
+    header = stream.read(_LENGTH.size)
+    if not header:
+        return None
+    if len(header) < _LENGTH.size:
+        raise ValueError("Truncated frame")
+    (size,) = _LENGTH.unpack(header)
+    data = stream.read(size)
+    if len(data) < size:
+        raise ValueError("Truncated frame")
+    return data
@@ -0,0 +1,54 @@
+import hashlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+HASH_CHUNK = 1 << 20
+
+
+def _hasher() -> "hashlib.blake2b":
+    return hashlib.blake2b(digest_size=20)
+
+
+def hash_file(path: Path, size: int | None = None) -> str:
+    with path.open("rb") as stream:
+        if size is None:
+            return hashlib.file_digest(stream, _hasher).hexdigest()
+        # Only the first `size` bytes, to tell an append from a rewrite.
+        digest = _hasher()
+        while size > 0 and (chunk := stream.read(min(size, HASH_CHUNK))):
+            digest.update(chunk)
+            size -= len(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    size: int
+    mtime_ns: int
+    digest: str
+
+    @classmethod
+    def of(cls, path: Path) -> "Fingerprint":
+        stat = path.stat()
+        return cls(size=stat.st_size, mtime_ns=stat.st_mtime_ns, digest=hash_file(path))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Fingerprint":
+        return cls(
+            size=int(data["size"]),
+            mtime_ns=int(data["mtime_ns"]),
+            digest=str(data["digest"]),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def matches(self, path: Path) -> bool:
+        stat = path.stat()
+        if stat.st_size != self.size:
+            return False
+        if stat.st_mtime_ns == self.mtime_ns:
+            return True
+        # Same size, new mtime: only a content hash tells a touch from an edit.
+        return hash_file(path) == self.digest
@@ -0,0 +1,371 @@
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from heapq import merge
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Literal, Protocol, runtime_checkable
+
+from logsentinel.models import LogBatch
+from logsentinel.storage.fingerprint import Fingerprint
+from logsentinel.utils.vector import is_sorted, select_range
+
+if TYPE_CHECKING:
+    from logsentinel.filters import Filter
+
+INDEX_SUFFIX = ".lsidx"
+INDEX_VERSION = 1
+
+_MAGIC = b"LSIDX\x00\x00\x01"
+_PREAMBLE = struct.Struct("<8sQ")
+_TOKEN = re.compile(r"\w+")
+_ALIGNMENT = 8
+
+
+@runtime_checkable
+class IndexableParser(Protocol):
+    def iter_event_spans(
+        self, path: Path
+    ) -> Iterator[tuple[dict[str, Any], str, int, int]]:...
+
+    def append_event(
+        self, batch: LogBatch, event: dict[str, Any], source: str
+    ) -> None:...
+
+
+def index_path_for(path: Path) -> Path:
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[position:position + 3] for position in range(len(text) - 2)}
+
+
+def _intersect(left: Sequence[int], right: Sequence[int]) -> list[int]:
+    if len(left) > len(right):
+        left, right = right, left
+    return sorted(set(left).intersection(right))
+
+
+class _PostingTable(Protocol):
+    def get(self, key: str) -> Sequence[int] | None:...
+
+    def items(self) -> Iterable[tuple[str, Sequence[int]]]:...
+
+
+class PostingIndex:
+    # Lookups shared by the on-disk index and the server's in-memory store;
+    # filters narrow their candidates through them.
+    timestamps: "array[int] | memoryview"
+    timestamps_sorted: bool
+    levels: _PostingTable
+    tokens: _PostingTable
+    trigrams: _PostingTable
+
+    def level_candidates(self, levels: Sequence[int]) -> list[int]:
+        return list(merge(*(self.levels.get(str(level)) or () for level in levels)))
+
+    def time_candidates(self, start: int | None, end: int | None) -> Sequence[int]:
+        return select_range(self.timestamps, start, end, self.timestamps_sorted)
+
+    def substring_candidates(self, folded: str) -> list[int] | None:
+        if len(folded) >= 3:
+            postings = sorted(
+                (
+                    self.trigrams.get(trigram) or ()
+                    for trigram in _trigrams(folded)
+                ),
+                key=len,
+            )
+            result: list[int] = list(postings[0])
+            for posting in postings[1:]:
+                if not result:
+                    break
+                result = _intersect(result, posting)
+            return result
+        if _TOKEN.fullmatch(folded):
+            # A run of word characters can only occur inside a single token.
+            matched: set[int] = set()
+            for token, posting in self.tokens.items():
+                if folded in token:
+                    matched.update(posting)
+            return sorted(matched)
+        return None
+
+
+class _TermTable:
+    def __init__(
+        self,
+        keys: memoryview,
+        key_offsets: memoryview,
+        posting_offsets: memoryview,
+        postings: memoryview,
+    ) -> None:
+        self._keys = keys
+        self._key_offsets = key_offsets
+        self._posting_offsets = posting_offsets
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self._key_offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        start, end = self._key_offsets[position], self._key_offsets[position + 1]
+        return bytes(self._keys[start:end]).decode("utf-8", "surrogatepass")
+
+    def _postings_at(self, position: int) -> memoryview:
+        start = self._posting_offsets[position]
+        return self._postings[start:self._posting_offsets[position + 1]]
+
+    def get(self, key: str) -> Sequence[int]:
+        position = bisect_left(self, key)
+        if position < len(self) and self[position] == key:
+            return self._postings_at(position)
+        return ()
+
+    def items(self) -> Iterator[tuple[str, Sequence[int]]]:
+        for position in range(len(self)):
+            yield self[position], self._postings_at(position)
+
+
+def _table_sections(
+    name: str, postings: dict[str, "array[int]"]
+) -> list[tuple[str, bytes]]:
+    keys = bytearray()
+    key_offsets = array("Q", [0])
+    posting_offsets = array("Q", [0])
+    lists = array("I")
+    for key in sorted(postings):
+        keys += key.encode("utf-8", "surrogatepass")
+        key_offsets.append(len(keys))
+        lists.extend(postings[key])
+        posting_offsets.append(len(lists))
+    return [
+        (f"{name}.keys", bytes(keys)),
+        (f"{name}.key_offsets", key_offsets.tobytes()),
+        (f"{name}.posting_offsets", posting_offsets.tobytes()),
+        (f"{name}.postings", lists.tobytes()),
+    ]
+
+
+class IndexBuilder:
+    def __init__(self) -> None:
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.timestamps = array("q")
+        self.source_ids = array("I")
+        self.sources: dict[str, int] = {}
+        self.levels: dict[str, array[int]] = {}
+        self.tokens: dict[str, array[int]] = {}
+        self.trigrams: dict[str, array[int]] = {}
+
+    @staticmethod
+    def _post(postings: dict[str, "array[int]"], keys: set[str], ordinal: int) -> None:
+        for key in keys:
+            posting = postings.get(key)
+            if posting is None:
+                posting = postings[key] = array("I")
+            posting.append(ordinal)
+
+    def add(self, batch: LogBatch) -> None:
+        first = len(self.timestamps)
+        self.timestamps.extend(batch.timestamps)
+        source_ids = [
+            self.sources.setdefault(source, len(self.sources))
+            for source in batch.sources
+        ]
+        self.source_ids.extend(source_ids[source_id] for source_id in batch.source_ids)
+        for position, message in enumerate(batch.messages):
+            ordinal = first + position
+            text = message.casefold()
+            if position in batch.metadata:
+                values = batch.metadata[position].values()
+                strings = [value for value in values if isinstance(value, str)]
+                text = "\n".join([text, *(value.casefold() for value in strings)])
+            self._post(self.levels, {str(batch.levels[position])}, ordinal)
+            self._post(self.tokens, set(_TOKEN.findall(text)), ordinal)
+            self._post(self.trigrams, _trigrams(text), ordinal)
+
+    def write(self, path: Path, fingerprint: Fingerprint) -> None:
+        sections = [
+            ("offsets", self.offsets.tobytes()),
+            ("lengths", self.lengths.tobytes()),
+            ("timestamps", self.timestamps.tobytes()),
+            ("source_ids", self.source_ids.tobytes()),
+            *_table_sections("levels", self.levels),
+            *_table_sections("tokens", self.tokens),
+            *_table_sections("trigrams", self.trigrams),
+        ]
+        layout: dict[str, list[int]] = {}
+        offset = 0
+        for name, data in sections:
+            offset = _align(offset)
+            layout[name] = [offset, len(data)]
+            offset += len(data)
+        header = json.dumps({
+            "version": INDEX_VERSION,
+            "byteorder": sys.byteorder,
+            "fingerprint": fingerprint.to_dict(),
+            "count": len(self.timestamps),
+            "sources": list(self.sources),
+            "timestamps_sorted": is_sorted(self.timestamps),
+            "sections": layout,
+        }).encode("utf-8")
+        base = _align(_PREAMBLE.size + len(header))
+        temporary = path.with_name(path.name + ".tmp")
+        with temporary.open("wb") as stream:
+            stream.write(_PREAMBLE.pack(_MAGIC, len(header)))
+            stream.write(header)
+            for name, data in sections:
+                stream.seek(base + layout[name][0])
+                stream.write(data)
+        os.replace(temporary, path)
+
+
+def build_index(
+    parser: IndexableParser, path: Path, batch_size: int = 4096
+) -> Path:
+    fingerprint = Fingerprint.of(path)
+    builder = IndexBuilder()
+    batch = LogBatch()
+    for event, source, start, end in parser.iter_event_spans(path):
+        parser.append_event(batch, event, source)
+        builder.offsets.append(start)
+        builder.lengths.append(end - start)
+        if len(batch) >= batch_size:
+            builder.add(batch)
+            batch = LogBatch()
+    builder.add(batch)
+    index_path = index_path_for(path)
+    builder.write(index_path, fingerprint)
+    return index_path
+
+
+class LogIndex(PostingIndex):
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stream = path.open("rb")
+        self._views: list[memoryview] = []
+        try:
+            self._mmap = mmap.mmap(self._stream.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, header_size = _PREAMBLE.unpack_from(self._mmap, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"Not a logsentinel index: {path}")
+            header = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_size])
+        except (ValueError, struct.error) as error:
+            self._stream.close()
+            raise ValueError(f"Unreadable index: {path}") from error
+        if header["version"] != INDEX_VERSION or header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"Incompatible index: {path}")
+        self.fingerprint = Fingerprint.from_dict(header["fingerprint"])
+        self.count: int = header["count"]
+        self.sources: list[str] = header["sources"]
+        self.timestamps_sorted: bool = header["timestamps_sorted"]
+        self._layout: dict[str, list[int]] = header["sections"]
+        self._base = _align(_PREAMBLE.size + header_size)
+        self._buffer = memoryview(self._mmap)
+        self.offsets = self._section("offsets", "Q")
+        self.lengths = self._section("lengths", "I")
+        self.timestamps = self._section("timestamps", "q")
+        self.source_ids = self._section("source_ids", "I")
+        self.levels = self._table("levels")
+        self.tokens = self._table("tokens")
+        self.trigrams = self._table("trigrams")
+
+    def _section(self, name: str, format: Literal["B", "I", "Q", "q"]) -> memoryview:
+        start, size = self._layout[name]
+        view = self._buffer[self._base + start:self._base + start + size]
+        cast = view.cast(format)
+        self._views.extend((view, cast))
+        return cast
+
+    def _table(self, name: str) -> _TermTable:
+        return _TermTable(
+            self._section(f"{name}.keys", "B"),
+            self._section(f"{name}.key_offsets", "Q"),
+            self._section(f"{name}.posting_offsets", "Q"),
+            self._section(f"{name}.postings", "I"),
+        )
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if hasattr(self, "_buffer"):
+            self._buffer.release()
+        self._mmap.close()
+        self._stream.close()
+
+    def __enter__(self) -> "LogIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def query(
+        self, parser: IndexableParser, path: Path, filters: Sequence["Filter"]
+    ) -> LogBatch:
+        candidates: Sequence[int] | None = None
+        for entry_filter in filters:
+            narrowed = entry_filter.candidates(self)
+            if narrowed is not None:
+                candidates = (
+                    narrowed if candidates is None else _intersect(candidates, narrowed)
+                )
+        ordinals = range(self.count) if candidates is None else candidates
+        batch = LogBatch()
+        if not ordinals:
+            return batch
+        with path.open("rb") as stream:
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                for ordinal in ordinals:
+                    start = self.offsets[ordinal]
+                    event = json.loads(source[start:start + self.lengths[ordinal]])
+                    parser.append_event(
+                        batch, event, self.sources[self.source_ids[ordinal]]
+                    )
+        # Posting lists only narrow the candidates; the filters decide.
+        for entry_filter in filters:
+            batch = entry_filter.apply_batch(batch)
+        return batch
+
+
+def index_is_fresh(path: Path) -> bool:
+    index_path = index_path_for(path)
+    if not index_path.exists():
+        return False
+    try:
+        with LogIndex(index_path) as index:
+            return index.fingerprint.matches(path)
+    except ValueError:
+        return False
+
+
+def open_index(parser: IndexableParser, path: Path) -> LogIndex | None:
+    index_path = index_path_for(path)
+    if not index_path.exists():
+        return None
+    try:
+        index = LogIndex(index_path)
+    except ValueError:
+        return LogIndex(build_index(parser, path))
+    if index.fingerprint.matches(path):
+        return index
+    index.close()
+    return LogIndex(build_index(parser, path))
@@ -0,0 +1,112 @@
+import heapq
+import tempfile
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from itertools import count, islice
+from operator import attrgetter
+from typing import BinaryIO, cast
+
+from logsentinel.models import LogEntry
+from logsentinel.models.log_batch import iter_batches
+from logsentinel.storage.codec import (
+    decode_batch,
+    encode_batch,
+    read_frame,
+    write_frame,
+)
+
+LATENESS = timedelta(0)
+RUN_SIZE = 200_000
+FAN_IN = 64
+FRAME_SIZE = 8192
+
+_timestamp = attrgetter("timestamp")
+
+
+def merge_by_timestamp(streams: Iterable[Iterable[LogEntry]]) -> Iterator[LogEntry]:
+    # Only the head of each stream sits in the heap: O(n log k) for k streams.
+    return heapq.merge(*streams, key=_timestamp)
+
+
+class ReorderBuffer:
+    # Puts a stream that is only slightly out of order back in order. An entry is
+    # held until the newest timestamp seen is `lateness` past it, so memory is
+    # bounded by how many entries arrive within that window.
+    def __init__(self, lateness: timedelta = LATENESS) -> None:
+        self.lateness = lateness
+        self.late = 0
+
+    def reorder(self, entries: Iterable[LogEntry]) -> Iterator[LogEntry]:
+        heap: list[tuple[datetime, int, LogEntry]] = []
+        sequence = count()
+        newest: datetime | None = None
+        horizon: datetime | None = None
+        released: datetime | None = None
+        for entry in entries:
+            timestamp = entry.timestamp
+            if released is not None and timestamp < released:
+                # Older than what was already let through, so there is no place
+                # left for it; it goes out now rather than being dropped.
+                self.late += 1
+                yield entry
+                continue
+            heapq.heappush(heap, (timestamp, next(sequence), entry))
+            if newest is None or timestamp > newest:
+                newest = timestamp
+                horizon = newest - self.lateness
+            while heap and heap[0][0] <= cast(datetime, horizon):
+                released, _, ready = heapq.heappop(heap)
+                yield ready
+        while heap:
+            yield heapq.heappop(heap)[2]
+
+
+def _spill(entries: Iterable[LogEntry]) -> BinaryIO:
+    # Anonymous temp files are unlinked as soon as they are created, so nothing
+    # is left behind if the merge is abandoned half way.
+    stream = cast(BinaryIO, tempfile.TemporaryFile(prefix="logsentinel-"))
+    for batch in iter_batches(entries, FRAME_SIZE):
+        write_frame(stream, encode_batch(batch))
+    stream.seek(0)
+    return stream
+
+
+def _read_run(stream: BinaryIO) -> Iterator[LogEntry]:
+    with stream:
+        while (frame := read_frame(stream)) is not None:
+            yield from decode_batch(memoryview(frame))
+
+
+def _add_run(levels: list[list[BinaryIO]], run: BinaryIO, fan_in: int) -> None:
+    # Runs are merged fan_in at a time into one run a level up, so each entry is
+    # rewritten once per level and at most fan_in files per level stay open.
+    for level in levels:
+        level.append(run)
+        if len(level) < fan_in:
+            return
+        run = _spill(merge_by_timestamp([_read_run(stream) for stream in level]))
+        level.clear()
+    levels.append([run])
+
+
+def external_sort(
+    entries: Iterable[LogEntry], run_size: int = RUN_SIZE, fan_in: int = FAN_IN
+) -> Iterator[LogEntry]:
+    # Sorts runs of run_size entries in memory, spills them to temp files and
+    # merges the runs back, one frame of each at a time. Entries with equal
+    # timestamps keep their input order.
+    levels: list[list[BinaryIO]] = [[]]
+    iterator = iter(entries)
+    last: list[LogEntry] = []
+    while run := list(islice(iterator, run_size)):
+        if last:
+            _add_run(levels, _spill(last), fan_in)
+        run.sort(key=_timestamp)
+        last = run
+    # Higher levels hold earlier input, so they go first to keep the merge stable.
+    streams: list[Iterable[LogEntry]] = [
+        _read_run(stream) for level in reversed(levels) for stream in level
+    ]
+    # The final run never needs to touch the disk.
+    streams.append(last)
+    yield from merge_by_timestamp(streams)
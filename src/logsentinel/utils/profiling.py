@@ -0,0 +1,186 @@
+import cProfile
+import sys
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from types import FrameType
+from typing import Any, TypeVar
+
+resource: Any
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows has no getrusage
+    resource = None
+
+T = TypeVar("T")
+
+# getrusage is a system call; stages that yield single entries only pay for it
+# every so often.
+RSS_SAMPLE = 256
+SAMPLE_INTERVAL = 0.001
+
+
+def peak_rss() -> int:
+    if resource is None:  # pragma: no cover
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+@dataclass
+class StageStats:
+    name: str
+    seconds: float = 0.0
+    entries: int = 0
+    bytes: int = 0
+    calls: int = 0
+    peak_rss: int = 0
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+Hook = Callable[[StageStats], None]
+
+
+def _one(item: object) -> int:
+    return 1
+
+
+class StackSampler:
+    # Samples one thread's Python stack from a background thread and counts
+    # them in the collapsed format flamegraph.pl and speedscope read.
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _collapse(frame: FrameType | None) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            location = f"{Path(code.co_filename).name}:{code.co_firstlineno}"
+            names.append(f"{code.co_qualname} ({location})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                self.counts[self._collapse(frame)] += 1
+
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as stream:
+            for stack, count in self.counts.most_common():
+                stream.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    # Nothing here runs unless a caller wraps a stage, so a pipeline built
+    # without a profiler pays nothing.
+    def __init__(
+        self,
+        hooks: Iterable[Hook] = (),
+        pstats_path: Path | None = None,
+        stacks_path: Path | None = None,
+    ) -> None:
+        self.hooks = list(hooks)
+        self.pstats_path = pstats_path
+        self.stacks_path = stacks_path
+        self.stages: dict[str, StageStats] = {}
+        # Time spent in nested stages, per open stage: a stage pulling from an
+        # upstream wrapped stage is only charged for its own work.
+        self._nested: list[float] = []
+        self._cprofile: cProfile.Profile | None = None
+        self._sampler: StackSampler | None = None
+
+    def stage(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        return stats
+
+    def _record(self, stats: StageStats, elapsed: float) -> None:
+        nested = self._nested.pop()
+        stats.seconds += elapsed - nested
+        if self._nested:
+            self._nested[-1] += elapsed
+        stats.calls += 1
+        if stats.calls % RSS_SAMPLE == 1:
+            stats.peak_rss = max(stats.peak_rss, peak_rss())
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[StageStats]:
+        stats = self.stage(name)
+        self._nested.append(0.0)
+        start = perf_counter()
+        try:
+            yield stats
+        finally:
+            self._record(stats, perf_counter() - start)
+
+    def wrap(
+        self, name: str, items: Iterable[T], count: Callable[[T], int] = _one
+    ) -> Iterator[T]:
+        # The stage is registered now, so stages are listed in pipeline order.
+        return self._wrap(self.stage(name), iter(items), count)
+
+    def _wrap(
+        self, stats: StageStats, iterator: Iterator[T], count: Callable[[T], int]
+    ) -> Iterator[T]:
+        while True:
+            self._nested.append(0.0)
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._record(stats, perf_counter() - start)
+            stats.entries += count(item)
+            yield item
+
+    def start(self) -> None:
+        if self.stacks_path is not None:
+            self._sampler = StackSampler()
+            self._sampler.start()
+        if self.pstats_path is not None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def finish(self) -> list[StageStats]:
+        if self._cprofile is not None and self.pstats_path is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.pstats_path)
+        if self._sampler is not None and self.stacks_path is not None:
+            self._sampler.stop()
+            self._sampler.write(self.stacks_path)
+        stages = list(self.stages.values())
+        for stats in stages:
+            for hook in self.hooks:
+                hook(stats)
+        return stages
@@ -0,0 +1,114 @@
+import math
+from bisect import bisect_right
+from itertools import accumulate
+
+COMPRESSION = 200
+BUFFER_FACTOR = 5
+
+
+class TDigest:
+    # Merging t-digest (Dunning & Ertl): centroids are small near the tails and
+    # large in the middle, so extreme quantiles stay accurate while the digest
+    # never holds more than a few hundred centroids.
+    __slots__ = ("compression", "means", "weights", "count", "min", "max", "_buffer")
+
+    def __init__(self, compression: float = COMPRESSION) -> None:
+        self.compression = compression
+        self.means: list[float] = []
+        self.weights: list[float] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: list[tuple[float, float]] = []
+
+    def __len__(self) -> int:
+        return int(self.count)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        self._buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= BUFFER_FACTOR * self.compression:
+            self._compress()
+
+    def merge(self, other: "TDigest") -> None:
+        other._compress()
+        self._buffer.extend(zip(other.means, other.weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _k(self, quantile: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * quantile - 1)
+
+    def _quantile_limit(self, k: float) -> float:
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted([*zip(self.means, self.weights), *self._buffer])
+        self._buffer.clear()
+        total = self.count
+        means: list[float] = []
+        weights: list[float] = []
+        mean, weight = points[0]
+        done = 0.0
+        limit = self._quantile_limit(self._k(0.0) + 1)
+        for value, value_weight in points[1:]:
+            if (done + weight + value_weight) / total <= limit:
+                weight += value_weight
+                mean += (value - mean) * value_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = self._quantile_limit(self._k(done / total) + 1)
+                mean, weight = value, value_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means = means
+        self.weights = weights
+
+    def quantile(self, quantile: float) -> float:
+        if not 0 <= quantile <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        self._compress()
+        if not self.means:
+            return math.nan
+        if len(self.means) == 1:
+            return self.means[0]
+        target = quantile * self.count
+        # Each centroid's mean sits at the middle of its weight.
+        centers = [
+            done + weight / 2
+            for done, weight in zip(accumulate(self.weights, initial=0), self.weights)
+        ]
+        if target <= centers[0]:
+            return self._between(self.min, 0, self.means[0], centers[0], target)
+        if target >= centers[-1]:
+            return self._between(
+                self.means[-1], centers[-1], self.max, self.count, target
+            )
+        index = bisect_right(centers, target) - 1
+        return self._between(
+            self.means[index],
+            centers[index],
+            self.means[index + 1],
+            centers[index + 1],
+            target,
+        )
+
+    @staticmethod
+    def _between(
+        low: float, low_rank: float, high: float, high_rank: float, target: float
+    ) -> float:
+        if high_rank <= low_rank:
+            return low
+        return low + (high - low) * (target - low_rank) / (high_rank - low_rank)
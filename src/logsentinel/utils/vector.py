@@ -0,0 +1,62 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from itertools import compress, islice
+from operator import le
+from typing import Any
+
+np: Any
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+
+def has_numpy() -> bool:
+    return np is not None
+
+
+def level_table(accepted: set[int]) -> bytes:
+    return bytes(1 if value in accepted else 0 for value in range(256))
+
+
+def select_levels(levels: bytearray, table: bytes) -> Sequence[int]:
+    if np is not None:
+        lookup = np.frombuffer(table, dtype=np.uint8)
+        mask = lookup[np.frombuffer(levels, dtype=np.uint8)]
+        selected: list[int] = np.flatnonzero(mask).tolist()
+        return selected
+    # bytes.translate maps every level byte to 0/1 in C, compress keeps the hits.
+    return list(compress(range(len(levels)), levels.translate(table)))
+
+
+def is_sorted(timestamps: "array[int] | memoryview") -> bool:
+    if np is not None:
+        values = np.frombuffer(timestamps, dtype=np.int64)
+        return bool(np.all(values[1:] >= values[:-1]))
+    return all(map(le, timestamps, islice(timestamps, 1, None)))
+
+
+def select_range(
+    timestamps: "array[int] | memoryview",
+    start: int | None,
+    end: int | None,
+    presorted: bool,
+) -> Sequence[int]:
+    if presorted:
+        low = 0 if start is None else bisect_left(timestamps, start)
+        high = len(timestamps) if end is None else bisect_right(timestamps, end)
+        return range(low, max(low, high))
+    low_bound = -(2**63) if start is None else start
+    high_bound = 2**63 - 1 if end is None else end
+    if np is not None:
+        values = np.frombuffer(timestamps, dtype=np.int64)
+        in_range: list[int] = np.flatnonzero(
+            (values >= low_bound) & (values <= high_bound)
+        ).tolist()
+        return in_range
+    return [
+        index
+        for index, timestamp in enumerate(timestamps)
+        if low_bound <= timestamp <= high_bound
+    ]
@@ -1,4 +1,7 @@
+import json
+import threading
 from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
@@ -6,6 +9,11 @@ import pytest
 from logsentinel.models import LogEntry, LogLevel
 from logsentinel.parsers import CloudWatchParser
 
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path_factory, monkeypatch):
+    monkeypatch.setenv("LOGSENTINEL_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+
+
 @pytest.fixture
 def sample_entry():
     return LogEntry(
@@ -114,3 +122,91 @@ def entries_for_search_filter(make_log_entry):
         metadata_match_entry,
         no_match_entry,
     ]
+
+
+@pytest.fixture
+def write_export(tmp_path):
+    def _write(name: str, group: str, events: list[tuple[int, str]]) -> Path:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "logGroupName": group,
+            "logEvents": [
+                {"id": str(index), "timestamp": timestamp, "message": message}
+                for index, (timestamp, message) in enumerate(events)
+            ],
+        }))
+        return path
+
+    return _write
+
+
+@pytest.fixture
+def export_dir(tmp_path, write_export):
+    write_export("exports/a.json", "/aws/lambda/a", [
+        (1705312245000, "[INFO] a first"),
+        (1705312247000, "[ERROR] a second"),
+    ])
+    write_export("exports/b.json", "/aws/lambda/b", [
+        (1705312246000, "[ERROR] b first"),
+        (1705312244000, "[DEBUG] b out of order"),
+    ])
+    return tmp_path / "exports"
+
+
+class _LogsApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        action = self.headers["X-Amz-Target"].rpartition(".")[2]
+        self.server.requests.append((action, request))
+        events = self.server.streams.get(request.get("logStreamName"), [])
+        if action == "FilterLogEvents":
+            events = [event for stream in self.server.streams.values() for event in stream]
+        start = int(request.get("nextToken") or 0)
+        page = {"events": events[start:start + self.server.page_size]}
+        following = start + self.server.page_size
+        if action == "GetLogEvents":
+            # Like the real API, the last page hands back the token it was given.
+            page["nextForwardToken"] = str(min(following, len(events)))
+        elif following < len(events):
+            page["nextToken"] = str(following)
+        body = json.dumps(page).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def logs_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LogsApi)
+    server.daemon_threads = True
+    server.connections = 0
+    server.status = 200
+    server.requests = []
+    server.page_size = 2
+    server.streams = {
+        "stream-a": [
+            {"timestamp": 1705312245000 + index, "message": f"[INFO] a{index}"}
+            for index in range(5)
+        ],
+        "stream-b": [
+            {"timestamp": 1705312246000 + index, "message": f"[ERROR] b{index}"}
+            for index in range(3)
+        ],
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -1,3 +1,7 @@
+import gzip
+import json
+import os
+import threading
 from pathlib import Path
 from typer.testing import CliRunner
 from logsentinel.cli import app
@@ -7,4 +11,436 @@ path = Path(__file__).parent.parent / "fixtures" / "cloudwatch_sample.json"
 def test_parse_command():
     result = runner.invoke(app, ["parse", str(path)])
     assert result.exit_code == 0
-    assert "Timestamp" in result.output
\ No newline at end of file
+    assert "Timestamp" in result.output
+
+def test_parse_command_streams_filtered_rows():
+    result = runner.invoke(app, ["parse", str(path), "--level", "ERROR", "--search", "exception"])
+    assert result.exit_code == 0
+    assert "CRITICAL" in result.output
+    assert "Database connection failed" not in result.output
+
+
+def test_parse_command_reports_invalid_file(tmp_path):
+    log_file = tmp_path / "broken.json"
+    log_file.write_text('{"logEvents": [{"timestamp": 1705312245123, "message": "[INFO] ok"}, {')
+    result = runner.invoke(app, ["parse", str(log_file)])
+    assert result.exit_code == 1
+
+
+def test_parse_command_directory_with_jobs(export_dir):
+    result = runner.invoke(app, ["parse", str(export_dir), "--jobs", "2", "--level", "ERROR"])
+    assert result.exit_code == 0
+    assert "b first" in result.output
+    assert "a first" not in result.output
+    assert result.output.index("b first") < result.output.index("a second")
+
+
+def test_index_command_formats(tmp_path):
+    lines = json.dumps({"timestamp": 1705312248000, "message": "[ERROR] from ndjson"}) + "\n"
+    (tmp_path / "c.ndjson").write_text(lines)
+    result = runner.invoke(app, ["index", str(tmp_path / "c.ndjson")])
+    assert result.exit_code == 0
+    assert "Indexed 1 entries" in result.output
+    result = runner.invoke(app, ["index", str(tmp_path / "c.ndjson"), "--format", "cloudwatch", "--force"])
+    assert result.exit_code == 1
+    assert "c.ndjson not valid" in result.output
+    (tmp_path / "lambda.log").write_text("START RequestId: abc Version: $LATEST\n")
+    (tmp_path / "b.json.gz").write_bytes(gzip.compress(path.read_bytes()))
+    result = runner.invoke(app, ["index", str(tmp_path), "--force"])
+    assert result.exit_code == 0
+    assert "Skipping {}: compressed files cannot be indexed".format(tmp_path / "b.json.gz") in result.output
+    assert "Skipping {}: lambda-text input cannot be indexed".format(tmp_path / "lambda.log") in result.output
+    assert "Indexed 1 entries from {}".format(tmp_path / "c.ndjson") in result.output
+
+
+def test_parse_command_glob_without_match(tmp_path):
+    result = runner.invoke(app, ["parse", str(tmp_path / "*.json")])
+    assert result.exit_code == 1
+
+
+def test_index_command_then_parse_uses_index(tmp_path, write_export):
+    log_file = write_export("indexed.json", "/aws/lambda/app", [
+        (1705312245000, "[INFO] all good"),
+        (1705312246000, "[ERROR] disk full"),
+    ])
+    result = runner.invoke(app, ["index", str(log_file)])
+    assert result.exit_code == 0
+    assert "Indexed 2 entries" in result.output
+    assert (tmp_path / "indexed.json.lsidx").exists()
+
+    result = runner.invoke(app, ["index", str(log_file)])
+    assert "already indexed" in result.output
+
+    result = runner.invoke(app, ["parse", str(tmp_path / "*"), "--search", "disk"])
+    assert result.exit_code == 0
+    assert "disk full" in result.output
+    assert "all good" not in result.output
+
+
+def test_parse_command_reuses_cache(tmp_path, write_export):
+    log_file = write_export("cached.json", "/aws/lambda/app", [
+        (1705312245000, "[ERROR] disk full"),
+    ])
+    cache_dir = tmp_path / "cache"
+    for _ in range(2):
+        result = runner.invoke(app, ["parse", str(log_file), "--cache-dir", str(cache_dir)])
+        assert result.exit_code == 0
+        assert "disk full" in result.output
+    assert len(list((cache_dir / "entries").iterdir())) == 1
+
+    result = runner.invoke(
+        app, ["parse", str(log_file), "--cache-dir", str(tmp_path / "none"), "--no-cache"]
+    )
+    assert result.exit_code == 0
+    assert not (tmp_path / "none").exists()
+
+
+def test_tail_command_prints_last_lines(tmp_path):
+    log_file = tmp_path / "app.log"
+    log_file.write_text(
+        '{"timestamp": 1705312245000, "message": "[INFO] first"}\n'
+        '{"timestamp": 1705312246000, "message": "[ERROR] second"}\n'
+        "[ERROR] third\n"
+    )
+    result = runner.invoke(app, ["tail", str(log_file), "-n", "2", "--level", "ERROR"])
+    assert result.exit_code == 0
+    assert "second" in result.output
+    assert "third" in result.output
+    assert "first" not in result.output
+
+
+def test_tail_command_keeps_the_level_of_ndjson_lines(tmp_path):
+    log_file = tmp_path / "app.log"
+    log_file.write_text('{"timestamp": 1705312245000, "message": "quiet text", "level": "ERROR"}\n')
+    result = runner.invoke(app, ["tail", str(log_file)])
+    assert result.exit_code == 0
+    assert "ERROR" in result.output
+    assert "UNKNOWN" not in result.output
+
+
+def test_tail_command_rejects_compressed_files(tmp_path):
+    log_file = tmp_path / "app.log.gz"
+    log_file.write_bytes(gzip.compress(b"[ERROR] inside\n"))
+    result = runner.invoke(app, ["tail", str(log_file)])
+    assert result.exit_code == 1
+    assert "cannot tail compressed file" in result.output
+
+
+def test_ingest_command_decompresses_stdin():
+    result = runner.invoke(app, ["ingest", "-", "-o", "ndjson"], input=gzip.compress(b"[ERROR] zipped\n"))
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["message"] == "[ERROR] zipped"
+
+
+def test_ingest_command_parses_a_piped_export():
+    export = json.dumps(json.loads(path.read_text()), indent=2)
+    expected = [json.loads(line)["message"] for line in runner.invoke(app, ["parse", "-", "-o", "ndjson"], input=export).stdout.splitlines()]
+    assert len(expected) > 1
+    for args in ([], ["--format", "cloudwatch"]):
+        result = runner.invoke(app, ["ingest", "-", "-o", "ndjson", *args], input=export)
+        assert result.exit_code == 0
+        entries = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [entry["message"] for entry in entries] == expected
+        assert {entry["logGroupName"] for entry in entries} == {json.loads(export)["logGroupName"]}
+    result = runner.invoke(app, ["ingest", "-", "--format", "ndjson"], input=export)
+    assert result.exit_code == 1
+
+
+def test_tail_command_missing_file(tmp_path):
+    result = runner.invoke(app, ["tail", str(tmp_path / "missing.log")])
+    assert result.exit_code == 1
+
+
+def test_executions_command():
+    result = runner.invoke(app, ["executions", str(path)])
+    assert result.exit_code == 0
+    assert "req-001" in result.output
+    assert "1 executions, 1 failed" in result.output
+
+
+def test_executions_command_failed_only(write_export):
+    log_file = write_export("lambda.json", "/aws/lambda/app", [
+        (1705312245000, "START RequestId: ok-1 Version: $LATEST"),
+        (1705312245100, "END RequestId: ok-1"),
+        (1705312246000, "START RequestId: bad-1 Version: $LATEST"),
+        (1705312246100, "[ERROR] boom"),
+        (1705312246200, "END RequestId: bad-1"),
+    ])
+    result = runner.invoke(app, ["executions", str(log_file), "--failed"])
+    assert result.exit_code == 0
+    assert "bad-1" in result.output
+    assert "ok-1" not in result.output
+    assert "2 executions, 1 failed" in result.output
+
+
+def test_ingest_command_merges_stdin_files_and_api(logs_api, export_dir):
+    result = runner.invoke(
+        app,
+        [
+            "ingest", "-", str(export_dir),
+            "--endpoint", logs_api.endpoint, "--log-group", "/aws/lambda/app",
+            "--log-stream", "stream-b", "--level", "ERROR",
+        ],
+        input="[ERROR] piped\n[INFO] quiet\n",
+    )
+    assert result.exit_code == 0
+    for message in ("piped", "a second", "b first", "b2"):
+        assert message in result.output
+    assert "quiet" not in result.output
+
+
+def test_ingest_command_with_worker_processes():
+    result = runner.invoke(app, ["ingest", "-", "--jobs", "2"], input="[WARNING] slow disk\n")
+    assert result.exit_code == 0
+    assert "slow disk" in result.output
+
+
+def test_ingest_command_detects_file_formats(export_dir):
+    lines = json.dumps({"timestamp": 1705312248000, "message": "[ERROR] from ndjson"}) + "\n"
+    (export_dir / "c.ndjson").write_text(lines)
+    result = runner.invoke(app, ["ingest", str(export_dir), "--level", "ERROR", "-o", "ndjson", "--jobs", "2"])
+    assert result.exit_code == 0
+    assert sorted(json.loads(line)["message"] for line in result.stdout.splitlines()) == [
+        "[ERROR] a second", "[ERROR] b first", "[ERROR] from ndjson"
+    ]
+    result = runner.invoke(app, ["ingest", str(export_dir / "c.ndjson"), "--format", "cloudwatch"])
+    assert result.exit_code == 1
+    assert "c.ndjson not valid" in result.output
+
+
+def test_ingest_command_reports_api_errors(logs_api):
+    logs_api.status = 500
+    result = runner.invoke(
+        app, ["ingest", "--endpoint", logs_api.endpoint, "--log-group", "/aws/lambda/app"]
+    )
+    assert result.exit_code == 1
+    assert "HTTP 500" in result.output
+
+
+def test_ingest_command_needs_input():
+    result = runner.invoke(app, ["ingest"])
+    assert result.exit_code == 1
+
+
+def test_parse_command_reads_ndjson_from_stdin():
+    lines = "".join(
+        json.dumps({"timestamp": 1705312245000 + index, "message": message}) + "\n"
+        for index, message in enumerate(["[INFO] warm up", "[ERROR] disk full"])
+    )
+    result = runner.invoke(
+        app, ["parse", "-", "--format", "ndjson", "--level", "ERROR"], input=lines
+    )
+    assert result.exit_code == 0
+    assert "disk full" in result.output
+    assert "warm up" not in result.output
+
+
+def test_parse_command_reads_export_from_stdin():
+    result = runner.invoke(app, ["parse", "-"], input=path.read_text())
+    assert result.exit_code == 0
+    assert "CRITICAL" in result.output
+
+
+def test_parse_command_reports_invalid_stdin():
+    result = runner.invoke(app, ["parse", "-", "--format", "ndjson"], input="{oops\n")
+    assert result.exit_code == 1
+    assert "stdin not valid" in result.output
+
+
+def test_parse_command_ndjson_file(tmp_path):
+    log_file = tmp_path / "app.ndjson"
+    log_file.write_text('{"timestamp": 1705312245000, "message": "[WARNING] from file"}\n')
+    result = runner.invoke(app, ["parse", str(log_file), "--format", "ndjson"])
+    assert result.exit_code == 0
+    assert "from file" in result.output
+
+
+def test_parse_command_prefilter_matches_full_parse():
+    args = ["parse", str(path), "--level", "ERROR", "--search", "exception", "--no-index"]
+    scanned = runner.invoke(app, args)
+    full = runner.invoke(app, [*args, "--no-prefilter"])
+    assert scanned.exit_code == full.exit_code == 0
+    assert scanned.output == full.output
+
+
+def test_parse_command_head_and_tail(tmp_path):
+    log_file = tmp_path / "app.ndjson"
+    log_file.write_text("".join(
+        json.dumps({"timestamp": 1705312245000 + index, "message": f"[INFO] event-{index}"}) + "\n"
+        for index in range(20)
+    ))
+    head = runner.invoke(app, ["parse", str(log_file), "--format", "ndjson", "--head", "2"])
+    assert head.exit_code == 0
+    assert "event-1 " in head.output and "event-2 " not in head.output
+    tail = runner.invoke(app, ["parse", str(log_file), "--format", "ndjson", "--tail", "2"])
+    assert tail.exit_code == 0
+    assert "event-19 " in tail.output and "event-17 " not in tail.output
+    both = runner.invoke(app, ["parse", str(log_file), "--head", "1", "--tail", "1"])
+    assert both.exit_code == 1
+
+
+def test_parse_command_pager_falls_back_without_terminal():
+    result = runner.invoke(app, ["parse", str(path), "--pager"])
+    assert result.exit_code == 0
+    assert "CRITICAL" in result.output
+
+
+def test_parse_command_output_formats():
+    ndjson = runner.invoke(app, ["parse", str(path), "--level", "ERROR", "--output", "ndjson"])
+    assert ndjson.exit_code == 0
+    events = [json.loads(line) for line in ndjson.output.splitlines()]
+    assert events and "INFO" not in {event["level"] for event in events}
+    csv_output = runner.invoke(app, ["parse", str(path), "-o", "csv", "--head", "1"])
+    assert csv_output.exit_code == 0
+    assert len(csv_output.output.splitlines()) == 2
+    empty = runner.invoke(app, ["parse", str(path), "--search", "nowhere", "-o", "ndjson"])
+    assert empty.exit_code == 0
+    assert empty.output == ""
+
+
+def test_templates_command_resumes_from_state(tmp_path, write_export):
+    first = write_export("first.json", "/aws/lambda/app", [
+        (1705312245000 + index, f"[ERROR] timeout after {index} ms") for index in range(4)
+    ])
+    second = write_export("second.json", "/aws/lambda/app", [
+        (1705312246000, "[ERROR] timeout after 99 ms"),
+        (1705312246001, "[INFO] cache warmed"),
+    ])
+    state = tmp_path / "templates.json"
+    result = runner.invoke(app, ["templates", str(first), "--state", str(state)])
+    assert result.exit_code == 0
+    assert "1 templates covering 4 entries" in result.output
+    result = runner.invoke(app, ["templates", str(second), "--state", str(state)])
+    assert result.exit_code == 0
+    assert "timeout after <*> ms" in result.output
+    assert "2 templates covering 6 entries" in result.output
+
+
+def test_stats_command_with_workers(export_dir):
+    result = runner.invoke(app, ["stats", str(export_dir), "--jobs", "2", "--no-buckets"])
+    assert result.exit_code == 0
+    assert "/aws/lambda/" in result.output
+    assert "entries" in result.output and "errors" in result.output
+    single = runner.invoke(app, ["stats", str(export_dir), "--no-buckets"])
+    assert single.output == result.output
+
+def test_stats_command_buckets():
+    result = runner.invoke(app, ["stats", str(path), "--bucket", "60"])
+    assert result.exit_code == 0
+    assert "Bucket" in result.output
+    assert "CRITICAL" in result.output
+
+
+def test_parse_command_profile(tmp_path):
+    stacks = tmp_path / "parse.folded"
+    result = runner.invoke(
+        app, ["parse", str(path), "--level", "ERROR", "--no-index", "--no-prefilter",
+              "--profile", "--profile-stacks", str(stacks)],
+    )
+    assert result.exit_code == 0
+    for stage in ("parse", "filter", "format", "Peak RSS"):
+        assert stage in result.output
+    assert stacks.exists()
+
+
+def test_parse_command_detects_compressed_inputs(tmp_path):
+    compressed = tmp_path / "export.json.gz"
+    compressed.write_bytes(gzip.compress(path.read_bytes()))
+    result = runner.invoke(app, ["parse", str(compressed), "-o", "ndjson"])
+    expected = runner.invoke(app, ["parse", str(path), "-o", "ndjson"])
+    assert result.exit_code == 0
+    assert result.output == expected.output
+    text = gzip.compress(b"START RequestId: r1 Version: $LATEST\n[ERROR]\t2024-01-15T10:00:00Z\tr1\tboom\n")
+    result = runner.invoke(app, ["parse", "-", "--output", "ndjson"], input=text)
+    assert result.exit_code == 0
+    assert [json.loads(line)["level"] for line in result.output.splitlines()] == ["UNKNOWN", "ERROR"]
+
+
+def test_parse_command_format_errors(tmp_path):
+    text = tmp_path / "lambda.log"
+    text.write_text("START RequestId: r1 Version: $LATEST\n")
+    result = runner.invoke(app, ["parse", str(path), str(text)])
+    assert result.exit_code == 1
+    assert "--format" in result.output
+    result = runner.invoke(app, ["parse", str(path), "--format", "syslog"])
+    assert result.exit_code == 1
+    assert "Unknown format syslog" in result.output
+
+
+def test_parse_command_orders(export_dir):
+    def messages(*args):
+        result = runner.invoke(app, ["parse", str(export_dir), "-o", "ndjson", *args])
+        assert result.exit_code == 0
+        return [json.loads(line)["message"] for line in result.stdout.splitlines()]
+    in_order = ["[DEBUG] b out of order", "[INFO] a first", "[ERROR] b first", "[ERROR] a second"]
+    as_written = ["[INFO] a first", "[ERROR] b first", "[DEBUG] b out of order", "[ERROR] a second"]
+    assert messages("--order", "external") == in_order
+    assert messages("--order", "stream", "--lateness", "5") == in_order
+    # Without a window, b's older event arrives after a newer one went out; the
+    # default merges the files as written in the same way.
+    assert messages("--order", "stream") == messages() == messages("--jobs", "2") == as_written
+
+
+def test_parse_command_orders_a_single_file(write_export):
+    export = write_export("single.json", "/aws/lambda/a", [(3000, "[INFO] third"), (1000, "[INFO] first")])
+    result = runner.invoke(app, ["parse", str(export), "-o", "ndjson", "--order", "external"])
+    assert [json.loads(line)["message"] for line in result.output.splitlines()] == ["[INFO] first", "[INFO] third"]
+    result = runner.invoke(app, ["parse", str(export), "-o", "ndjson", "--order", "stream"])
+    assert result.exit_code == 0
+    assert "1 entries trailed newer ones" in result.output
+    result = runner.invoke(app, ["parse", str(export), "--lateness", "1"])
+    assert result.exit_code == 1
+
+
+def test_parse_command_asks_a_running_server(export_dir, write_export):
+    from logsentinel.server import LogStore, QueryServer
+    from logsentinel.server.client import write_state
+    server = QueryServer(LogStore(), ("127.0.0.1", 0), [export_dir])
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    write_state(Path(os.environ["LOGSENTINEL_CACHE_DIR"]), "127.0.0.1", server.server_port)
+    try:
+        def messages(*args):
+            result = runner.invoke(app, ["parse", str(export_dir), "-o", "ndjson", *args])
+            assert result.exit_code == 0
+            return [json.loads(line)["message"] for line in result.stdout.splitlines()]
+        local = messages("--no-server", "--level", "ERROR")
+        assert server.queries == 0
+        assert messages("--level", "ERROR") == local == ["[ERROR] b first", "[ERROR] a second"]
+        assert messages("--head", "1") == ["[INFO] a first"]
+        assert server.queries == 2
+        assert server.store.loads == 2
+        # Ordering and profiling stay local.
+        messages("--order", "external")
+        assert server.queries == 2
+        # Files the server was not started with are refused and read locally.
+        outside = write_export("outside.json", "/aws/lambda/c", [(1705312249000, "[ERROR] c")])
+        result = runner.invoke(app, ["parse", str(outside), "-o", "ndjson"])
+        assert [json.loads(line)["message"] for line in result.stdout.splitlines()] == ["[ERROR] c"]
+        assert server.store.loads == 2
+        broken = export_dir / "broken.json"
+        broken.write_text('{"logEvents": [')
+        result = runner.invoke(app, ["parse", str(broken), "--format", "cloudwatch"])
+        assert result.exit_code == 1
+        assert "not valid" in result.output
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_serve_command(tmp_path, export_dir, monkeypatch):
+    from logsentinel.server import QueryServer
+    cache_dir = tmp_path / "state"
+    seen = []
+    def serve_forever(self):
+        seen.append(json.loads((cache_dir / "server.json").read_text())["port"])
+        raise KeyboardInterrupt
+    monkeypatch.setattr(QueryServer, "serve_forever", serve_forever)
+    result = runner.invoke(app, ["serve", str(export_dir), "--cache-dir", str(cache_dir)])
+    assert result.exit_code == 0
+    assert "Loaded 2 entries from" in result.output
+    assert f"Serving on http://127.0.0.1:{seen[0]}" in result.output
+    assert not (cache_dir / "server.json").exists()
+    (export_dir / "broken.json").write_text('{"logEvents": [')
+    result = runner.invoke(app, ["serve", str(export_dir / "broken.json"), "--format", "cloudwatch"])
+    assert result.exit_code == 1
+    assert "broken.json not valid" in result.output
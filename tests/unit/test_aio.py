@@ -0,0 +1,190 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from logsentinel.filters import LevelFilter
+from logsentinel.models import LogBatch, LogLevel
+from logsentinel.parsers import CloudWatchParser
+from logsentinel.sources import (
+    CloudWatchApiSource,
+    ConnectionPool,
+    FileSource,
+    StreamSource,
+    ingest,
+    iterate,
+)
+
+
+def collect(sources, filters=(), queue_size=16):
+    async def run():
+        return [batch async for batch in ingest(sources, filters, queue_size)]
+
+    return asyncio.run(run())
+
+
+def messages(batches):
+    return sorted(entry.message for batch in batches for entry in batch)
+
+
+def stdin(*lines):
+    return io.BytesIO("".join(lines).encode())
+
+
+def test_stream_source_splits_chunks_into_lines(monkeypatch):
+    monkeypatch.setattr("logsentinel.sources.aio.READ_SIZE", 7)
+    stream = stdin(
+        json.dumps({"timestamp": 1705312245000, "message": "[INFO] structured"}) + "\n",
+        "[ERROR] plain\n",
+        "[WARNING] no newline",
+    )
+    batches = collect([StreamSource(stream, "pipe")])
+    assert messages(batches) == ["[ERROR] plain", "[INFO] structured", "[WARNING] no newline"]
+    assert {entry.source for batch in batches for entry in batch} == {"pipe"}
+
+def test_stream_source_keeps_explicit_fields_of_json_lines():
+    line = json.dumps({"timestamp": 1, "message": "boom", "level": "ERROR", "requestId": "req-1"})
+    [entry] = [entry for batch in collect([StreamSource(stdin(line + "\n"))]) for entry in batch]
+    assert (entry.level, entry.request_id) == (LogLevel.ERROR, "req-1")
+
+def test_stream_source_uses_the_given_parser():
+    export = json.dumps({"logGroupName": "/aws/lambda/app", "logEvents": [
+        {"timestamp": 1705312245000, "message": "[INFO] one"},
+        {"timestamp": 1705312246000, "message": "[ERROR] two"},
+    ]}, indent=2)
+    batches = collect([StreamSource(stdin(export), parser=CloudWatchParser())])
+    assert messages(batches) == ["[ERROR] two", "[INFO] one"]
+    assert {entry.source for batch in batches for entry in batch} == {"/aws/lambda/app"}
+
+def test_get_log_events_pages_every_stream(logs_api):
+    source = CloudWatchApiSource(logs_api.endpoint, "/aws/lambda/app", ["stream-a", "stream-b"])
+    batches = collect([source])
+    assert messages(batches) == [f"[ERROR] b{index}" for index in range(3)] + [
+        f"[INFO] a{index}" for index in range(5)
+    ]
+    actions = {action for action, _ in logs_api.requests}
+    assert actions == {"GetLogEvents"}
+    # Two streams fetched at the same time need no more than two connections.
+    assert logs_api.connections <= 2
+    assert len(logs_api.requests) == 4 + 3
+
+def test_filter_log_events_sends_pattern(logs_api):
+    source = CloudWatchApiSource(logs_api.endpoint, "/aws/lambda/app", filter_pattern="ERROR")
+    batches = collect([source])
+    assert len(messages(batches)) == 8
+    action, request = logs_api.requests[0]
+    assert action == "FilterLogEvents"
+    assert request == {"logGroupName": "/aws/lambda/app", "filterPattern": "ERROR"}
+    assert [request.get("nextToken") for _, request in logs_api.requests] == [
+        None, "2", "4", "6",
+    ]
+
+def test_connection_pool_reuses_connections(logs_api):
+    async def run():
+        pool = ConnectionPool(logs_api.endpoint, size=1)
+        headers = {"X-Amz-Target": "Logs_20140328.GetLogEvents"}
+        body = json.dumps({"logStreamName": "stream-a"}).encode()
+        results = await asyncio.gather(*(pool.post(headers, body) for _ in range(5)))
+        await pool.close()
+        return results, pool.opened
+
+    results, opened = asyncio.run(run())
+    assert [status for status, _ in results] == [200] * 5
+    assert opened == 1
+    assert logs_api.connections == 1
+
+def test_connection_pool_rejects_other_schemes():
+    with pytest.raises(ValueError):
+        ConnectionPool("ftp://example.com")
+
+def test_ingest_merges_sources_and_filters(logs_api, write_export):
+    path = write_export("app.json", "/aws/lambda/file", [
+        (1705312245000, "[ERROR] from file"),
+        (1705312245001, "[INFO] quiet file"),
+    ])
+    sources = [
+        FileSource(path),
+        StreamSource(stdin("[ERROR] from stdin\n", "[DEBUG] quiet stdin\n")),
+        CloudWatchApiSource(logs_api.endpoint, "/aws/lambda/app", ["stream-b"]),
+    ]
+    batches = collect(sources, [LevelFilter(LogLevel.ERROR)])
+    assert messages(batches) == [
+        "[ERROR] b0", "[ERROR] b1", "[ERROR] b2", "[ERROR] from file", "[ERROR] from stdin",
+    ]
+
+def test_file_source_parses_in_worker_processes(write_export):
+    from concurrent.futures import ProcessPoolExecutor
+    path = write_export("app.json", "/aws/lambda/file", [
+        (1705312245000, "[ERROR] from file"),
+        (1705312245001, "[INFO] quiet file"),
+    ])
+    async def run(executor):
+        async def emit(batch):
+            batches.append(batch)
+        await FileSource(path).produce(emit, executor)
+    batches = []
+    with ProcessPoolExecutor(1) as executor:
+        asyncio.run(run(executor))
+        # The worker process did the parsing.
+        assert executor._processes
+    assert messages(batches) == ["[ERROR] from file", "[INFO] quiet file"]
+
+def test_ingest_bounded_queue_holds_back_producers():
+    produced = []
+
+    class Counting:
+        async def produce(self, emit, executor):
+            for index in range(10):
+                produced.append(index)
+                batch = LogBatch()
+                batch.append(index, LogLevel.INFO, f"m{index}", "s")
+                await emit(batch)
+
+    async def run():
+        batches = ingest([Counting()], queue_size=2)
+        await anext(batches)
+        # Let the producer run as far as the queue allows.
+        for _ in range(10):
+            await asyncio.sleep(0)
+        seen = len(produced)
+        await batches.aclose()
+        return seen
+
+    # One batch was consumed and two fill the queue; the fourth put blocks.
+    assert asyncio.run(run()) == 4
+
+def test_ingest_reports_producer_errors():
+    class Failing:
+        async def produce(self, emit, executor):
+            raise ConnectionError("boom")
+
+    with pytest.raises(ConnectionError, match="boom"):
+        collect([Failing(), StreamSource(stdin("[INFO] fine\n"))])
+
+def test_http_errors_surface(logs_api):
+    logs_api.status = 400
+    source = CloudWatchApiSource(logs_api.endpoint, "/aws/lambda/app")
+    with pytest.raises(ConnectionError, match="HTTP 400"):
+        collect([source])
+
+def test_cancel_while_consumer_stalls(logs_api):
+    source = CloudWatchApiSource(logs_api.endpoint, "/aws/lambda/app", ["stream-a"], prefetch=1)
+
+    async def run():
+        async def stall(batch):
+            await asyncio.Event().wait()
+        task = asyncio.create_task(source.produce(stall, None))
+        # One page is stuck in emit, one fills the queue and the third waits to be put.
+        while len(logs_api.requests) < 3:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 2)
+
+    asyncio.run(run())
+
+def test_iterate_drives_ingest_synchronously():
+    batches = iterate(ingest([StreamSource(stdin("[INFO] one\n", "[INFO] two\n"))]))
+    assert messages(list(batches)) == ["[INFO] one", "[INFO] two"]
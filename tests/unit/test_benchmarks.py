@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.generator import generate_events, write_export
+from benchmarks.suite import BASELINE_VERSION, compare, load, run_suite
+from logsentinel.models import LogLevel
+from logsentinel.parsers import CloudWatchParser
+
+
+def report(**per_second):
+    return {"version": BASELINE_VERSION, "results": {name: {"per_second": value} for name, value in per_second.items()}}
+
+
+def test_generator_is_deterministic(tmp_path):
+    assert list(generate_events(500, seed=7)) == list(generate_events(500, seed=7))
+    assert list(generate_events(500, seed=7)) != list(generate_events(500, seed=8))
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    write_export(first, 500, seed=7)
+    write_export(second, 500, seed=7)
+    assert first.read_bytes() == second.read_bytes()
+
+def test_generator_honours_level_weights(tmp_path):
+    path = tmp_path / "export.json"
+    write_export(path, 300, levels={"ERROR": 1.0}, request_ids=3)
+    entries = CloudWatchParser().parse_file(path)
+    assert len(entries) == 300
+    assert {entry.level for entry in entries} == {LogLevel.ERROR}
+    assert len({entry.request_id for entry in entries}) <= 3
+    assert [entry.timestamp for entry in entries] == sorted(entry.timestamp for entry in entries)
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    baseline = report(parse=100.0, search=100.0, table=100.0, removed=100.0)
+    current = report(parse=95.0, search=85.0, table=120.0, added=1.0)
+    rows, regressions = compare(baseline, current, 0.10)
+    assert regressions == ["search"]
+    assert [(row[0], row[-1]) for row in rows] == [("parse", "ok"), ("search", "REGRESSION"), ("table", "faster")]
+    assert compare(baseline, current, 0.20)[1] == []
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"version": BASELINE_VERSION + 1, "results": {}}))
+    with pytest.raises(SystemExit, match="not a version"):
+        load(path)
+
+def test_run_suite_covers_every_stage(tmp_path):
+    path = tmp_path / "export.json"
+    write_export(path, 200)
+    results = run_suite(path, repeat=1, table_entries=10, sample_events=50)["results"]
+    assert results["iter_batches"]["items"] == 200
+    assert results["parser_append_event"]["items"] == results["search_filter"]["items"] == 50
+    assert results["table_formatter"]["items"] == 10
+    assert all(result["per_second"] > 0 for result in results.values())
+
+def test_committed_baseline_matches_the_suite(tmp_path):
+    baseline = load(Path(__file__).parents[2] / "benchmarks" / "baselines" / "main.json")
+    path = tmp_path / "export.json"
+    write_export(path, 50)
+    assert baseline["results"].keys() == run_suite(path, repeat=1, table_entries=5)["results"].keys()
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from logsentinel.parsers import CloudWatchParser
+from logsentinel.storage import ParseCache
+
+
+class CountingParser(CloudWatchParser):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def iter_batches(self, path, batch_size=2):
+        self.calls += 1
+        return super().iter_batches(path, batch_size)
+
+
+@pytest.fixture
+def export(write_export):
+    return write_export("export.json", "/aws/lambda/app", [
+        (1705312245000, "[INFO] first"),
+        (1705312246000, "[ERROR] second RequestId: abc"),
+        (1705312247000, "[WARNING] third"),
+    ])
+
+
+def read(cache, parser, path):
+    return [entry for batch in cache.iter_batches(parser, path) for entry in batch]
+
+
+def test_warm_run_skips_parser(tmp_path, export):
+    cache = ParseCache(tmp_path / "cache")
+    parser = CountingParser()
+    cold = read(cache, parser, export)
+    warm = read(cache, parser, export)
+    assert parser.calls == 1
+    assert warm == cold == CloudWatchParser().parse_file(export)
+
+def test_changed_file_is_parsed_again(tmp_path, export, write_export):
+    cache = ParseCache(tmp_path / "cache")
+    parser = CountingParser()
+    read(cache, parser, export)
+    write_export("export.json", "/aws/lambda/app", [(1705312245000, "[INFO] new")])
+    assert [entry.message for entry in read(cache, parser, export)] == ["[INFO] new"]
+    assert parser.calls == 2
+
+def test_identical_content_shares_entry(tmp_path, export):
+    cache = ParseCache(tmp_path / "cache")
+    parser = CountingParser()
+    copy = tmp_path / "copy.json"
+    copy.write_bytes(export.read_bytes())
+    read(cache, parser, export)
+    read(cache, parser, copy)
+    assert parser.calls == 1
+
+def test_partial_read_is_not_stored(tmp_path, export):
+    cache = ParseCache(tmp_path / "cache")
+    parser = CountingParser()
+    batches = cache.iter_batches(parser, export)
+    next(batches)
+    batches.close()
+    read(cache, parser, export)
+    assert parser.calls == 2
+    assert list((tmp_path / "cache" / "entries").glob("*.tmp")) == []
+
+def test_eviction_drops_least_recently_used(tmp_path, write_export):
+    cache = ParseCache(tmp_path / "cache")
+    parser = CountingParser()
+    paths = [
+        write_export(f"{name}.json", "/aws/lambda/app", [(index, f"[INFO] {name}")])
+        for index, name in enumerate(["a", "b", "c"])
+    ]
+    for offset, path in enumerate(paths):
+        read(cache, parser, path)
+        entry = cache.entry_path(parser, path)
+        os.utime(entry, ns=(offset, offset))
+    cache.max_bytes = 2 * cache.entry_path(parser, paths[0]).stat().st_size
+    cache.evict()
+    assert not cache.entry_path(parser, paths[0]).exists()
+    assert cache.entry_path(parser, paths[2]).exists()
+
+def test_corrupt_entry_is_rebuilt(tmp_path, export):
+    cache = ParseCache(tmp_path / "cache")
+    parser = CountingParser()
+    read(cache, parser, export)
+    cache.entry_path(parser, export).write_bytes(b"garbage")
+    assert len(read(cache, parser, export)) == 3
+    assert parser.calls == 2
@@ -1,5 +1,8 @@
+import os
+import subprocess
+import sys
 from typer.testing import CliRunner
-from logsentinel.cli import app
+from logsentinel.cli import app, options
 from pathlib import Path
 runner = CliRunner()
 path = Path(__file__).parent.parent / "fixtures" / "cloudwatch_sample.json"
@@ -29,4 +32,89 @@ def test_parse_invalid_level():
 
 def test_parse_valid_level():
     result = runner.invoke(app, ["parse", str(path), "--level", "DEBUG"])
-    assert result.exit_code == 0
\ No newline at end of file
+    assert result.exit_code == 0
+
+def test_parse_time_window():
+    result = runner.invoke(app, ["parse", str(path), "--since", "2024-01-15T09:50:48", "--until", "2024-01-15T09:50:49Z"])
+    assert result.exit_code == 0
+    assert "END RequestId" in result.output
+    assert "START RequestId" not in result.output
+    assert "CRITICAL" not in result.output
+
+
+def test_parse_invalid_since():
+    result = runner.invoke(app, ["parse", str(path), "--since", "yesterday"])
+    assert result.exit_code == 1
+    assert "invalid date yesterday" in result.output
+
+
+def test_parse_multiple_search_terms():
+    result = runner.invoke(app, ["parse", str(path), "--search", "cache", "--search", "memory"])
+    assert result.exit_code == 0
+    assert "WARNING" in result.output and "DEBUG" in result.output
+    assert "ERROR" not in result.output
+
+
+def test_parse_search_all_with_regex():
+    result = runner.invoke(app, ["parse", str(path), "--search", "req-001", "--regex", r"Duration: \d+", "--match", "all"])
+    assert result.exit_code == 0
+    assert "REPORT" in result.output
+    assert "START" not in result.output
+
+
+def test_parse_invalid_regex():
+    result = runner.invoke(app, ["parse", str(path), "--regex", "("])
+    assert result.exit_code == 1
+
+
+# Cold start of `version`, in milliseconds of import time.
+STARTUP_BUDGET_MS = 80
+VERSION = "from logsentinel.cli import app; app(['version'])"
+
+
+def _import_times():
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).parents[2] / "src"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", VERSION],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            # One leading space, then two more per nesting level.
+            rows.append((name[1:], int(cumulative)))
+    # Modules imported before `site` finished belong to interpreter startup.
+    last_site = max(index for index, (name, _) in enumerate(rows) if name == "site")
+    return rows[last_site + 1:]
+
+
+def test_version_does_not_load_command_dependencies():
+    loaded = {name.strip() for name, _ in _import_times()}
+    assert "logsentinel.cli" in loaded
+    for heavy in ("rich.console", "numpy", "asyncio", "logsentinel.parsers", "logsentinel.cli.commands.parse"):
+        assert heavy not in loaded
+
+
+def test_version_import_time_budget():
+    # Best of three, so a busy machine does not fail the run.
+    totals = []
+    for _ in range(3):
+        top_level = [us for name, us in _import_times() if not name.startswith(" ")]
+        totals.append(sum(top_level) / 1000)
+    assert min(totals) < STARTUP_BUDGET_MS
+
+
+def test_option_defaults_match_library():
+    from logsentinel.analysis import executions, templates
+    from logsentinel.server import http, store
+    from logsentinel.sources import aio
+    from logsentinel.utils import merge
+    assert options.MAX_OPEN == executions.MAX_OPEN
+    assert options.DEPTH == templates.DEPTH
+    assert options.SIMILARITY == templates.SIMILARITY
+    assert options.MAX_CLUSTERS == templates.MAX_CLUSTERS
+    assert options.QUEUE_SIZE == aio.QUEUE_SIZE
+    assert options.LATENESS == merge.LATENESS.total_seconds()
+    assert (options.HOST, options.PORT) == (http.HOST, http.PORT)
+    assert options.MEMORY_MB * 1024**2 == store.MEMORY_BUDGET
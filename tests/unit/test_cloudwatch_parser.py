@@ -37,4 +37,59 @@ def test_parse_string_return_empty_list():
 
 def test_parse_string_with_empty_group_name():
     content = parser.parse_string('{"logStreamName": "2024/01/15/[$LATEST]abc123","logEvents": [{"id": "001", "timestamp": 1705312245123, "message": "START RequestId: req-001 Version: $LATEST"}]}')
-    assert content[0].source == "unknown"
\ No newline at end of file
+    assert content[0].source == "unknown"
+
+def test_iter_file_matches_parse_string():
+    entries = list(parser.iter_file(path))
+    assert entries == parser.parse_string(path.read_text())
+
+def test_iter_file_is_lazy(tmp_path):
+    log_file = tmp_path / "broken.json"
+    log_file.write_text('{"logGroupName": "g", "logEvents": [{"timestamp": 1705312245123, "message": "[INFO] ok"}, {"timestamp"')
+    entries = parser.iter_file(log_file)
+    assert next(entries).message == "[INFO] ok"
+    with pytest.raises(ValueError):
+        next(entries)
+
+def test_iter_file_with_group_name_after_events(tmp_path):
+    log_file = tmp_path / "late_group.json"
+    log_file.write_text('{"logEvents": [{"timestamp": 1705312245123, "message": "[INFO] ok"}], "logGroupName": "/aws/lambda/late"}')
+    entries = list(CloudWatchParser(chunk_size=8).iter_file(log_file))
+    assert len(entries) == 1
+    assert entries[0].source == "/aws/lambda/late"
+
+def test_iter_file_small_chunks_match_full_parse():
+    entries = list(CloudWatchParser(chunk_size=3).iter_file(path))
+    assert entries == parser.parse_string(path.read_text())
+
+def test_iter_file_failure_on_missing_events(tmp_path):
+    log_file = tmp_path / "no_events.json"
+    log_file.write_text('{"logGroupName": "/aws/lambda/my-function"}')
+    with pytest.raises(ValueError):
+        list(parser.iter_file(log_file))
+
+def test_iter_file_failure_on_non_existent_file():
+    with pytest.raises(FileNotFoundError):
+        parser.iter_file(Path("nonexistent.json"))
+
+def test_iter_batches_matches_parse_file(parsed_file):
+    batches = list(parser.iter_batches(path, batch_size=3))
+    assert [len(batch) for batch in batches] == [3, 3, 2]
+    assert [entry for batch in batches for entry in batch] == parsed_file
+    assert batches[1][0].request_id == "req-001"
+
+@pytest.mark.parametrize("message, level, request_id", [
+    ("[ERROR] failed", LogLevel.ERROR, None),
+    ("[TRACE] unknown level", LogLevel.UNKNOWN, None),
+    ("no brackets", LogLevel.UNKNOWN, None),
+    (" [INFO] not at start", LogLevel.UNKNOWN, None),
+    ("[WARNING] slow RequestId: req-9 done", LogLevel.WARNING, "req-9"),
+    ("RequestId:\tabc RequestId: def", LogLevel.UNKNOWN, "abc"),
+    ("RequestId: ", LogLevel.UNKNOWN, None),
+])
+def test_extract_fields(message, level, request_id):
+    assert CloudWatchParser._extract_fields(message) == (level, request_id)
+
+def test_events_in_same_millisecond_share_timestamp():
+    entries = parser.parse_string('{"logEvents": [{"timestamp": 1705312245123, "message": "a"}, {"timestamp": 1705312245123, "message": "b"}]}')
+    assert entries[0].timestamp is entries[1].timestamp
@@ -0,0 +1,37 @@
+from logsentinel.models import LogBatch, LogLevel
+from logsentinel.storage import decode_batch, encode_batch
+
+
+def test_batch_round_trips_all_columns():
+    batch = LogBatch()
+    batch.append(1705312245000, LogLevel.INFO, "héllo ✓", "/aws/lambda/a")
+    batch.append(
+        1705312246000,
+        LogLevel.ERROR,
+        "failed",
+        "/aws/lambda/b",
+        raw="[ERROR] failed",
+        request_id="req-1",
+        correlation_id="exec-1",
+        metadata={"detail": "timeout"},
+    )
+    batch.append(-5, LogLevel.UNKNOWN, "lone \ud800 surrogate", "/aws/lambda/a")
+
+    decoded = decode_batch(memoryview(encode_batch(batch)))
+
+    assert list(decoded) == list(batch)
+    assert decoded.sources == ["/aws/lambda/a", "/aws/lambda/b"]
+
+def test_sorted_flag_round_trips():
+    batch = LogBatch()
+    batch.append(2, LogLevel.INFO, "second", "a")
+    assert decode_batch(memoryview(encode_batch(batch))).timestamps_sorted
+    batch.append(1, LogLevel.INFO, "first", "a")
+    frame = encode_batch(batch)
+    assert not decode_batch(memoryview(frame)).timestamps_sorted
+    # Frames from before the flag end one section early and are checked instead.
+    assert not decode_batch(memoryview(frame[:-9])).timestamps_sorted
+    assert decode_batch(memoryview(encode_batch(LogBatch())[:-9])).timestamps_sorted
+
+def test_empty_batch_round_trips():
+    assert len(decode_batch(memoryview(encode_batch(LogBatch())))) == 0
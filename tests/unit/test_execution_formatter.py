@@ -0,0 +1,32 @@
+from datetime import UTC, datetime, timedelta
+
+from rich.table import Table
+
+from logsentinel.formatters import ExecutionFormatter
+from logsentinel.models import Execution
+
+start = datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC)
+executions = [
+    Execution("req-1", "/aws/lambda/a", start, start + timedelta(seconds=1.5), 4, 0),
+    Execution("req-2", "/aws/lambda/a", start, start, 1, 1),
+]
+
+def test_row_formats_duration_and_counts():
+    assert ExecutionFormatter()._row(executions[0]) == (
+        "req-1", "/aws/lambda/a", "2024-01-15T10:00:00Z", "1.500s", "4", "0"
+    )
+
+def test_stream_chunks_executions():
+    tables = list(ExecutionFormatter().stream(executions, chunk_size=1))
+    assert len(tables) == 2
+    assert all(isinstance(table, Table) for table in tables)
+
+def test_stream_fixes_widths_from_the_first_chunk():
+    late = Execution("req-" + "9" * 30, "/aws/lambda/a", start, start, 1, 0)
+    first, second = ExecutionFormatter().stream([executions[0], late], chunk_size=1)
+    assert first.show_header and not second.show_header
+    assert [column.max_width for column in second.columns[:2]] == [9, 13]
+    assert [column.width for column in second.columns[2:]] == [20, 8, 7, 6]
+
+def test_stream_empty_still_yields_header():
+    assert len(list(ExecutionFormatter().stream([]))) == 1
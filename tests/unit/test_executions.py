@@ -0,0 +1,76 @@
+import random
+from dataclasses import replace
+from datetime import timedelta
+
+from logsentinel.analysis import ExecutionGrouper
+from logsentinel.models import LogLevel
+
+
+def keyed(make_log_entry, key, minute, level=LogLevel.INFO, message=None, source="/aws/lambda/a"):
+    entry = make_log_entry(level=level, minute_offset=minute, message=message, source=source)
+    return replace(entry, request_id=key)
+
+
+def summary(executions):
+    return sorted(
+        (execution.key, execution.entry_count, execution.error_count)
+        for execution in executions
+    )
+
+
+def test_groups_by_request_and_correlation_id(make_log_entry):
+    entries = [
+        keyed(make_log_entry, "req-1", 0),
+        keyed(make_log_entry, "req-2", 1, LogLevel.ERROR),
+        keyed(make_log_entry, "req-1", 2, LogLevel.CRITICAL),
+        replace(make_log_entry(minute_offset=3), correlation_id="exec-9", request_id="req-1"),
+    ]
+    executions = list(ExecutionGrouper().group(entries))
+    assert summary(executions) == [("exec-9", 1, 0), ("req-1", 2, 1), ("req-2", 1, 1)]
+    req_1 = next(execution for execution in executions if execution.key == "req-1")
+    assert req_1.duration == timedelta(minutes=2)
+    assert req_1.failed()
+
+def test_unkeyed_lines_join_the_running_invocation(make_log_entry):
+    entries = [
+        keyed(make_log_entry, "req-1", 0, message="START RequestId: req-1"),
+        make_log_entry(level=LogLevel.ERROR, minute_offset=1, source="/aws/lambda/a"),
+        keyed(make_log_entry, "req-1", 2, message="END RequestId: req-1"),
+        make_log_entry(minute_offset=3, source="/aws/lambda/a"),
+        make_log_entry(minute_offset=4, source="/aws/lambda/other"),
+    ]
+    grouper = ExecutionGrouper()
+    assert summary(grouper.group(entries)) == [("req-1", 3, 1)]
+    assert grouper.ungrouped == 2
+
+def test_watermark_closes_idle_executions_while_streaming(make_log_entry):
+    grouper = ExecutionGrouper(window=timedelta(minutes=5))
+    closed = grouper.feed([
+        keyed(make_log_entry, "req-1", 0),
+        keyed(make_log_entry, "req-2", 3),
+        keyed(make_log_entry, "req-3", 10),
+    ])
+    assert [execution.key for execution in closed] == ["req-1", "req-2"]
+    assert [execution.key for execution in grouper.finish()] == ["req-3"]
+
+def test_spilled_groups_merge_with_later_parts(make_log_entry):
+    rng = random.Random(7)
+    keys = [f"req-{index}" for index in range(50)]
+    entries = [
+        keyed(make_log_entry, rng.choice(keys), minute, rng.choice(list(LogLevel)))
+        for minute in range(500)
+    ]
+    expected = summary(ExecutionGrouper(window=timedelta(days=1)).group(entries))
+    grouper = ExecutionGrouper(window=timedelta(days=1), max_open=4, spill_partitions=3)
+    assert summary(grouper.group(entries)) == expected
+    assert grouper.spilled > 0
+
+def test_group_closed_by_watermark_after_spill_is_merged(make_log_entry):
+    grouper = ExecutionGrouper(window=timedelta(minutes=5), max_open=1)
+    entries = [
+        keyed(make_log_entry, "req-1", 0),
+        keyed(make_log_entry, "req-2", 1),
+        keyed(make_log_entry, "req-1", 2),
+        keyed(make_log_entry, "req-3", 20),
+    ]
+    assert summary(grouper.group(entries)) == [("req-1", 2, 0), ("req-2", 1, 0), ("req-3", 1, 0)]
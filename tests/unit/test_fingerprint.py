@@ -0,0 +1,42 @@
+import os
+
+from logsentinel.storage import Fingerprint
+from logsentinel.storage.fingerprint import hash_file
+
+
+def test_fingerprint_matches_unchanged_file(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text("abc")
+    assert Fingerprint.of(path).matches(path)
+
+def test_fingerprint_detects_size_change(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text("abc")
+    fingerprint = Fingerprint.of(path)
+    path.write_text("abcd")
+    assert not fingerprint.matches(path)
+
+def test_fingerprint_hashes_same_size_edit(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text("abc")
+    fingerprint = Fingerprint.of(path)
+    path.write_text("xyz")
+    os.utime(path, ns=(0, fingerprint.mtime_ns + 1))
+    assert not fingerprint.matches(path)
+    path.write_text("abc")
+    os.utime(path, ns=(0, fingerprint.mtime_ns + 2))
+    assert fingerprint.matches(path)
+
+def test_fingerprint_round_trips_through_dict(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text("abc")
+    fingerprint = Fingerprint.of(path)
+    assert Fingerprint.from_dict(fingerprint.to_dict()) == fingerprint
+
+def test_hash_file_prefix_matches_the_shorter_file(tmp_path):
+    path = tmp_path / "export.ndjson"
+    path.write_text("abc\n")
+    digest = hash_file(path)
+    path.write_text("abc\ndef\n")
+    assert hash_file(path, 4) == digest
+    assert hash_file(path) != digest
@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from logsentinel.filters import LevelFilter, SearchFilter, TimeRangeFilter
+from logsentinel.models import LogLevel
+from logsentinel.parsers import CloudWatchParser
+from logsentinel.storage import (
+    LogIndex,
+    build_index,
+    index_is_fresh,
+    index_path_for,
+    open_index,
+)
+
+
+@pytest.fixture
+def indexed_export(write_export):
+    path = write_export("export.json", "/aws/lambda/app", [
+        (1705312245000, "[INFO] Connection established"),
+        (1705312246000, "[ERROR] Database timeout on replica"),
+        (1705312247000, "[WARNING] Retrying request"),
+        (1705312248000, "[ERROR] Payment failed: card declined"),
+        (1705312249000, "[DEBUG] ✓ héllo done"),
+    ])
+    build_index(CloudWatchParser(), path)
+    return path
+
+
+def query(path, *filters):
+    parser = CloudWatchParser()
+    with LogIndex(index_path_for(path)) as index:
+        return [entry.message for entry in index.query(parser, path, list(filters))]
+
+
+def scan(path, *filters):
+    entries = CloudWatchParser().parse_file(path)
+    for entry_filter in filters:
+        entries = entry_filter.apply(entries)
+    return [entry.message for entry in entries]
+
+
+def test_index_records_summaries(indexed_export):
+    with LogIndex(index_path_for(indexed_export)) as index:
+        assert index.count == 5
+        assert index.sources == ["/aws/lambda/app"]
+        assert index.timestamps_sorted
+        assert list(index.level_candidates([LogLevel.ERROR])) == [1, 3]
+
+@pytest.mark.parametrize("filters", [
+    (LevelFilter(LogLevel.ERROR),),
+    (SearchFilter("timeout"),),
+    (SearchFilter("TIMEOUT", case_sensitive=True),),
+    (SearchFilter("db"),),
+    (SearchFilter(["card", "retry"]),),
+    (SearchFilter(["payment", "card"], match_all=True),),
+    (SearchFilter("héllo"),),
+    (SearchFilter("on"),),
+    (SearchFilter(": "),),
+    (SearchFilter(patterns=[r"fail\w+"]),),
+    (TimeRangeFilter(since=datetime(2024, 1, 15, 9, 50, 46, tzinfo=timezone.utc)),),
+    (LevelFilter(LogLevel.WARNING), SearchFilter("re")),
+])
+def test_index_query_matches_full_scan(indexed_export, filters):
+    assert query(indexed_export, *filters) == scan(indexed_export, *filters)
+
+def test_search_candidates_narrow_with_trigrams(indexed_export):
+    with LogIndex(index_path_for(indexed_export)) as index:
+        assert index.substring_candidates("timeout") == [1]
+        assert index.substring_candidates("zz") == []
+        assert index.substring_candidates(": ") is None
+
+def test_open_index_rebuilds_when_source_changes(indexed_export, write_export):
+    parser = CloudWatchParser()
+    write_export("export.json", "/aws/lambda/app", [(1705312245000, "[ERROR] new")])
+    assert not index_is_fresh(indexed_export)
+    index = open_index(parser, indexed_export)
+    assert index is not None
+    with index:
+        assert index.count == 1
+    assert index_is_fresh(indexed_export)
+
+def test_open_index_without_index_returns_none(write_export):
+    path = write_export("plain.json", "/aws/lambda/app", [])
+    assert open_index(CloudWatchParser(), path) is None
+
+def test_corrupt_index_is_rejected(indexed_export):
+    index_path_for(indexed_export).write_bytes(b"not an index at all")
+    with pytest.raises(ValueError):
+        LogIndex(index_path_for(indexed_export))
+    assert not index_is_fresh(indexed_export)
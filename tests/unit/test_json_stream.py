@@ -0,0 +1,97 @@
+import io
+import json
+
+import pytest
+
+from logsentinel.parsers.json_stream import JsonStreamReader
+
+
+def make_reader(content: str, chunk_size: int = 4) -> JsonStreamReader:
+    return JsonStreamReader(io.BytesIO(content.encode("utf-8")), chunk_size)
+
+def test_iter_array_yields_each_element():
+    reader = make_reader('[ {"a": 1}, "two", 3.5 , null ]')
+    assert list(reader.iter_array()) == [{"a": 1}, "two", 3.5, None]
+
+def test_iter_empty_array():
+    assert list(make_reader("[ ]").iter_array()) == []
+
+def test_number_split_across_chunks():
+    reader = make_reader("123456789", chunk_size=2)
+    assert reader.read_value() == 123456789
+
+def test_multibyte_characters_split_across_chunks():
+    reader = make_reader('["héllo wörld ✓"]', chunk_size=1)
+    assert list(reader.iter_array()) == ["héllo wörld ✓"]
+
+def test_iter_object_with_skipped_values():
+    reader = make_reader('{"skip": [1, [2, 3], {"x": 4}], "keep": "yes", "empty": {}}')
+    values = {}
+    for key in reader.iter_object():
+        if key == "keep":
+            values[key] = reader.read_value()
+        else:
+            reader.skip_value()
+    assert values == {"keep": "yes"}
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_skip_value_does_not_decode(chunk_size, monkeypatch):
+    content = '{"skip": [{"m": "a ] \\" } [ {"}, "\\\\", {"x": [[]]}], "keep": "yes"}'
+    reader = make_reader(content, chunk_size)
+    assert reader.read_value() == json.loads(content)
+    reader = make_reader(content, chunk_size)
+    values = {}
+    for key in reader.iter_object():
+        if key == "keep":
+            values[key] = reader.read_value()
+        else:
+            monkeypatch.setattr(reader._json, "raw_decode", None)
+            reader.skip_value()
+            monkeypatch.undo()
+    assert values == {"keep": "yes"}
+
+def test_skip_value_of_truncated_input_raises():
+    with pytest.raises(ValueError, match="Unexpected end"):
+        make_reader('[{"m": "open').skip_value()
+
+@pytest.mark.parametrize("content", ["[true, false, null, -Infinity]", '["\\u00e9"]'])
+def test_literals_and_escapes_split_across_chunks(content):
+    assert list(make_reader(content, chunk_size=1).iter_array()) == json.loads(content)
+
+def test_values_survive_every_chunk_edge():
+    content = '[{"a": 1}, 12.5, 3e10, 7, -0.25E-3, 1234567890123, true, false, null, "s\\u00e9 \\"q\\"", -Infinity, [], {}]'
+    for chunk_size in range(1, len(content) + 2):
+        assert list(make_reader(content, chunk_size).iter_array()) == json.loads(content), chunk_size
+
+def test_malformed_value_fails_without_reading_on():
+    stream = io.BytesIO(b'[{"a": 1,, "b": "' + b"x" * 100_000 + b'"}]')
+    reader = JsonStreamReader(stream, chunk_size=16)
+    with pytest.raises(json.JSONDecodeError):
+        list(reader.iter_array())
+    assert stream.tell() <= 32
+
+def test_invalid_separator_raises():
+    with pytest.raises(ValueError):
+        list(make_reader("[1 2]").iter_array())
+
+def test_non_object_raises():
+    with pytest.raises(ValueError):
+        list(make_reader("[1]").iter_object())
+
+def test_span_reports_byte_offsets_of_last_value():
+    content = '[{"m": "héllo"}, {"m": "✓"}]'
+    data = content.encode("utf-8")
+    reader = JsonStreamReader(io.BytesIO(data), chunk_size=3, track_offsets=True)
+    spans = []
+    for _ in reader.iter_array():
+        spans.append(reader.span())
+    assert [data[start:end] for start, end in spans] == [
+        '{"m": "héllo"}'.encode("utf-8"),
+        '{"m": "✓"}'.encode("utf-8"),
+    ]
+
+def test_span_requires_track_offsets():
+    reader = make_reader("[1]")
+    list(reader.iter_array())
+    with pytest.raises(ValueError):
+        reader.span()
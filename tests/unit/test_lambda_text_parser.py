@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from logsentinel.models import LogLevel
+from logsentinel.parsers import LambdaTextParser
+
+parser = LambdaTextParser()
+
+console_log = """INIT_START Runtime Version: python:3.12.v1
+START RequestId: req-1 Version: $LATEST
+[INFO]\t2024-01-15T10:00:00.123Z\treq-1\tProcessing order
+[ERROR]\t2024-01-15T10:00:01.000Z\treq-1\tboom
+Traceback (most recent call last):
+  File "handler.py", line 3, in handler
+END RequestId: req-1
+REPORT RequestId: req-1\tDuration: 12.31 ms\tBilled Duration: 13 ms
+2024-01-15T10:00:02.000Z\treq-2\tWARN\tnode warning
+"""
+
+
+def test_runtime_and_platform_lines():
+    entries = parser.parse_string(console_log)
+    assert [entry.level for entry in entries] == [
+        LogLevel.UNKNOWN, LogLevel.UNKNOWN, LogLevel.INFO, LogLevel.ERROR,
+        LogLevel.UNKNOWN, LogLevel.UNKNOWN, LogLevel.WARNING,
+    ]
+    assert [entry.request_id for entry in entries] == [None, "req-1", "req-1", "req-1", "req-1", "req-1", "req-2"]
+    assert entries[6].timestamp.isoformat() == "2024-01-15T10:00:02+00:00"
+
+def test_continuation_lines_join_the_entry_before():
+    entries = parser.parse_string(console_log)
+    assert entries[3].message.endswith('boom\nTraceback (most recent call last):\n  File "handler.py", line 3, in handler')
+
+def test_lines_before_the_first_timestamp_take_it():
+    entries = parser.parse_string(console_log)
+    assert entries[0].timestamp == entries[2].timestamp
+    # Platform lines after it keep the last time seen.
+    assert entries[4].timestamp == entries[3].timestamp
+
+def test_aws_logs_tail_prefix():
+    content = (
+        "2024-01-15T10:00:00.100000+00:00 2024/01/15/[$LATEST]abc START RequestId: r1 Version: $LATEST\n"
+        "2024-01-15T10:00:00.200000+00:00 2024/01/15/[$LATEST]abc plain print\n"
+    )
+    entries = parser.parse_string(content)
+    assert [entry.message for entry in entries] == ["START RequestId: r1 Version: $LATEST", "plain print"]
+    assert entries[1].timestamp.microsecond == 200000
+
+def test_iter_stream_respects_batch_size(tmp_path):
+    stream = io.BytesIO(console_log.encode())
+    assert [len(batch) for batch in parser.iter_stream(stream, batch_size=3)] == [3, 3, 1]
+
+def test_invalid_utf8_raises_value_error():
+    with pytest.raises(ValueError):
+        list(parser.iter_stream(io.BytesIO(b"START RequestId: \xff\n")))
+
+def test_sniff():
+    assert LambdaTextParser.sniff(console_log.encode())
+    assert not LambdaTextParser.sniff(b'{"logEvents": []}')
+    assert not LambdaTextParser.sniff(b"just some words\n")
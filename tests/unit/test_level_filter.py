@@ -1,5 +1,5 @@
 from logsentinel.filters import LevelFilter
-from logsentinel.models import LogLevel
+from logsentinel.models import LogBatch, LogLevel
 
 def test_min_level_debug(entries_all_levels):
     level_filter = LevelFilter(LogLevel.DEBUG)
@@ -37,3 +37,14 @@ def test_min_level_unknown_level(entries_only_unknown):
     result = level_filter.apply(entries_only_unknown)
     result_2 = level_filter_2.apply(entries_only_unknown)
     assert len(result) == 2 and len(result_2) == 2
+
+def test_stream_is_lazy(entries_all_levels):
+    level_filter = LevelFilter(LogLevel.ERROR)
+    result = level_filter.stream(iter(entries_all_levels))
+    assert next(result).level == LogLevel.ERROR
+    assert [entry.level for entry in result] == [LogLevel.CRITICAL, LogLevel.UNKNOWN]
+
+def test_apply_batch_matches_apply(entries_all_levels):
+    level_filter = LevelFilter(LogLevel.WARNING)
+    batch = LogBatch.from_entries(entries_all_levels)
+    assert list(level_filter.apply_batch(batch)) == level_filter.apply(entries_all_levels)
@@ -0,0 +1,71 @@
+import pickle
+from datetime import UTC, datetime
+
+from logsentinel.models import LogBatch, LogEntry, LogLevel
+from logsentinel.models.log_batch import from_epoch_ms, iter_batches, to_epoch_ms
+
+
+def test_round_trip_entries(entries_for_search_filter):
+    batch = LogBatch.from_entries(entries_for_search_filter)
+    assert len(batch) == 3
+    assert list(batch) == entries_for_search_filter
+    assert batch[1].metadata == {"detail": "Database timeout on replica"}
+    assert batch[-1] == entries_for_search_filter[-1]
+
+def test_raw_only_stored_when_different(sample_entry):
+    batch = LogBatch()
+    batch.append(1705312245123, LogLevel.INFO, "same", "/aws/lambda/a", raw="same")
+    batch.append_entry(sample_entry)
+    assert batch.raws == {1: "[INFO] Connection established"}
+    assert batch[0].raw == "same"
+
+def test_sources_are_interned():
+    batch = LogBatch()
+    for source in ["/aws/lambda/a", "/aws/lambda/b", "/aws/lambda/a"]:
+        batch.append(0, LogLevel.INFO, "message", source)
+    assert batch.sources == ["/aws/lambda/a", "/aws/lambda/b"]
+    assert list(batch.source_ids) == [0, 1, 0]
+
+def test_take_remaps_sparse_columns(entries_for_search_filter):
+    batch = LogBatch.from_entries(entries_for_search_filter)
+    taken = batch.take([1, 2])
+    assert list(taken) == entries_for_search_filter[1:]
+    assert taken[0].metadata == {"detail": "Database timeout on replica"}
+
+def test_extend_keeps_row_order(make_log_entry):
+    first = LogBatch.from_entries([make_log_entry(minute_offset=2, source="a")])
+    second = LogBatch.from_entries([make_log_entry(minute_offset=1, source="b")])
+    first.extend(second)
+    assert [entry.source for entry in first] == ["a", "b"]
+
+def test_timestamps_sorted_is_tracked(make_log_entry):
+    batch = LogBatch.from_entries([make_log_entry(minute_offset=offset) for offset in (0, 1, 1)])
+    assert batch.timestamps_sorted
+    later = LogBatch.from_entries([make_log_entry(minute_offset=2)])
+    batch.extend(later)
+    assert batch.timestamps_sorted
+    batch.extend(LogBatch.from_entries([make_log_entry(minute_offset=0)]))
+    assert not batch.timestamps_sorted
+    assert batch.take(range(3)).timestamps_sorted is False
+    later.append(0, LogLevel.INFO, "earlier", "a")
+    assert not later.timestamps_sorted
+    empty = LogBatch()
+    empty.extend(LogBatch.from_entries([make_log_entry()]))
+    assert empty.timestamps_sorted
+
+def test_pickle_round_trip(entries_for_search_filter):
+    batch = LogBatch.from_entries(entries_for_search_filter)
+    assert list(pickle.loads(pickle.dumps(batch))) == entries_for_search_filter
+
+def test_epoch_ms_conversion():
+    timestamp = datetime(2024, 1, 15, 10, 30, 45, 123000, tzinfo=UTC)
+    assert to_epoch_ms(timestamp) == 1705314645123
+    assert from_epoch_ms(1705314645123) == timestamp
+
+def test_iter_batches_splits(entries_all_levels):
+    batches = list(iter_batches(entries_all_levels, 4))
+    assert [len(batch) for batch in batches] == [4, 2]
+
+def test_entry_has_no_instance_dict(sample_entry):
+    assert not hasattr(sample_entry, "__dict__")
+    assert isinstance(LogBatch.from_entries([sample_entry])[0], LogEntry)
@@ -0,0 +1,43 @@
+import pytest
+
+from logsentinel.filters.matcher import AUTOMATON_THRESHOLD, AhoCorasick, TermMatcher
+
+
+def test_automaton_finds_overlapping_terms():
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    assert automaton.find("ushers") == {0, 1, 3}
+    assert automaton.contains_any("ahis")
+    assert not automaton.contains_any("nothing")
+
+def test_automaton_follows_failure_links():
+    automaton = AhoCorasick(["abcd", "bce"])
+    assert automaton.find("abce") == {1}
+
+@pytest.mark.parametrize("padding", [0, AUTOMATON_THRESHOLD])
+def test_matcher_any_and_all(padding):
+    fillers = [f"filler{index}" for index in range(padding)]
+    any_matcher = TermMatcher(["timeout", "refused", *fillers])
+    all_matcher = TermMatcher(["timeout", "replica", *fillers[:1]], match_all=True)
+    assert any_matcher.matches("Connection REFUSED")
+    assert not any_matcher.matches("all good")
+    assert all_matcher.matches("Timeout on", ["replica 2"]) == (padding == 0)
+
+def test_matcher_patterns():
+    matcher = TermMatcher(patterns=[r"req-\d+", r"status=5\d\d"], match_all=True)
+    assert matcher.matches("req-42 failed with status=503")
+    assert not matcher.matches("req-42 failed with status=404")
+
+def test_matcher_mixed_terms_any():
+    matcher = TermMatcher(["oom"], patterns=[r"^\[CRITICAL\]"])
+    assert matcher.matches("[critical] disk full")
+    assert matcher.matches("killed: OOM")
+    assert not matcher.matches("[INFO] fine")
+
+def test_matcher_case_sensitive():
+    matcher = TermMatcher(["Error"], patterns=["Fatal"], case_sensitive=True)
+    assert matcher.matches("Error here")
+    assert not matcher.matches("error or fatal here")
+
+def test_empty_matcher_is_falsy():
+    assert not TermMatcher([""])
+    assert TermMatcher(patterns=["x"])
@@ -0,0 +1,63 @@
+from datetime import timedelta
+from random import Random
+
+from logsentinel.utils.merge import ReorderBuffer, external_sort, merge_by_timestamp
+
+
+def test_merge_interleaves_sorted_streams(make_log_entry):
+    first = [make_log_entry(minute_offset=0), make_log_entry(minute_offset=3)]
+    second = [make_log_entry(minute_offset=1), make_log_entry(minute_offset=2)]
+    merged = list(merge_by_timestamp([first, second]))
+    assert merged == [first[0], second[0], second[1], first[1]]
+
+def test_merge_is_stable_for_equal_timestamps(make_log_entry):
+    first = [make_log_entry(message="from first")]
+    second = [make_log_entry(message="from second")]
+    merged = list(merge_by_timestamp([first, second]))
+    assert [entry.message for entry in merged] == ["from first", "from second"]
+
+def test_merge_empty():
+    assert list(merge_by_timestamp([])) == []
+
+def test_reorder_buffer_fixes_disorder_within_lateness(make_log_entry):
+    offsets = [0, 2, 1, 3, 5, 4, 6]
+    entries = [make_log_entry(minute_offset=offset) for offset in offsets]
+    buffer = ReorderBuffer(timedelta(minutes=1))
+    reordered = list(buffer.reorder(entries))
+    assert reordered == sorted(entries, key=lambda entry: entry.timestamp)
+    assert buffer.late == 0
+
+def test_reorder_buffer_releases_entries_once_the_window_passes(make_log_entry):
+    buffer = ReorderBuffer(timedelta(minutes=2))
+    released = []
+    stream = buffer.reorder(make_log_entry(minute_offset=offset) for offset in range(10))
+    for entry in stream:
+        released.append(entry)
+        if len(released) == 3:
+            break
+    # Only the window's worth of entries was pulled ahead of the output.
+    assert [entry.timestamp.minute for entry in released] == [0, 1, 2]
+
+def test_reorder_buffer_passes_late_entries_through(make_log_entry):
+    entries = [make_log_entry(minute_offset=offset) for offset in [0, 5, 1, 6]]
+    buffer = ReorderBuffer(timedelta(minutes=2))
+    assert [entry.timestamp.minute for entry in buffer.reorder(entries)] == [0, 1, 5, 6]
+    buffer = ReorderBuffer()
+    assert [entry.timestamp.minute for entry in buffer.reorder(entries)] == [0, 5, 1, 6]
+    assert buffer.late == 1
+
+def test_external_sort_spills_and_merges_runs(make_log_entry):
+    random = Random(7)
+    offsets = [random.randrange(60) for _ in range(500)]
+    entries = [
+        make_log_entry(minute_offset=offset, message=f"entry {position}")
+        for position, offset in enumerate(offsets)
+    ]
+    # 50 runs merged 4 at a time go through three levels of temp files.
+    result = list(external_sort(entries, run_size=10, fan_in=4))
+    assert result == sorted(entries, key=lambda entry: entry.timestamp)
+
+def test_external_sort_in_memory_and_empty(make_log_entry):
+    entries = [make_log_entry(minute_offset=offset) for offset in [3, 1, 2]]
+    assert [entry.timestamp.minute for entry in external_sort(entries)] == [1, 2, 3]
+    assert list(external_sort([])) == []
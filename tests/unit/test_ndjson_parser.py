@@ -0,0 +1,104 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from logsentinel.models import LogLevel
+from logsentinel.parsers import CloudWatchParser, NdjsonParser
+from logsentinel.storage import LogIndex, build_index
+
+parser = NdjsonParser()
+
+
+def ndjson(*events):
+    return "".join(json.dumps(event) + "\n" for event in events).encode()
+
+
+events = [
+    {"timestamp": 1705312245000, "message": "[INFO] started", "logGroupName": "/aws/lambda/a"},
+    {"timestamp": 1705312246000, "message": "[ERROR] RequestId: req-1 failed"},
+    {"timestamp": 1705312247000, "message": "plain"},
+]
+
+def test_iter_stream_reads_events_across_chunks():
+    stream = io.BytesIO(ndjson(*events) + b"\n  \n")
+    batches = list(NdjsonParser(chunk_size=16).iter_stream(stream, "pipe"))
+    entries = [entry for batch in batches for entry in batch]
+    assert [entry.message for entry in entries] == [event["message"] for event in events]
+    assert [entry.level for entry in entries] == [LogLevel.INFO, LogLevel.ERROR, LogLevel.UNKNOWN]
+    assert [entry.source for entry in entries] == ["/aws/lambda/a", "pipe", "pipe"]
+    assert entries[1].request_id == "req-1"
+    assert entries[0].timestamp.tzinfo is not None
+
+def test_iter_stream_matches_per_event_append():
+    stream = io.BytesIO(ndjson(*events))
+    (batch,) = parser.iter_stream(stream, "pipe")
+    expected = [
+        CloudWatchParser()._parse_event(event, event.get("logGroupName", "pipe"))
+        for event in events
+    ]
+    assert list(batch) == expected
+
+def test_iter_stream_respects_batch_size():
+    stream = io.BytesIO(ndjson(*events))
+    assert [len(batch) for batch in parser.iter_stream(stream, batch_size=2)] == [2, 1]
+
+def test_last_line_without_newline(tmp_path):
+    path = tmp_path / "app.ndjson"
+    path.write_bytes(ndjson(*events).rstrip(b"\n"))
+    entries = parser.parse_file(path)
+    assert len(entries) == 3
+    assert entries[2].source == "app.ndjson"
+
+def test_invalid_line_raises_value_error():
+    stream = io.BytesIO(ndjson(events[0]) + b'{"timestamp": 1, "mess\n')
+    with pytest.raises(ValueError, match="Invalid NDJSON line"):
+        list(parser.iter_stream(stream))
+
+@pytest.mark.parametrize("line", [b"[1, 2]", b'{"message": "no timestamp"}', b'{"timestamp": 1, "message": 5}'])
+def test_invalid_event_raises_value_error(line):
+    with pytest.raises(ValueError, match="Invalid NDJSON event"):
+        list(parser.iter_stream(io.BytesIO(line + b"\n")))
+
+def test_line_holding_two_events_is_rejected():
+    stream = io.BytesIO(b'{"timestamp": 1, "message": "a"}, {"timestamp": 2, "message": "b"}\n')
+    with pytest.raises(ValueError, match="Invalid NDJSON line"):
+        list(parser.iter_stream(stream))
+
+def test_explicit_fields_win_over_the_message():
+    stream = io.BytesIO(ndjson(
+        {"timestamp": 1, "level": "ERROR", "requestId": "r1", "correlationId": "c1", "message": "plain text"},
+        {"timestamp": 2, "level": "bogus", "message": "[WARNING] RequestId: r2 slow"},
+    ))
+    (batch,) = parser.iter_stream(stream)
+    first, second = batch
+    assert (first.level, first.request_id, first.correlation_id) == (LogLevel.ERROR, "r1", "c1")
+    assert (second.level, second.request_id) == (LogLevel.WARNING, "r2")
+
+def test_indexed_events_keep_explicit_fields(tmp_path):
+    path = tmp_path / "app.ndjson"
+    path.write_bytes(ndjson({"timestamp": 1, "level": "ERROR", "requestId": "r1", "message": "plain text"}))
+    with LogIndex(build_index(parser, path)) as index:
+        (entry,) = index.query(parser, path, [])
+    assert (entry.level, entry.request_id) == (LogLevel.ERROR, "r1")
+
+def test_is_not_a_cloudwatch_parser():
+    # The export byte scan does not apply to one event per line.
+    assert not isinstance(parser, CloudWatchParser)
+
+def test_parse_string():
+    entries = parser.parse_string(ndjson(*events).decode())
+    assert [entry.message for entry in entries] == [event["message"] for event in events]
+
+def test_missing_file():
+    with pytest.raises(FileNotFoundError):
+        parser.parse_file(Path("nonexistent.ndjson"))
+
+def test_index_spans_point_at_lines(tmp_path):
+    path = tmp_path / "app.ndjson"
+    path.write_bytes(ndjson(*events).replace(b"\n", b"\n\n", 1))
+    with LogIndex(build_index(parser, path)) as index:
+        batch = index.query(parser, path, [])
+        assert index.count == 3
+    assert [entry.message for entry in batch] == [event["message"] for event in events]
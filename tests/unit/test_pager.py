@@ -0,0 +1,100 @@
+import io
+from datetime import UTC, datetime, timedelta
+
+from rich.console import Console
+
+from logsentinel.formatters import Pager
+from logsentinel.formatters.pager import CHROME_LINES, KEYS
+from logsentinel.models import LogEntry, LogLevel
+
+start = datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC)
+
+
+def make_entries(count, pulled):
+    for index in range(count):
+        pulled.append(index)
+        yield LogEntry(
+            timestamp=start + timedelta(seconds=index),
+            level=LogLevel.ERROR if index % 7 == 0 else LogLevel.INFO,
+            message=f"event {index} " + "x" * 200,
+            source="/aws/lambda/app",
+            raw=f"event {index}",
+        )
+
+
+def make_pager(count, height=10, **kwargs):
+    pulled = []
+    console = Console(file=io.StringIO(), width=120, height=height)
+    return Pager(make_entries(count, pulled), console, **kwargs), pulled
+
+
+def render_text(pager):
+    pager.console.print(pager.render())
+    return pager.console.file.getvalue()
+
+
+def test_pager_first_page_reads_only_what_it_needs():
+    pager, pulled = make_pager(100_000)
+    render_text(pager)
+    assert pager.page_size == 10 - CHROME_LINES
+    # The width sample is all that is read ahead of the visible window.
+    assert len(pulled) <= 200 + pager.page_size
+    assert [entry.message.split()[1] for entry in pager.window()] == [
+        str(index) for index in range(pager.page_size)
+    ]
+
+def test_pager_rows_are_one_line_each():
+    pager, _ = make_pager(50)
+    output = render_text(pager)
+    lines = output.rstrip("\n").split("\n")
+    assert len(lines) == pager.console.size.height
+    assert "1-7 of 50" in lines[-1]
+
+def test_pager_scrolls_within_bounds():
+    pager, _ = make_pager(20)
+    pager.handle("up")
+    assert pager.top == 0
+    pager.handle("down")
+    pager.handle("page_down")
+    assert pager.top == 1 + pager.page_size
+    for _ in range(5):
+        pager.handle("page_down")
+    assert pager.top == 20 - pager.page_size
+    pager.handle("home")
+    assert pager.top == 0
+    pager.handle("end")
+    assert pager.window()[-1].message.startswith("event 19 ")
+
+def test_pager_status_marks_unread_input():
+    pager, _ = make_pager(1000)
+    assert "of 200+" in render_text(pager)
+    pager.handle("end")
+    assert "994-1000 of 1000" in render_text(pager)
+
+def test_pager_keeps_a_bounded_window_of_rows():
+    pager, pulled = make_pager(1000, max_rows=50)
+    pager.handle("end")
+    assert len(pulled) == 1000
+    assert len(pager._rows) < 2 * pager.max_rows
+    assert "994-1000 of 1000" in render_text(pager)
+    assert pager.window()[-1].message.startswith("event 999 ")
+    # Rows that were dropped cannot be scrolled back to.
+    pager.handle("home")
+    assert pager.top == pager._first > 0
+    assert pager.window()[0].message.startswith(f"event {pager.top} ")
+    for _ in range(3):
+        pager.handle("page_up")
+    assert pager.top == pager._first
+
+def test_pager_handles_empty_input():
+    pager, _ = make_pager(0)
+    pager.handle("page_down")
+    assert pager.window() == []
+    assert "0-0 of 0" in render_text(pager)
+
+def test_pager_run_stops_on_quit():
+    pager, _ = make_pager(30)
+    keys = iter(["j", "\x1b[B", "x", "q"])
+    pager.run(lambda: next(keys))
+    assert pager.top == 2
+    assert KEYS["\x1b"] == "quit"
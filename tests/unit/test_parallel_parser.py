@@ -0,0 +1,53 @@
+import pytest
+
+from logsentinel.filters import LevelFilter
+from logsentinel.models import LogLevel
+from logsentinel.parsers import CloudWatchParser, ParallelParser, expand_path
+
+
+def test_expand_directory(export_dir):
+    assert [path.name for path in expand_path(export_dir)] == ["a.json", "b.json"]
+
+def test_expand_glob(export_dir):
+    assert [path.name for path in expand_path(export_dir / "b*.json")] == ["b.json"]
+
+def test_expand_no_match(tmp_path):
+    assert expand_path(tmp_path / "missing-*.json") == []
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_iter_files_merges_by_timestamp(export_dir, jobs):
+    parallel = ParallelParser(CloudWatchParser(), jobs=jobs)
+    entries = list(parallel.iter_files(expand_path(export_dir)))
+    # Each file keeps its own order, as a single input does.
+    assert [entry.message for entry in entries] == [
+        "[INFO] a first",
+        "[ERROR] b first",
+        "[DEBUG] b out of order",
+        "[ERROR] a second",
+    ]
+    assert entries[0].source == "/aws/lambda/a"
+
+def test_iter_files_applies_filters(export_dir):
+    parallel = ParallelParser(CloudWatchParser(), jobs=2, filters=[LevelFilter(LogLevel.ERROR)])
+    entries = list(parallel.iter_files(expand_path(export_dir)))
+    assert [entry.message for entry in entries] == ["[ERROR] b first", "[ERROR] a second"]
+
+def test_iter_files_reports_invalid_file(export_dir):
+    (export_dir / "c.json").write_text("{")
+    parallel = ParallelParser(CloudWatchParser(), jobs=2)
+    with pytest.raises(ValueError, match="c.json"):
+        list(parallel.iter_files(expand_path(export_dir)))
+
+def test_iter_streams_keeps_file_order(export_dir):
+    parallel = ParallelParser(CloudWatchParser(), filters=[LevelFilter(LogLevel.DEBUG)])
+    streams = parallel.iter_streams(expand_path(export_dir))
+    assert [[entry.message for entry in stream] for stream in streams] == [
+        ["[INFO] a first", "[ERROR] a second"],
+        ["[ERROR] b first", "[DEBUG] b out of order"],
+    ]
+
+def test_iter_streams_reports_invalid_file(export_dir):
+    (export_dir / "c.json").write_text("{")
+    streams = ParallelParser(CloudWatchParser()).iter_streams(expand_path(export_dir))
+    with pytest.raises(ValueError, match="c.json"):
+        list(streams[-1])
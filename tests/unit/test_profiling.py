@@ -0,0 +1,69 @@
+import pstats
+import time
+
+from logsentinel.utils.profiling import Profiler, StackSampler, StageStats
+
+
+def slow(items, delay):
+    for item in items:
+        time.sleep(delay)
+        yield item
+
+
+def test_wrap_charges_each_stage_its_own_time():
+    profiler = Profiler()
+    parsed = profiler.wrap("parse", slow(range(5), 0.01))
+    filtered = profiler.wrap("filter", slow(parsed, 0.002))
+    assert list(filtered) == list(range(5))
+    parse, filter_stage = profiler.stages["parse"], profiler.stages["filter"]
+    assert parse.entries == filter_stage.entries == 5
+    assert parse.seconds >= 0.05
+    # The filter's own sleeps only, not the parse time it waited for.
+    assert 0.01 <= filter_stage.seconds < 0.04
+    assert parse.peak_rss > 0
+
+def test_wrap_counts_batches_and_lists_stages_in_order():
+    profiler = Profiler()
+    formatted = profiler.wrap("format", [])
+    batches = profiler.wrap("parse", [[1, 2], [3]], len)
+    assert sum(map(len, batches)) == 3
+    assert list(formatted) == []
+    assert profiler.stages["parse"].entries == 3
+    assert list(profiler.stages) == ["format", "parse"]
+
+def test_measure_nests_inside_stages():
+    profiler = Profiler()
+    with profiler.measure("format") as stage:
+        for _ in profiler.wrap("parse", slow(range(3), 0.01)):
+            time.sleep(0.001)
+    assert stage.seconds < profiler.stages["parse"].seconds
+
+def test_rates():
+    stage = StageStats("parse", seconds=2.0, entries=100, bytes=4000)
+    assert stage.entries_per_second == 50
+    assert stage.bytes_per_second == 2000
+    assert StageStats("idle").entries_per_second == 0
+
+def test_finish_calls_hooks_and_writes_dumps(tmp_path):
+    seen = []
+    pstats_path = tmp_path / "run.pstats"
+    stacks_path = tmp_path / "run.folded"
+    profiler = Profiler([seen.append], pstats_path, stacks_path)
+    profiler.start()
+    list(profiler.wrap("parse", slow(range(3), 0.01)))
+    stages = profiler.finish()
+    assert [stage.name for stage in seen] == [stage.name for stage in stages] == ["parse"]
+    assert pstats.Stats(str(pstats_path)).total_calls > 0
+    lines = stacks_path.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+def test_sampler_collapses_stacks():
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    slow_until = time.perf_counter() + 0.05
+    while time.perf_counter() < slow_until:
+        pass
+    sampler.stop()
+    assert any("test_sampler_collapses_stacks" in stack for stack in sampler.counts)
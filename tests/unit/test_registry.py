@@ -0,0 +1,108 @@
+import gzip
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from logsentinel.parsers import (
+    CloudWatchParser,
+    NdjsonParser,
+    decompress,
+    detect,
+    detect_paths,
+    detect_stream,
+    get_parser,
+    open_input,
+    parser_types,
+    registry,
+)
+
+sample = Path(__file__).parent.parent / "fixtures" / "cloudwatch_sample.json"
+
+
+class PluginParser(NdjsonParser):
+    @staticmethod
+    def sniff(head):
+        return head.startswith(b"PLUGIN")
+
+
+class FakeEntryPoint:
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+
+    def load(self):
+        return self.target
+
+
+@pytest.fixture
+def plugin(monkeypatch):
+    points = [FakeEntryPoint("plugin", PluginParser), FakeEntryPoint("cloudwatch", PluginParser)]
+    monkeypatch.setattr(registry, "entry_points", lambda group: points)
+    parser_types.cache_clear()
+    yield
+    parser_types.cache_clear()
+
+
+def test_detect_builtin_formats():
+    assert detect(sample.read_bytes()[:4096]) == "cloudwatch"
+    assert detect(b'{"timestamp": 1, "message": "[INFO] a"}\n{"timestamp": 2, "message": "b"}\n') == "ndjson"
+    assert detect(b'{"events": [{"timestamp": 1, "type": "ExecutionStarted", "id": 1, "previousEventId": 0}]}') == "step-functions"
+    assert detect(b'{"messageType": "DATA_MESSAGE", "logGroup": "/a", "logEvents": []}') == "subscription"
+    assert detect(b"START RequestId: abc Version: $LATEST\n") == "lambda-text"
+    # Unrecognised input is left to the export parser to reject.
+    assert detect(b"garbage") == "cloudwatch"
+
+def test_single_line_export_is_not_ndjson():
+    export = json.dumps({"logGroupName": "/a", "logEvents": [{"timestamp": 1, "message": "x"}]})
+    assert detect(export.encode()) == "cloudwatch"
+
+def test_detect_paths_reads_compressed_files(tmp_path):
+    path = tmp_path / "export.json.gz"
+    path.write_bytes(gzip.compress(sample.read_bytes()))
+    assert detect_paths([path, sample]) == "cloudwatch"
+    assert [entry.message for entry in CloudWatchParser().parse_file(path)] == [
+        entry.message for entry in CloudWatchParser().parse_file(sample)
+    ]
+
+def test_detect_paths_rejects_mixed_formats(tmp_path):
+    text = tmp_path / "lambda.log"
+    text.write_text("START RequestId: abc Version: $LATEST\n")
+    with pytest.raises(ValueError, match="different formats"):
+        detect_paths([sample, text])
+
+def test_compressed_exports_skip_the_byte_scan_and_index(tmp_path):
+    path = tmp_path / "export.json.gz"
+    path.write_bytes(gzip.compress(sample.read_bytes()))
+    assert CloudWatchParser().scan(path, []) is None
+    with pytest.raises(ValueError):
+        list(CloudWatchParser().iter_event_spans(path))
+
+def test_only_exports_and_ndjson_can_be_indexed():
+    from logsentinel.parsers import EventParser
+    from logsentinel.storage.index import IndexableParser
+    indexable = {name for name, kind in parser_types().items() if isinstance(kind(), IndexableParser)}
+    assert indexable == {"cloudwatch", "ndjson"}
+    assert all(issubclass(parser_types()[name], EventParser) for name in ("cloudwatch", "ndjson", "lambda-text", "step-functions", "subscription"))
+
+def test_decompress_stream_and_detect():
+    stream = decompress(io.BytesIO(gzip.compress(b"START RequestId: abc Version: $LATEST\n")))
+    assert detect_stream(stream) == "lambda-text"
+    # Detection only peeks.
+    assert stream.read().startswith(b"START")
+
+def test_open_input_passes_plain_files_through():
+    with open_input(sample) as stream:
+        assert stream.read() == sample.read_bytes()
+
+def test_get_parser():
+    assert isinstance(get_parser("ndjson"), NdjsonParser)
+    with pytest.raises(ValueError, match="Unknown format"):
+        get_parser("syslog")
+
+def test_entry_point_plugins(plugin):
+    assert isinstance(get_parser("plugin"), PluginParser)
+    # Built-in names cannot be taken over.
+    assert type(get_parser("cloudwatch")) is CloudWatchParser
+    assert detect(b"PLUGIN data") == "plugin"
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from logsentinel.filters import LevelFilter, SearchFilter, TimeRangeFilter
+from logsentinel.models import LogBatch, LogLevel
+from logsentinel.parsers import CloudWatchParser
+from logsentinel.parsers.scan import ExportScanner
+
+parser = CloudWatchParser()
+
+messages = [
+    "[INFO] started",
+    "[ERROR] needle in the haystack",
+    "START RequestId: req-1 Version: $LATEST",
+    '[DEBUG] payload {"message": "[ERROR] needle", "timestamp": 1}',
+    '[WARNING] quote \\" and brace { and "Needle"',
+    "[CRITICAL] NEEDLE} in caps",
+    "[INFO] unicode café",
+    "[ERROR]no space",
+]
+
+
+def write(tmp_path, events, **dump_options):
+    path = tmp_path / "export.json"
+    export = {"logGroupName": "/aws/lambda/app", "logEvents": events}
+    path.write_text(json.dumps(export, **dump_options), encoding="utf-8")
+    return path
+
+
+def events_for(messages):
+    return [
+        {"timestamp": 1705312245000 + index, "message": message}
+        for index, message in enumerate(messages)
+    ]
+
+
+def full_parse(path, filters):
+    result = LogBatch()
+    for batch in parser.iter_batches(path):
+        for entry_filter in filters:
+            batch = entry_filter.apply_batch(batch)
+        result.extend(batch)
+    return list(result)
+
+
+@pytest.mark.parametrize("dump_options", [{}, {"indent": 2}, {"ensure_ascii": False}])
+@pytest.mark.parametrize("filters", [
+    [LevelFilter(LogLevel.ERROR)],
+    [LevelFilter(LogLevel.WARNING), SearchFilter("needle")],
+    [SearchFilter("needle")],
+    [SearchFilter("{")],
+    [SearchFilter(["haystack", "caps"])],
+    [SearchFilter(["needle", "caps"], match_all=True)],
+])
+def test_scan_matches_full_parse(tmp_path, filters, dump_options):
+    path = write(tmp_path, events_for(messages), **dump_options)
+    scanned = parser.scan(path, filters)
+    assert scanned is not None
+    assert list(scanned) == full_parse(path, filters)
+
+def test_nested_event_shaped_objects_are_not_events(tmp_path):
+    events = events_for(["[INFO] outer", "[INFO] other"])
+    events[0]["detail"] = {"timestamp": 1, "message": "[ERROR] needle"}
+    events[1]["items"] = [{"timestamp": 2, "message": "[ERROR] needle"}]
+    path = write(tmp_path, events)
+    for filters in ([SearchFilter("needle")], [LevelFilter(LogLevel.ERROR)]):
+        scanned = parser.scan(path, filters)
+        assert scanned is not None
+        assert list(scanned) == full_parse(path, filters)
+
+def test_keywords_in_other_fields_only_narrow(tmp_path):
+    events = events_for(["[INFO] plain"])
+    events[0]["logStreamName"] = "needle-stream"
+    path = write(tmp_path, events)
+    assert list(parser.scan(path, [SearchFilter("needle")])) == []
+
+def test_escaped_ascii_falls_back(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(
+        '{"logGroupName": "g", "logEvents": '
+        '[{"timestamp": 1, "message": "[ERROR] \\u006eeedle"}]}'
+    )
+    assert parser.scan(path, [SearchFilter("needle")]) is None
+    assert parser.scan(path, [LevelFilter(LogLevel.ERROR)]) is None
+
+def test_case_folding_characters_fall_back(tmp_path):
+    # "ſ" casefolds to "s", so no raw byte scan can find it for "s".
+    path = write(tmp_path, events_for(["[INFO] ſtop"]))
+    assert parser.scan(path, [SearchFilter("stop")]) is None
+    assert parser.scan(path, [LevelFilter(LogLevel.ERROR)]) is not None
+
+def test_filters_that_cannot_narrow(tmp_path):
+    path = write(tmp_path, events_for(messages))
+    assert parser.scan(path, []) is None
+    assert parser.scan(path, [SearchFilter(patterns=["need.e"])]) is None
+    assert parser.scan(path, [SearchFilter("café")]) is None
+    assert parser.scan(path, [LevelFilter(LogLevel.DEBUG)]) is None
+    assert parser.scan(path, [TimeRangeFilter()]) is None
+
+def test_unusual_layouts_fall_back(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps({"logEvents": events_for(messages), "logGroupName": "g"}))
+    assert parser.scan(path, [SearchFilter("needle")]) is None
+    path.write_text(json.dumps({"logGroupName": "g", "logEvents": []}))
+    assert parser.scan(path, [SearchFilter("needle")]) is None
+
+def test_unselective_scan_gives_up(tmp_path, monkeypatch):
+    monkeypatch.setattr("logsentinel.parsers.scan.MIN_SELECTIVITY_SPAN", 0)
+    path = write(tmp_path, events_for(["[INFO] common"] * 50))
+    assert parser.scan(path, [SearchFilter("common")]) is None
+
+def test_large_events_grow_the_decode_window(tmp_path):
+    path = write(tmp_path, events_for(["[ERROR] " + "x" * 20000, "[INFO] y"]))
+    with ExportScanner(path) as scanner:
+        (start,) = scanner.level_candidates([LogLevel.ERROR])
+        assert scanner.path == path
+    assert len(list(parser.scan(path, [LevelFilter(LogLevel.ERROR)]))) == 1
+
+def test_truncated_export_raises(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text('{"logGroupName": "g", "logEvents": [{"timestamp": 1, "message": "[ERROR] x"')
+    with pytest.raises(ValueError):
+        parser.scan(path, [LevelFilter(LogLevel.ERROR)])
@@ -1,4 +1,5 @@
 from logsentinel.filters import SearchFilter
+from logsentinel.models import LogBatch
 
 def test_search_insensitive_match(entries_for_search_filter):
     result = SearchFilter("error").apply(entries_for_search_filter)
@@ -22,4 +23,24 @@ def test_search_match_metadata(entries_for_search_filter):
 
 def test_search_not_match(entries_for_search_filter):
     result = SearchFilter("match").apply(entries_for_search_filter)
-    assert len(result) == 0
\ No newline at end of file
+    assert len(result) == 0
+def test_search_stream_matches_apply(entries_for_search_filter):
+    search_filter = SearchFilter("replica")
+    assert list(search_filter.stream(iter(entries_for_search_filter))) == search_filter.apply(entries_for_search_filter)
+
+def test_search_apply_batch_matches_metadata(entries_for_search_filter):
+    batch = LogBatch.from_entries(entries_for_search_filter)
+    result = SearchFilter("replica").apply_batch(batch)
+    assert list(result) == [entries_for_search_filter[1]]
+
+def test_search_multiple_keywords_any(entries_for_search_filter):
+    result = SearchFilter(["heartbeat", "replica"]).apply(entries_for_search_filter)
+    assert len(result) == 2
+
+def test_search_multiple_keywords_all(entries_for_search_filter):
+    result = SearchFilter(["background", "replica"], match_all=True).apply(entries_for_search_filter)
+    assert len(result) == 1
+
+def test_search_patterns(entries_for_search_filter):
+    result = SearchFilter(patterns=[r"^\[error\]"]).apply(entries_for_search_filter)
+    assert len(result) == 1
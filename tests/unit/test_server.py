@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from logsentinel.server import LogStore, Query, QueryServer, ServerClient, find_server
+from logsentinel.server.client import remove_state, state_path, write_state
+
+
+@pytest.fixture
+def query_server(tmp_path):
+    server = QueryServer(LogStore(), ("127.0.0.1", 0), [tmp_path])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(query_server):
+    return ServerClient("127.0.0.1", query_server.server_port)
+
+
+@pytest.fixture
+def log_file(write_export):
+    return write_export("export.json", "/aws/lambda/app", [
+        (1705312245000, "[INFO] Connection established"),
+        (1705312246000, "[ERROR] RequestId: req-1 Database timeout"),
+        (1705312247000, "[WARNING] RequestId: req-1 Retrying"),
+        (1705312248000, "[ERROR] RequestId: req-2 Payment failed"),
+    ])
+
+
+def messages(batches):
+    return [entry.message for batch in batches for entry in batch]
+
+
+def test_query_round_trips(client, query_server, log_file):
+    query = Query(paths=[str(log_file)], level="ERROR")
+    assert messages(client.query(query)) == ["[ERROR] RequestId: req-1 Database timeout", "[ERROR] RequestId: req-2 Payment failed"]
+    assert messages(client.query(Query(paths=[str(log_file)], search=["req-1"], limit=1))) == ["[ERROR] RequestId: req-1 Database timeout"]
+    assert messages(client.query(Query(paths=[str(log_file)], search=["payment"], since="2024-01-15T09:50:47"))) == ["[ERROR] RequestId: req-2 Payment failed"]
+    assert query_server.queries == 3
+    assert query_server.store.loads == 1
+
+def test_status(client, log_file):
+    client.query(Query(paths=[str(log_file)]))
+    status = client.status()
+    assert status["pid"] == os.getpid()
+    assert status["queries"] == 1
+    assert [dataset["path"] for dataset in status["datasets"]] == [str(log_file.resolve())]
+    assert status["datasets"][0]["entries"] == 4
+
+def test_query_errors(client, tmp_path, log_file):
+    broken = tmp_path / "broken.json"
+    broken.write_text('{"logEvents": [')
+    with pytest.raises(ValueError, match="broken.json"):
+        client.query(Query(paths=[str(log_file), str(broken)], format="cloudwatch"))
+    with pytest.raises(ValueError, match="missing.json not found"):
+        client.query(Query(paths=[str(tmp_path / "missing.json")], format="cloudwatch"))
+    with pytest.raises(ValueError, match="Invalid level LOUD"):
+        client.query(Query(paths=[str(log_file)], level="LOUD"))
+    with pytest.raises(ValueError, match="No route /nothing"):
+        client._json("GET", "/nothing")
+    # Wrongly typed fields are answered with a 400 instead of a dropped connection.
+    with pytest.raises(ValueError, match="Invalid query \\(limit '3'\\)"):
+        client._json("POST", "/query", {"paths": [str(log_file)], "limit": "3"})
+    with pytest.raises(ValueError, match="Invalid query \\(level 5\\)"):
+        client._json("POST", "/query", {"paths": [str(log_file)], "level": 5})
+
+def test_query_only_reads_served_files(client, query_server, tmp_path, log_file):
+    outside = tmp_path.parent / "outside.json"
+    outside.write_text(log_file.read_text())
+    # Refused as an OSError, so `parse` reads the file itself instead.
+    with pytest.raises(PermissionError, match="outside.json not served"):
+        client.query(Query(paths=[str(log_file), str(outside)]))
+    with pytest.raises(PermissionError):
+        client.query(Query(paths=[str(tmp_path / ".." / "outside.json")]))
+    assert query_server.store.loads == 0
+    query_server.roots = [log_file.resolve()]
+    assert len(messages(client.query(Query(paths=[str(log_file)])))) == 4
+
+def test_query_from_dict_rejects_bad_queries():
+    with pytest.raises(ValueError, match="no paths"):
+        Query.from_dict({"paths": []})
+    with pytest.raises(ValueError, match="Invalid query"):
+        Query.from_dict({"paths": ["a"], "colour": "red"})
+    with pytest.raises(ValueError, match="Invalid query"):
+        Query.from_dict(["a"])
+    for name, value in [("paths", "a"), ("paths", [1]), ("format", None), ("level", 5), ("search", "x"), ("regex", [None]), ("match_all", 1), ("since", 0), ("until", []), ("limit", "3"), ("limit", True), ("limit", -1)]:
+        with pytest.raises(ValueError, match=f"Invalid query \\({name} "):
+            Query.from_dict({"paths": ["a"], name: value})
+    query = Query(paths=["a"], search=["x"], since="2024-01-15T10:00:00+01:00")
+    assert Query.from_dict(query.to_dict()) == query
+    assert query.filters()[1]._start == int(datetime(2024, 1, 15, 9, tzinfo=timezone.utc).timestamp() * 1000)
+
+def test_find_server(tmp_path, query_server):
+    assert find_server(tmp_path) is None
+    write_state(tmp_path, "127.0.0.1", query_server.server_port)
+    client = find_server(tmp_path)
+    assert client is not None and client.port == query_server.server_port
+    remove_state(tmp_path)
+    assert not state_path(tmp_path).exists()
+
+def test_find_server_ignores_stale_state(tmp_path, query_server):
+    port = query_server.server_port
+    query_server.shutdown()
+    query_server.server_close()
+    write_state(tmp_path, "127.0.0.1", port)
+    assert find_server(tmp_path) is None
+    state_path(tmp_path).write_text("{")
+    assert find_server(tmp_path) is None
+    state_path(tmp_path).write_text("[]")
+    assert find_server(tmp_path) is None
+
+def test_find_server_skips_exited_servers_without_connecting(tmp_path, monkeypatch):
+    def status(self, timeout=None):
+        raise AssertionError("connected")
+    monkeypatch.setattr(ServerClient, "status", status)
+    process = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True, check=True)
+    state_path(tmp_path).write_text(json.dumps({"host": "127.0.0.1", "port": 1, "pid": int(process.stdout)}))
+    assert find_server(tmp_path) is None
+
+def test_remove_state_leaves_other_servers_alone(tmp_path):
+    state_path(tmp_path).write_text(json.dumps({"host": "127.0.0.1", "port": 1, "pid": os.getpid() + 1}))
+    remove_state(tmp_path)
+    assert state_path(tmp_path).exists()
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+
+from logsentinel.analysis import LogStats
+from logsentinel.models import LogBatch, LogLevel
+
+BASE = 1705312200000  # 2024-01-15T09:50:00Z, on a 5 minute boundary
+
+
+def make_batch():
+    batch = LogBatch()
+    batch.append(BASE + 1_000, LogLevel.INFO, "[INFO] start", "/aws/lambda/a")
+    batch.append(BASE + 2_000, LogLevel.ERROR, "[ERROR] boom", "/aws/lambda/a")
+    batch.append(BASE + 400_000, LogLevel.CRITICAL, "[CRITICAL] down", "/aws/lambda/a")
+    batch.append(
+        BASE + 3_000,
+        LogLevel.UNKNOWN,
+        "REPORT RequestId: r1\tDuration: 12.50 ms\tBilled Duration: 13 ms",
+        "/aws/lambda/b",
+    )
+    batch.append(
+        BASE + 4_000,
+        LogLevel.UNKNOWN,
+        "REPORT RequestId: r2 Init Duration: 100.00 ms Duration: 30.00 ms Billed Duration: 31 ms",
+        "/aws/lambda/b",
+    )
+    return batch
+
+
+def test_counts_by_source_bucket_and_level():
+    stats = LogStats()
+    stats.add_batch(make_batch())
+    assert stats.counts["/aws/lambda/a", BASE, LogLevel.ERROR] == 1
+    assert stats.counts["/aws/lambda/a", BASE + 300_000, LogLevel.CRITICAL] == 1
+    assert stats.entries == 5
+    assert stats.errors == 2
+    source = stats.sources["/aws/lambda/a"]
+    assert source.error_rate == pytest.approx(2 / 3)
+    assert (source.first_error, source.last_error) == (BASE + 2_000, BASE + 400_000)
+    assert stats.sources["/aws/lambda/b"].first_error is None
+    assert [(bucket, name) for bucket, name, _ in stats.buckets()] == [
+        (BASE, "/aws/lambda/a"),
+        (BASE, "/aws/lambda/b"),
+        (BASE + 300_000, "/aws/lambda/a"),
+    ]
+
+def test_report_durations_feed_quantiles():
+    stats = LogStats()
+    stats.add_batch(make_batch())
+    durations = stats.sources["/aws/lambda/b"].durations
+    assert len(durations) == 2
+    assert durations.quantile(0) == 12.5
+    assert durations.quantile(1) == 30.0
+    assert len(stats.durations) == 2
+
+def test_merge_equals_single_pass():
+    whole = LogStats()
+    whole.add_batch(make_batch())
+    whole.add_batch(make_batch())
+    left, right = LogStats(), LogStats()
+    left.add_batch(make_batch())
+    right.feed(list(make_batch()))
+    left.merge(right)
+    assert left.counts == whole.counts
+    assert left.errors == whole.errors
+    assert len(left.durations) == len(whole.durations)
+    with pytest.raises(ValueError):
+        left.merge(LogStats(timedelta(minutes=1)))
+
+def test_bucket_must_be_positive():
+    with pytest.raises(ValueError):
+        LogStats(timedelta(0))
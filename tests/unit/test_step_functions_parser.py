@@ -0,0 +1,48 @@
+import io
+import json
+
+import pytest
+
+from logsentinel.models import LogLevel
+from logsentinel.parsers import StepFunctionsParser
+
+parser = StepFunctionsParser()
+
+events = [
+    {"timestamp": "2024-01-15T10:00:00.000000+00:00", "type": "ExecutionStarted", "id": 1, "previousEventId": 0, "executionStartedEventDetails": {"input": "{}"}},
+    {"timestamp": "2024-01-15T10:00:00.100000+00:00", "type": "TaskStateEntered", "id": 2, "previousEventId": 1, "stateEnteredEventDetails": {"name": "Charge", "input": "{}"}},
+    {"timestamp": 1705312801.5, "type": "TaskFailed", "id": 3, "previousEventId": 2, "taskFailedEventDetails": {"resource": "invoke", "error": "States.Timeout", "cause": "took too long"}},
+    {"timestamp": "2024-01-15T10:00:02Z", "type": "ExecutionAborted", "id": 4, "previousEventId": 3},
+]
+
+
+def test_history_events_become_entries():
+    entries = parser.parse_string(json.dumps({"events": events, "nextToken": None}))
+    assert [entry.message for entry in entries] == [
+        "ExecutionStarted",
+        "TaskStateEntered Charge",
+        "TaskFailed invoke States.Timeout - took too long",
+        "ExecutionAborted",
+    ]
+    assert [entry.level for entry in entries] == [LogLevel.INFO, LogLevel.INFO, LogLevel.ERROR, LogLevel.WARNING]
+    assert entries[2].timestamp.isoformat() == "2024-01-15T10:00:01.500000+00:00"
+
+def test_bare_event_array(tmp_path):
+    path = tmp_path / "history.json"
+    path.write_text(json.dumps(events))
+    assert len(parser.parse_file(path)) == 4
+    assert parser.parse_file(path)[0].source == "history.json"
+
+def test_iter_stream_respects_batch_size():
+    stream = io.BytesIO(json.dumps({"events": events}).encode())
+    assert [len(batch) for batch in parser.iter_stream(stream, batch_size=3)] == [3, 1]
+
+def test_invalid_histories_raise_value_error():
+    with pytest.raises(ValueError):
+        parser.parse_string('{"executions": []}')
+    with pytest.raises(ValueError):
+        parser.parse_string('{"events": [{"id": 1}]}')
+
+def test_sniff():
+    assert StepFunctionsParser.sniff(json.dumps({"events": events}).encode())
+    assert not StepFunctionsParser.sniff(b'{"logGroupName": "/a", "logEvents": []}')
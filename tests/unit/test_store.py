@@ -0,0 +1,139 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from logsentinel.filters import LevelFilter, SearchFilter, TimeRangeFilter
+from logsentinel.models import LogBatch, LogLevel
+from logsentinel.parsers import CloudWatchParser, NdjsonParser
+from logsentinel.server import Dataset, LogStore, MemoryIndex
+from logsentinel.storage.fingerprint import Fingerprint
+
+
+def ndjson(*events):
+    return "".join(json.dumps(event) + "\n" for event in events)
+
+
+events = [
+    {"timestamp": 1705312245000, "message": "[INFO] started", "logGroupName": "/aws/lambda/a"},
+    {"timestamp": 1705312246000, "message": "[ERROR] RequestId: req-1 failed", "logGroupName": "/aws/lambda/b"},
+    {"timestamp": 1705312247000, "message": "[WARNING] RequestId: req-2 slow", "logGroupName": "/aws/lambda/a"},
+    {"timestamp": 1705312248000, "message": "[ERROR] RequestId: req-2 timeout", "logGroupName": "/aws/lambda/a"},
+]
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.ndjson"
+    path.write_text(ndjson(*events))
+    return path
+
+
+def messages(batch):
+    return [entry.message for entry in batch]
+
+
+def test_memory_index_time_candidates_on_unsorted_rows(make_log_entry):
+    index = MemoryIndex()
+    offsets = [3, 0, 2, 1]
+    index.add(LogBatch.from_entries([make_log_entry(minute_offset=offset) for offset in offsets]))
+    assert not index.timestamps_sorted
+    start = int(datetime(2024, 1, 15, 10, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    end = int(datetime(2024, 1, 15, 10, 2, tzinfo=timezone.utc).timestamp() * 1000)
+    assert list(index.time_candidates(start, end)) == [2, 3]
+    assert list(index.time_candidates(None, None)) == [0, 1, 2, 3]
+
+def test_dataset_query_without_filters_does_not_copy(log_file):
+    dataset = LogStore().dataset(log_file, NdjsonParser())
+    assert dataset.query([]) is dataset.batch
+    assert messages(dataset.query([LevelFilter(LogLevel.ERROR)])) == [events[1]["message"], events[3]["message"]]
+    assert messages(dataset.query([SearchFilter(["req-2"]), LevelFilter(LogLevel.ERROR)])) == [events[3]["message"]]
+
+def test_dataset_query_matches_filters_on_every_row(log_file):
+    dataset = LogStore().dataset(log_file, NdjsonParser())
+    entries = NdjsonParser().parse_file(log_file)
+    time_filter = TimeRangeFilter(
+        datetime(2024, 1, 15, 10, 0, 46, tzinfo=timezone.utc),
+        datetime(2024, 1, 15, 10, 0, 47, tzinfo=timezone.utc),
+    )
+    for filters in ([time_filter], [SearchFilter(["requestid"])], [time_filter, LevelFilter(LogLevel.WARNING)]):
+        expected = entries
+        for entry_filter in filters:
+            expected = entry_filter.apply(expected)
+        assert messages(dataset.query(filters)) == messages(expected)
+
+def test_store_keeps_loaded_files(log_file):
+    store = LogStore()
+    first = store.dataset(log_file, NdjsonParser())
+    assert store.dataset(log_file, NdjsonParser()) is first
+    assert store.loads == 1
+
+def test_store_parses_only_appended_lines(log_file):
+    store = LogStore()
+    dataset = store.dataset(log_file, NdjsonParser())
+    extra = {"timestamp": 1705312249000, "message": "[ERROR] RequestId: req-3 crashed"}
+    with log_file.open("a") as stream:
+        stream.write(ndjson(extra))
+        # A line still being written waits for the next query.
+        stream.write('{"timestamp": 1705312250000, "mess')
+    assert store.dataset(log_file, NdjsonParser()) is dataset
+    assert (store.loads, store.appends) == (1, 1)
+    assert messages(dataset.query([SearchFilter(["req-3"])])) == [extra["message"]]
+    assert len(dataset) == 5
+    with log_file.open("a") as stream:
+        stream.write('age": "[INFO] done"}\n')
+    assert messages(store.dataset(log_file, NdjsonParser()).batch)[-1] == "[INFO] done"
+    assert (store.loads, store.appends) == (1, 2)
+
+def test_store_reloads_rewritten_files(log_file):
+    store = LogStore()
+    store.dataset(log_file, NdjsonParser())
+    log_file.write_text(ndjson(*events[:2]))
+    assert len(store.dataset(log_file, NdjsonParser())) == 2
+    assert (store.loads, store.appends) == (2, 0)
+
+def test_store_reloads_for_another_parser(write_export):
+    path = write_export("export.json", "/aws/lambda/app", [(1705312245000, "[INFO] ok")])
+    store = LogStore()
+    dataset = Dataset(path.resolve(), NdjsonParser(), Fingerprint.of(path))
+    store.datasets[path.resolve()] = dataset
+    assert store.dataset(path, CloudWatchParser()) is not dataset
+    assert store.loads == 1
+
+def test_store_evicts_least_recently_queried(tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.ndjson"
+        path.write_text(ndjson(*events))
+        paths.append(path)
+    store = LogStore()
+    store.query(paths[:1], NdjsonParser(), [])
+    store.memory_budget = 2 * store.nbytes
+    store.query(paths[1:2], NdjsonParser(), [])
+    store.query(paths[:1], NdjsonParser(), [])
+    store.query(paths[2:], NdjsonParser(), [])
+    assert list(store.datasets) == [paths[0].resolve(), paths[2].resolve()]
+    assert store.evictions == 1
+    # The files a query needs stay, even past the budget.
+    store.memory_budget = 0
+    assert len(store.query(paths, NdjsonParser(), [])) == 12
+    assert len(store.datasets) == 3
+
+def test_store_query_merges_files_by_time(tmp_path):
+    first = tmp_path / "first.ndjson"
+    second = tmp_path / "second.ndjson"
+    first.write_text(ndjson(events[0], events[3]))
+    second.write_text(ndjson(events[2], events[1]))
+    store = LogStore()
+    assert messages(store.query([second], NdjsonParser(), [])) == [events[2]["message"], events[1]["message"]]
+    merged = store.query([first, second], NdjsonParser(), [])
+    # Files keep the order they were written in and are merged by time.
+    assert messages(merged) == [events[0]["message"], events[2]["message"], events[1]["message"], events[3]["message"]]
+    merged = store.query([first, second], NdjsonParser(), [LevelFilter(LogLevel.ERROR)])
+    assert messages(merged) == [events[1]["message"], events[3]["message"]]
+
+def test_store_query_names_the_invalid_file(tmp_path, log_file):
+    broken = tmp_path / "broken.ndjson"
+    broken.write_text('{"timestamp": 1, "message": "x"}\n{')
+    with pytest.raises(ValueError, match="broken.ndjson"):
+        LogStore().query([log_file, broken], NdjsonParser(), [])
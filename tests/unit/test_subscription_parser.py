@@ -0,0 +1,65 @@
+import base64
+import gzip
+import io
+import json
+
+import pytest
+
+from logsentinel.models import LogLevel
+from logsentinel.parsers import SubscriptionParser
+
+parser = SubscriptionParser()
+
+payload = {
+    "messageType": "DATA_MESSAGE",
+    "owner": "123456789012",
+    "logGroup": "/aws/lambda/orders",
+    "logStream": "2024/01/15/[$LATEST]abc",
+    "subscriptionFilters": ["errors"],
+    "logEvents": [
+        {"id": "1", "timestamp": 1705312800000, "message": "[ERROR] RequestId: req-1 boom"},
+        {"id": "2", "timestamp": 1705312800100, "message": "[INFO] done"},
+    ],
+}
+control = {"messageType": "CONTROL_MESSAGE", "logGroup": "", "logEvents": [{"id": "", "timestamp": 1, "message": "CWL CONTROL MESSAGE"}]}
+
+
+def encode(data):
+    return base64.b64encode(gzip.compress(json.dumps(data).encode())).decode()
+
+
+def messages(content):
+    return [entry.message for entry in parser.parse_string(content)]
+
+def test_base64_lines_skip_control_messages():
+    entries = parser.parse_string(f"{encode(control)}\n{encode(payload)}\n")
+    assert [entry.message for entry in entries] == ["[ERROR] RequestId: req-1 boom", "[INFO] done"]
+    assert [entry.level for entry in entries] == [LogLevel.ERROR, LogLevel.INFO]
+    assert entries[0].source == "/aws/lambda/orders"
+    assert entries[0].request_id == "req-1"
+
+def test_lambda_events_and_kinesis_records():
+    content = json.dumps({"awslogs": {"data": encode(payload)}}) + json.dumps({"data": encode(payload)})
+    assert len(messages(content)) == 4
+
+def test_concatenated_decoded_payloads_from_firehose(tmp_path):
+    path = tmp_path / "delivery.gz"
+    path.write_bytes(gzip.compress((json.dumps(payload) * 3).encode()))
+    entries = parser.parse_file(path)
+    assert len(entries) == 6
+    assert entries[-1].message == "[INFO] done"
+
+def test_iter_stream_respects_batch_size():
+    stream = io.BytesIO(f"{encode(payload)}\n{encode(payload)}".encode())
+    assert [len(batch) for batch in parser.iter_stream(stream, batch_size=2)] == [2, 2]
+
+def test_invalid_records_raise_value_error():
+    with pytest.raises(ValueError):
+        parser.parse_string("not-base64-gzip\n")
+    with pytest.raises(ValueError):
+        parser.parse_string("[1, 2]")
+
+def test_sniff():
+    assert SubscriptionParser.sniff(encode(payload).encode())
+    assert SubscriptionParser.sniff(json.dumps(payload).encode())
+    assert not SubscriptionParser.sniff(b'{"logGroupName": "/a", "logEvents": []}')
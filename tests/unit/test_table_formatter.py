@@ -53,4 +53,16 @@ def test_level_style():
     assert formatter._level_style(entries[1].level) == "yellow"
     assert formatter._level_style(entries[2].level) == "red"
     assert formatter._level_style(entries[3].level) == "dim"
-    assert formatter._level_style(entries[4].level) == "blue"
\ No newline at end of file
+    assert formatter._level_style(entries[4].level) == "blue"
+def test_stream_yields_fixed_width_chunks():
+    formatter = TableFormatter()
+    tables = list(formatter.stream(iter(entries), chunk_size=2))
+    assert len(tables) == 3
+    assert tables[0].show_header and not tables[1].show_header
+    assert [column.width for column in tables[0].columns] == [column.width for column in tables[2].columns]
+    assert tables[0].columns[3].max_width == 80
+
+def test_stream_empty_still_yields_header():
+    tables = list(TableFormatter().stream([]))
+    assert len(tables) == 1
+    assert tables[0].row_count == 0
@@ -0,0 +1,148 @@
+import json
+import sys
+import threading
+
+import pytest
+
+from logsentinel.filters import LevelFilter
+from logsentinel.models import LogLevel
+from logsentinel.parsers import NdjsonParser
+from logsentinel.sources import (
+    FileFollower,
+    InotifyWatcher,
+    PollingWatcher,
+    parse_lines,
+    tail_batches,
+)
+
+parser = NdjsonParser()
+
+
+def event(timestamp, message):
+    return json.dumps({"timestamp": timestamp, "message": message}) + "\n"
+
+
+def append(path, text):
+    with path.open("a") as stream:
+        stream.write(text)
+
+
+def messages(follower):
+    return [line.decode() for line in follower.read_lines()]
+
+
+def test_reads_only_appended_lines(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("one\ntwo\n")
+    follower = FileFollower(path)
+    assert messages(follower) == ["one", "two"]
+    assert messages(follower) == []
+    append(path, "three\nfou")
+    assert messages(follower) == ["three"]
+    append(path, "r\n")
+    assert messages(follower) == ["four"]
+    assert follower.offset == path.stat().st_size
+
+def test_truncation_restarts_from_beginning(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("one\ntwo\n")
+    follower = FileFollower(path)
+    follower.read_lines()
+    path.write_text("new\n")
+    assert messages(follower) == ["new"]
+
+def test_rotation_drains_old_file_then_switches(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("one\n")
+    follower = FileFollower(path)
+    follower.read_lines()
+    append(path, "last words")
+    path.rename(tmp_path / "app.log.1")
+    path.write_text("fresh\n")
+    assert messages(follower) == ["last words", "fresh"]
+    assert messages(follower) == []
+
+@pytest.mark.parametrize("lines, expected", [
+    (0, []),
+    (2, ["c", "d"]),
+    (10, ["a", "b", "c", "d"]),
+])
+def test_seek_last_lines(tmp_path, lines, expected):
+    path = tmp_path / "app.log"
+    path.write_text("a\nb\nc\nd\n")
+    follower = FileFollower(path)
+    follower.seek_last_lines(lines)
+    assert messages(follower) == expected
+
+def test_parse_lines_accepts_events_and_plain_text():
+    batch = parse_lines(
+        parser,
+        [event(1705312245000, "[ERROR] boom").encode(), b"[INFO] plain", b"  ", b"{oops"],
+        "app.log",
+    )
+    entries = list(batch)
+    assert [entry.message for entry in entries] == ["[ERROR] boom", "[INFO] plain", "{oops"]
+    assert entries[0].level == LogLevel.ERROR
+    assert entries[1].level == LogLevel.INFO
+    assert entries[0].source == "app.log"
+
+def test_parse_lines_keeps_explicit_fields():
+    line = json.dumps({"timestamp": 1, "message": "boom", "level": "ERROR", "requestId": "req-1"})
+    [entry] = parse_lines(parser, [line.encode()], "app.log")
+    assert entry.level == LogLevel.ERROR
+    assert entry.request_id == "req-1"
+
+def test_tail_batches_without_watcher_stops_at_end(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(event(1, "[INFO] a") + event(2, "[ERROR] b") + "[ERROR] no newline")
+    batches = tail_batches(FileFollower(path), parser, [LevelFilter(LogLevel.ERROR)])
+    assert [entry.message for batch in batches for entry in batch] == [
+        "[ERROR] b",
+        "[ERROR] no newline",
+    ]
+
+def test_lines_longer_than_a_read_stay_whole(tmp_path):
+    from logsentinel.sources.tail import READ_SIZE
+    path = tmp_path / "app.log"
+    long = "x" * (READ_SIZE + READ_SIZE // 2)
+    path.write_text(long + "\nshort one\nshort two")
+    batches = tail_batches(FileFollower(path), parser)
+    assert [len(entry.message) for batch in batches for entry in batch] == [len(long), 9, 9]
+    # Following, a long line still being written is held back until it ends.
+    path.write_text("y" * (READ_SIZE * 2))
+    follower = FileFollower(path)
+    assert follower.read_lines() == []
+    with path.open("a") as stream:
+        stream.write("\n")
+    assert [len(line) for line in follower.read_lines()] == [READ_SIZE * 2]
+
+def test_tail_batches_follows_growth(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(event(1, "[INFO] a"))
+    watcher = PollingWatcher(interval=0.001, max_interval=0.01)
+    batches = tail_batches(FileFollower(path), parser, [], watcher)
+    assert [entry.message for entry in next(batches)] == ["[INFO] a"]
+    append(path, event(2, "[INFO] b"))
+    assert [entry.message for entry in next(batches)] == ["[INFO] b"]
+    batches.close()
+
+def test_polling_watcher_backs_off_and_resets():
+    watcher = PollingWatcher(interval=0.001, max_interval=0.004)
+    for _ in range(4):
+        watcher.wait()
+    assert watcher._current == 0.004
+    watcher.activity()
+    assert watcher._current == 0.001
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_wakes_on_write(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("")
+    watcher = InotifyWatcher(path, timeout=5)
+    timer = threading.Timer(0.05, append, (path, "x\n"))
+    timer.start()
+    try:
+        watcher.wait()
+    finally:
+        timer.join()
+        watcher.close()
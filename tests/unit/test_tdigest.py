@@ -0,0 +1,55 @@
+import math
+import pickle
+import random
+
+import pytest
+
+from logsentinel.utils.tdigest import TDigest
+
+
+def exact(values, quantile):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+def test_quantiles_close_to_exact():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1) for _ in range(50_000)]
+    digest = TDigest()
+    for value in values:
+        digest.add(value)
+    for quantile in (0.01, 0.5, 0.9, 0.99):
+        assert digest.quantile(quantile) == pytest.approx(exact(values, quantile), rel=0.03)
+    assert digest.quantile(0) == min(values)
+    assert digest.quantile(1) == max(values)
+
+def test_memory_stays_bounded():
+    digest = TDigest(compression=50)
+    for value in range(200_000):
+        digest.add(float(value))
+    digest.quantile(0.5)
+    assert len(digest.means) < 100
+    assert len(digest) == 200_000
+
+def test_merge_matches_single_digest():
+    rng = random.Random(3)
+    values = [rng.random() * 1000 for _ in range(20_000)]
+    parts = [TDigest() for _ in range(4)]
+    for index, value in enumerate(values):
+        parts[index % 4].add(value)
+    merged = TDigest()
+    for part in parts:
+        merged.merge(pickle.loads(pickle.dumps(part)))
+    assert len(merged) == len(values)
+    for quantile in (0.1, 0.5, 0.99):
+        assert merged.quantile(quantile) == pytest.approx(exact(values, quantile), rel=0.02)
+
+def test_small_and_empty_digests():
+    digest = TDigest()
+    assert math.isnan(digest.quantile(0.5))
+    digest.add(5.0)
+    assert digest.quantile(0.9) == 5.0
+    digest.add(15.0)
+    assert 5.0 <= digest.quantile(0.5) <= 15.0
+    with pytest.raises(ValueError):
+        digest.quantile(1.5)
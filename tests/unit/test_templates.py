@@ -0,0 +1,89 @@
+import pytest
+
+from logsentinel.analysis import TemplateMiner
+from logsentinel.analysis.templates import WILDCARD
+
+
+def templates(miner):
+    return {pattern.template: pattern.count for pattern in miner.patterns()}
+
+
+def test_numeric_tokens_become_parameters():
+    miner = TemplateMiner()
+    for index in range(3):
+        miner.add(f"Connection to 10.0.0.{index} failed after {index} retries")
+    assert templates(miner) == {"Connection to <*> failed after <*> retries": 3}
+
+def test_differing_words_generalise_the_template():
+    miner = TemplateMiner()
+    first = miner.add("User alice logged in")
+    second = miner.add("User bob logged in")
+    assert first == second
+    pattern = miner.patterns()[0]
+    assert pattern.template == f"User {WILDCARD} logged in"
+    assert pattern.example == "User alice logged in"
+
+def test_dissimilar_messages_get_their_own_cluster():
+    miner = TemplateMiner(similarity=0.5)
+    miner.add("disk full on volume root")
+    miner.add("cache miss for key users")
+    miner.add("Request failed")
+    assert len(miner) == 3
+
+def test_routing_tokens_split_clusters():
+    miner = TemplateMiner(similarity=0.1)
+    miner.add("START RequestId: abc Version: $LATEST")
+    miner.add("END RequestId: abc extra tokens here")
+    assert len(miner) == 2
+
+def test_max_children_folds_routing_into_wildcard():
+    miner = TemplateMiner(max_children=2)
+    for word in ("alpha", "beta", "gamma", "delta"):
+        miner.add(f"{word} service started")
+    # gamma and delta share the wildcard branch and merge there.
+    assert templates(miner)[f"{WILDCARD} service started"] == 2
+
+def test_lru_eviction_bounds_memory():
+    miner = TemplateMiner(max_clusters=2)
+    miner.add("alpha one")
+    miner.add("beta two words here")
+    miner.add("alpha one")
+    miner.add("gamma three words here and more")
+    assert len(miner) == 2
+    assert miner.evicted == 1
+    assert set(templates(miner)) == {"alpha one", "gamma three words here and more"}
+    miner.add("beta two words here")
+    assert miner.evicted == 2
+
+def test_patterns_sorted_by_count():
+    miner = TemplateMiner()
+    for _ in range(3):
+        miner.add("frequent event")
+    miner.add("rare event happened once")
+    assert [pattern.count for pattern in miner.patterns()] == [3, 1]
+    assert len(miner.patterns(top=1)) == 1
+
+def test_save_and_load_resume(tmp_path):
+    miner = TemplateMiner(max_children=1)
+    miner.add("alpha service started")
+    miner.add("beta service started")
+    miner.add("User alice logged in")
+    miner.add("User bob logged in")
+    path = tmp_path / "templates.json"
+    miner.save(path)
+    restored = TemplateMiner.load(path)
+    assert restored.max_children == 1
+    assert templates(restored) == templates(miner)
+    # The generalised template still owns messages routed by its original token.
+    assert restored.add("User carol logged in") == miner.add("User carol logged in")
+    new = restored.add("brand new message")
+    assert new == miner.add("brand new message")
+
+def test_load_rejects_bad_state(tmp_path):
+    path = tmp_path / "templates.json"
+    path.write_text('{"version": 99}')
+    with pytest.raises(ValueError):
+        TemplateMiner.load(path)
+    path.write_text('{"version": 1}')
+    with pytest.raises(ValueError):
+        TemplateMiner.load(path)
@@ -0,0 +1,43 @@
+from datetime import UTC, datetime
+
+from logsentinel.filters import TimeRangeFilter
+from logsentinel.models import LogBatch
+
+since = datetime(2024, 1, 15, 10, 1, 0, tzinfo=UTC)
+until = datetime(2024, 1, 15, 10, 3, 0, tzinfo=UTC)
+
+def test_apply_keeps_inclusive_window(entries_all_levels):
+    result = TimeRangeFilter(since, until).apply(entries_all_levels)
+    assert result == entries_all_levels[1:4]
+
+def test_apply_open_ended(entries_all_levels):
+    assert len(TimeRangeFilter(since=since).apply(entries_all_levels)) == 5
+    assert len(TimeRangeFilter(until=until).apply(entries_all_levels)) == 4
+
+def test_apply_batch_sorted_matches_apply(entries_all_levels):
+    batch = LogBatch.from_entries(entries_all_levels)
+    assert list(TimeRangeFilter(since, until).apply_batch(batch)) == entries_all_levels[1:4]
+
+def test_apply_batch_unsorted_matches_apply(entries_all_levels):
+    shuffled = entries_all_levels[::-1]
+    batch = LogBatch.from_entries(shuffled)
+    time_filter = TimeRangeFilter(since, until)
+    assert list(time_filter.apply_batch(batch)) == time_filter.apply(shuffled)
+
+def test_apply_batch_bisects_only_batches_known_sorted(entries_all_levels):
+    batch = LogBatch.from_entries(entries_all_levels)
+    time_filter = TimeRangeFilter(since, until)
+    batch.timestamps = batch.timestamps[::-1]
+    # The flag is trusted rather than rechecked, so stale data shows which path ran.
+    assert len(time_filter.apply_batch(batch)) != 3
+    batch.timestamps_sorted = False
+    assert len(time_filter.apply_batch(batch)) == 3
+
+def test_apply_batch_sub_millisecond_bound(entries_all_levels):
+    batch = LogBatch.from_entries(entries_all_levels)
+    time_filter = TimeRangeFilter(since=since.replace(microsecond=1))
+    assert list(time_filter.apply_batch(batch)) == time_filter.apply(entries_all_levels)
+
+def test_apply_batch_without_bounds_returns_batch(entries_all_levels):
+    batch = LogBatch.from_entries(entries_all_levels)
+    assert TimeRangeFilter().apply_batch(batch) is batch
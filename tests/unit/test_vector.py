@@ -0,0 +1,38 @@
+from array import array
+
+import pytest
+
+from logsentinel.utils import vector
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(vector, "np", None)
+    return request.param
+
+def test_select_levels(backend):
+    table = vector.level_table({40, 50, 60})
+    levels = bytearray([10, 40, 20, 60, 50, 30])
+    assert list(vector.select_levels(levels, table)) == [1, 3, 4]
+
+def test_select_levels_empty(backend):
+    assert list(vector.select_levels(bytearray(), vector.level_table({10}))) == []
+
+def test_is_sorted(backend):
+    assert vector.is_sorted(array("q", [1, 2, 2, 5]))
+    assert not vector.is_sorted(array("q", [1, 3, 2]))
+    assert vector.is_sorted(array("q"))
+
+def test_select_range_sorted_uses_bisect(backend):
+    timestamps = array("q", [10, 20, 20, 30, 40])
+    assert vector.select_range(timestamps, 20, 30, True) == range(1, 4)
+    assert vector.select_range(timestamps, None, 15, True) == range(0, 1)
+    assert vector.select_range(timestamps, 50, None, True) == range(5, 5)
+
+def test_select_range_unsorted(backend):
+    timestamps = array("q", [30, 10, 20, 40])
+    assert list(vector.select_range(timestamps, 15, 30, False)) == [0, 2]
+    assert list(vector.select_range(timestamps, None, None, False)) == [0, 1, 2, 3]
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+
+import pytest
+
+from logsentinel.formatters import (
+    BatchWriter,
+    WRITERS,
+    ColumnarWriter,
+    CsvWriter,
+    NdjsonWriter,
+    read_columnar,
+)
+from logsentinel.formatters.writers import FIELDS
+from logsentinel.models import LogBatch, LogLevel
+from logsentinel.parsers import NdjsonParser
+
+
+def make_batch():
+    batch = LogBatch()
+    batch.append(1705312245000, LogLevel.INFO, "[INFO] started", "/aws/lambda/app")
+    batch.append(
+        1705312245123,
+        LogLevel.ERROR,
+        '[ERROR] quote " comma, and\nnewline é',
+        "/aws/lambda/app",
+        request_id="req-1",
+        correlation_id="corr-1",
+    )
+    batch.append(
+        1705312246000,
+        LogLevel.UNKNOWN,
+        "plain",
+        "/aws/lambda/other",
+        raw="2024-01-15 plain",
+        metadata={"stream": "é"},
+    )
+    return batch
+
+
+def test_ndjson_writer_round_trips_through_parser():
+    stream = io.BytesIO()
+    assert NdjsonWriter(stream).write(make_batch()) == 3
+    lines = stream.getvalue().decode().splitlines()
+    assert len(lines) == 3
+    event = json.loads(lines[1])
+    assert event["level"] == "ERROR"
+    assert event["requestId"] == "req-1"
+    assert event["correlationId"] == "corr-1"
+    assert "raw" not in event and "metadata" not in event
+    assert json.loads(lines[2])["metadata"] == {"stream": "é"}
+    parsed = list(NdjsonParser().iter_stream(io.BytesIO(stream.getvalue())))
+    assert list(parsed[0]) == list(make_batch())
+    for entry, expected in zip(parsed[0], make_batch()):
+        assert (entry.raw, entry.request_id, entry.correlation_id, entry.metadata) == (
+            expected.raw, expected.request_id, expected.correlation_id, expected.metadata
+        )
+
+def test_csv_writer_quotes_fields():
+    stream = io.BytesIO()
+    CsvWriter(stream, batch_size=2).write(make_batch())
+    rows = list(csv.reader(io.StringIO(stream.getvalue().decode(), newline="")))
+    assert rows[0] == list(FIELDS)
+    assert rows[2] == [
+        "2024-01-15T09:50:45.123Z",
+        "ERROR",
+        "/aws/lambda/app",
+        '[ERROR] quote " comma, and\nnewline é',
+        "",
+        "req-1",
+        "corr-1",
+        "",
+    ]
+    assert rows[3][1:] == ["UNKNOWN", "/aws/lambda/other", "plain", "2024-01-15 plain", "", "", '{"stream": "é"}']
+    assert len(rows) == 4
+
+def test_csv_writer_empty_input_writes_header():
+    stream = io.BytesIO()
+    assert CsvWriter(stream).write([]) == 0
+    assert stream.getvalue() == b"timestamp,level,logGroupName,message,raw,requestId,correlationId,metadata\r\n"
+
+def test_columnar_writer_round_trips_batches():
+    stream = io.BytesIO()
+    count = ColumnarWriter(stream).write_batches([make_batch(), LogBatch(), make_batch()])
+    assert count == 6
+    stream.seek(0)
+    batches = list(read_columnar(stream))
+    assert [len(batch) for batch in batches] == [3, 3]
+    assert list(batches[1]) == list(make_batch())
+    assert batches[0][1].correlation_id == "corr-1"
+
+def test_read_columnar_rejects_other_data():
+    with pytest.raises(ValueError):
+        list(read_columnar(io.BytesIO(b'{"timestamp": 1}\n')))
+
+def test_writers_registry():
+    assert set(WRITERS) == {"ndjson", "csv", "columnar"}
+
+def test_batch_writer_is_abstract():
+    with pytest.raises(TypeError):
+        BatchWriter(io.BytesIO())